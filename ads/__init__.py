@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+SEO анализ сайтов автошкол (конкурентов и своего).
+
+    python -m ads analyze --all --jobs 6
+    python -m ads.analyzer https://site.ee/ --crawl
+
+Имена пакета загружаются при первом обращении (PEP 562): import ads и
+python -m ads --help не импортируют requests, bs4, numpy и scipy — их
+подгружают только модули, которые действительно используются.
+Время запуска: python -m ads.bench_startup.
+"""
+
+import importlib
+
+# Имя -> модуль пакета
+_EXPORTS = {
+    "SEOAnalyzer": "analyzer",
+    "SEOData": "seo_data",
+    "SiteRecord": "site_registry",
+    "SiteRegistry": "site_registry",
+    "default_registry": "site_registry",
+    "create_comparative_report": "comparative_seo_analysis",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
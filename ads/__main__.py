@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Командная строка SEO анализа: python -m ads <команда>.
+
+    python -m ads analyze --all --jobs 6        # все сайты из sites.json
+    python -m ads analyze drive somero          # выбранные сайты (slug)
+    python -m ads analyze --all --compare       # и сравнительный отчет
+    python -m ads analyze --all --diff          # и лента изменений changes.jsonl/.md
+    python -m ads diff                          # изменения последнего запуска
+    python -m ads export pages.parquet          # последние результаты -> Parquet
+    python -m ads list                          # сайты реестра
+    python -m ads runs                          # последние запуски в хранилище
+    python -m ads import-reports                # старые *_report.json -> хранилище
+
+Заменяет двенадцать скриптов analyze_<сайт>.py: все сайты анализируются
+в одном процессе одним SEOAnalyzer — общий пул соединений, кеш ответов
+и планировщик хостов. Сайты загружаются параллельно (--jobs), поэтому
+полное обновление длится примерно столько, сколько самый медленный
+сайт. Отчеты те же: <slug>_report.json и <slug>_report.md; кроме того,
+результаты каждого запуска сохраняются в хранилище (results_store.py),
+из которого строится сравнительный отчет.
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+from .results_store import DEFAULT_RESULTS_DIR, ResultsStore
+from .site_registry import DEFAULT_REGISTRY, SiteRegistry
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+ADS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_JOBS = 6
+
+
+def select_sites(registry, slugs, all_sites: bool):
+    if all_sites:
+        return list(registry)
+    unknown = [slug for slug in slugs if slug not in registry.by_slug]
+    if unknown:
+        raise SystemExit(f"Неизвестные сайты: {', '.join(unknown)} (список: python -m ads list)")
+    return [registry.by_slug[slug] for slug in slugs]
+
+
+def cmd_list(args) -> int:
+    for site in SiteRegistry.load(args.registry):
+        mark = " (наш)" if site.ours else ""
+        print(f"{site.slug:16} {site.name:18} {site.url}{mark}")
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    registry = SiteRegistry.load(args.registry)
+    if not args.all and not args.sites:
+        raise SystemExit("Укажите сайты (slug) или --all")
+    sites = select_sites(registry, args.sites, args.all)
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Анализатор, HTTP стек и парсеры загружаются только для этой команды
+    from dataclasses import asdict
+
+    from .analyzer import ANALYZER_VERSION, SEOAnalyzer
+    from .async_fetch import run_in_order
+    from .site_reports import print_seo_data, report_heading, report_paths, save_report, save_report_md
+
+    store = None if args.no_store else ResultsStore(args.results_dir, registry=registry)
+    analyzer = SEOAnalyzer(use_cache=not args.no_cache, parser=args.parser, stemmer=args.stemmer)
+    by_url = {site.url: site for site in sites}
+
+    def worker(url: str):
+        site = by_url[url]
+        print(f"[СТАРТ] {site.title}: {url}")
+        started = time.perf_counter()
+        data = analyzer.analyze_page(url)
+        return data, time.perf_counter() - started
+
+    print(f"[СТАРТ] Анализ сайтов: {len(sites)}, параллельно {args.jobs}\n")
+    started = time.perf_counter()
+    run_id = store.start_run(" ".join(sys.argv[1:]), ANALYZER_VERSION) if store else None
+    try:
+        results = run_in_order([site.url for site in sites], worker, concurrency=args.jobs,
+                               scheduler=analyzer.scheduler, host_setup=analyzer.robots)
+        failed = []
+        for site, result in zip(sites, results):
+            data, elapsed = result if result is not None else (None, 0.0)
+            if not data:
+                failed.append(site.slug)
+                print(f"\n[ОШИБКА] Не удалось проанализировать сайт {site.title} ({site.url})")
+                continue
+            if args.verbose:
+                print_seo_data(data)
+            json_path, md_path = report_paths(site, args.output_dir)
+            save_report(data, json_path)
+            save_report_md(data, md_path, report_heading(site))
+            if store is not None:
+                store.add_page(run_id, asdict(data))
+            print(f"[ГОТОВО] {site.slug}: {elapsed:.2f} с")
+        analyzer.print_connection_stats()
+        analyzer.print_cache_stats()
+        analyzer.print_failures()
+    finally:
+        analyzer.close()
+        if store is not None:
+            store.finish_run(run_id)
+            store.close()
+    print(f"\n[ИТОГО] сайтов {len(sites) - len(failed)}/{len(sites)} за {time.perf_counter() - started:.2f} с")
+
+    if args.compare:
+        from .comparative_seo_analysis import create_comparative_report
+        create_comparative_report(args.output_dir, args.results_dir)
+    if args.diff and run_id is not None:
+        print_changes(args.results_dir, run_id, args.output_dir)
+    return 1 if failed else 0
+
+
+def print_changes(results_dir: str, run_id, output_dir: str) -> bool:
+    """Лента изменений запуска в output_dir (False, если запуска нет)"""
+    from .run_diff import diff_run, write_changes
+
+    store = ResultsStore(results_dir)
+    try:
+        diff = diff_run(store, run_id)
+    finally:
+        store.close()
+    if diff is None:
+        print("[ИЗМЕНЕНИЯ] запуск не найден")
+        return False
+    feed_path, summary_path = write_changes(diff, output_dir)
+    print(f"[ИЗМЕНЕНИЯ] запуск {diff.run_id}: страниц {diff.pages}, изменилось "
+          f"{len(diff.changed) - diff.new_pages}, новых {diff.new_pages} ({feed_path}, {summary_path})")
+    return True
+
+
+def cmd_diff(args) -> int:
+    os.makedirs(args.output_dir, exist_ok=True)
+    return 0 if print_changes(args.results_dir, args.run, args.output_dir) else 1
+
+
+def cmd_runs(args) -> int:
+    store = ResultsStore(args.results_dir)
+    try:
+        for run in store.runs(args.limit):
+            print(f"{run['run_id']:6} {run['started_at'][:19]}  страниц {run['pages']:6}  {run['command']}")
+    finally:
+        store.close()
+    return 0
+
+
+def cmd_export(args) -> int:
+    from .columnar import ColumnarWriter
+
+    store = ResultsStore(args.results_dir)
+    try:
+        pages = store.latest_pages(args.site)
+    finally:
+        store.close()
+    with ColumnarWriter(args.output, row_group_size=args.row_group) as writer:
+        writer.add_all(page["seo_data"] for page in pages)
+    print(f"[PARQUET] страниц {writer.rows_written}, групп строк {writer.row_groups} ({args.output})")
+    return 0
+
+
+def cmd_import_reports(args) -> int:
+    import glob
+
+    store = ResultsStore(args.results_dir)
+    try:
+        imported = store.import_reports(glob.glob(os.path.join(args.report_dir, "*_report.json")))
+    finally:
+        store.close()
+    print(f"[ХРАНИЛИЩЕ] импортировано отчетов: {imported} ({store.path})")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ads", description="SEO анализ сайтов из реестра sites.json")
+    parser.add_argument("--registry", default=DEFAULT_REGISTRY, help="Файл реестра сайтов (по умолчанию ads/sites.json)")
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR,
+                        help="Каталог хранилища результатов (по умолчанию ads/.results)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="Сайты реестра").set_defaults(handler=cmd_list)
+
+    analyze = commands.add_parser("analyze", help="Анализ сайтов и отчеты <slug>_report.json/.md")
+    analyze.add_argument("sites", nargs="*", metavar="SLUG", help="Сайты из реестра (python -m ads list)")
+    analyze.add_argument("--all", action="store_true", help="Все сайты реестра")
+    analyze.add_argument("--jobs", "-j", type=int, default=DEFAULT_JOBS, help="Сайтов одновременно")
+    analyze.add_argument("--output-dir", default=ADS_DIR, help="Каталог отчетов (по умолчанию ads/)")
+    analyze.add_argument("--parser", default="html.parser", choices=["auto", "selectolax", "lxml", "html.parser"],
+                         help="HTML парсер (auto = самый быстрый установленный)")
+    analyze.add_argument("--stemmer", default="auto", choices=["auto", "light", "snowball", "none"],
+                         help="Стемминг ключевых слов")
+    analyze.add_argument("--no-cache", action="store_true", help="Не использовать кеш ответов и память анализа на диске")
+    analyze.add_argument("--compare", action="store_true",
+                         help="Затем обновить comparative_seo_analysis.md по всем отчетам")
+    analyze.add_argument("--verbose", "-v", action="store_true", help="Печатать SEO данные каждого сайта")
+    analyze.add_argument("--no-store", action="store_true", help="Не сохранять результаты в хранилище")
+    analyze.add_argument("--diff", action="store_true",
+                         help="Затем записать изменения с прошлых результатов (changes.jsonl, changes.md)")
+    analyze.set_defaults(handler=cmd_analyze)
+
+    runs = commands.add_parser("runs", help="Последние запуски в хранилище результатов")
+    runs.add_argument("--limit", type=int, default=20, help="Сколько запусков показать")
+    runs.set_defaults(handler=cmd_runs)
+
+    diff = commands.add_parser("diff", help="Изменения страниц в запуске: changes.jsonl и changes.md")
+    diff.add_argument("--run", type=int, help="ID запуска (по умолчанию последний, см. python -m ads runs)")
+    diff.add_argument("--output-dir", default=ADS_DIR, help="Каталог ленты изменений (по умолчанию ads/)")
+    diff.set_defaults(handler=cmd_diff)
+
+    export = commands.add_parser("export", help="Последние результаты страниц в Parquet (для ноутбуков)")
+    export.add_argument("output", help="Файл .parquet")
+    export.add_argument("--site", help="Только сайт (slug или хост)")
+    export.add_argument("--row-group", type=int, default=10000, help="Строк в группе Parquet")
+    export.set_defaults(handler=cmd_export)
+
+    import_reports = commands.add_parser("import-reports", help="Импорт *_report.json в хранилище результатов")
+    import_reports.add_argument("--report-dir", default=ADS_DIR, help="Каталог отчетов (по умолчанию ads/)")
+    import_reports.set_defaults(handler=cmd_import_reports)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Память результатов анализа по содержимому страницы.
+
+Кеш ответов (http_cache.py) отдает сохраненный анализ только для свежей
+записи или ответа 304. Многие сайты не присылают ETag/Last-Modified, и
+страница загружается заново с тем же телом: put() сбрасывает анализ, и
+она снова разбирается. Здесь результат анализа хранится по ключу
+
+    (хеш тела, ANALYZER_VERSION, HTML парсер, стеммер)
+
+поэтому неизменившаяся страница стоит только SHA-256 тела. В хеш
+входит и URL страницы: от него зависят SEOData.url и абсолютные адреса
+относительных ссылок. Стеммер входит в ключ, потому что меняет ключевые
+слова. Записи старше max_age удаляются при открытии, при превышении
+max_bytes вытесняются давно не использованные. get() только читает базу:
+время обращения копится в памяти и записывается одним запросом вместе со
+следующим put(), перед вытеснением и при close().
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from .http_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60     # 30 дней без обращений
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024    # 64 МБ сохраненных результатов
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    body_hash TEXT NOT NULL,
+    analyzer_version INTEGER NOT NULL,
+    parser TEXT NOT NULL,
+    stemmer TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (body_hash, analyzer_version, parser, stemmer)
+);
+CREATE INDEX IF NOT EXISTS analyses_accessed_at ON analyses(accessed_at);
+"""
+
+
+def content_hash(url: str, text: str) -> str:
+    """SHA-256 URL и тела страницы (hex)"""
+    digest = hashlib.sha256(url.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AnalysisMemo:
+    """Результаты анализа в SQLite по хешу содержимого, с вытеснением по возрасту и размеру"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, analyzer_version: int = 0,
+                 parser: str = '', stemmer: str = '',
+                 max_age: float = DEFAULT_MAX_AGE, max_bytes: int = DEFAULT_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "analysis_memo.sqlite")
+        self.key = (analyzer_version, parser, stemmer)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        # body_hash -> время последнего обращения, еще не записанное в базу
+        self._accessed: Dict[str, float] = {}
+        with self._lock:
+            self._expire()
+            self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+            self._evict()
+            self._conn.commit()
+
+    def get(self, body_hash: str) -> Optional[Dict]:
+        """Сохраненный анализ (None — промах); учитывается в статистике"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis FROM analyses WHERE body_hash = ? AND analyzer_version = ? "
+                "AND parser = ? AND stemmer = ?", (body_hash,) + self.key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._accessed[body_hash] = time.time()
+        return json.loads(row[0])
+
+    def put(self, body_hash: str, analysis: Dict):
+        """Сохранение результата анализа для содержимого body_hash"""
+        data = json.dumps(analysis, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM analyses WHERE body_hash = ? AND analyzer_version = ? "
+                "AND parser = ? AND stemmer = ?", (body_hash,) + self.key).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses "
+                "(body_hash, analyzer_version, parser, stemmer, analysis, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (body_hash,) + self.key + (data, size, now, now))
+            self._accessed.pop(body_hash, None)
+            self._flush_accessed()
+            self._bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _flush_accessed(self):
+        """Запись накопленных времен обращения (без commit)"""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE analyses SET accessed_at = ? WHERE body_hash = ? AND analyzer_version = ? "
+                "AND parser = ? AND stemmer = ?",
+                [(accessed_at, body_hash) + self.key for body_hash, accessed_at in self._accessed.items()])
+            self._accessed.clear()
+
+    def _expire(self):
+        """Удаление записей, к которым не обращались дольше max_age"""
+        cursor = self._conn.execute("DELETE FROM analyses WHERE accessed_at < ?",
+                                    (time.time() - self.max_age,))
+        self.evicted += cursor.rowcount
+
+    def _evict(self):
+        """LRU вытеснение, пока суммарный размер больше лимита"""
+        if self._bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT rowid, size FROM analyses ORDER BY accessed_at").fetchall()
+        for rowid, size in rows:
+            if self._bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM analyses WHERE rowid = ?", (rowid,))
+            self._bytes -= size
+            self.evicted += 1
+
+    def stats(self) -> Dict:
+        """Счетчики за текущий запуск и размер памяти"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evicted": self.evicted,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": entries, "bytes": self._bytes}
+
+    def close(self):
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SEO анализ страниц конкурентов: SEOAnalyzer и командная строка.
+
+    python -m ads.analyzer https://site.ee/ --crawl --concurrency 8
+    python ads-1.py ...          # прежняя точка входа, то же самое
+    python -m ads.analyzer https://site.ee/ --crawl --parquet pages.parquet
+
+Потоковый разбор (streaming.py), обход сайта и граф ссылок (crawler.py,
+link_graph.py, scipy), robots.txt и sitemap (discovery.py) и граф внешних
+доменов (domain_graph.py) импортируются только в методах, которые их
+используют. numpy загружается сразу: MinHash (near_duplicates.py)
+считается для каждой страницы.
+"""
+
+import json
+from collections import Counter
+import time
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Iterator, Iterable, Union
+from datetime import datetime
+
+from .async_fetch import run_in_order, host_key, DEFAULT_CONCURRENCY, DEFAULT_PER_HOST
+from .scheduler import HostScheduler, DEFAULT_RATE
+from .http_session import PooledSession, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
+from .http_cache import ResponseCache, CacheEntry
+from .analysis_memo import AnalysisMemo, content_hash
+from .extraction import ExtractedPage
+from .seo_data import SEOData
+from .html_backends import DEFAULT_BACKEND, get_backend
+from .text_tokens import TokenStream, top_keywords, DEFAULT_TOP_N
+from .keyphrases import Vocabulary, extract_keyphrases, common_keyphrases
+from .stemming import get_stemmer, latin_language, stem_function
+from .near_duplicates import DuplicatePage, NearDuplicateIndex, minhash
+from .site_registry import default_registry
+from .resilience import (FetchFailure, FetchError, RetryPolicy, CircuitBreaker, classify_status,
+                        classify_exception, HOST_FAILURE_REASONS, CONNECT_TIMEOUT, READ_TIMEOUT)
+
+if TYPE_CHECKING:
+    from .discovery import RobotsRules
+
+# Версия логики analyze_page: при изменении сохраненные в кеше результаты не используются
+ANALYZER_VERSION = 7
+
+@dataclass
+class FetchResult:
+    """Результат загрузки страницы"""
+    url: str
+    text: str
+    from_cache: bool = False
+    cache_entry: Optional[CacheEntry] = None
+    
+class SEOAnalyzer:
+    def __init__(self, http2: bool = False,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 host_pool_sizes: Dict[str, int] = None,
+                 cache: Optional[ResponseCache] = None,
+                 use_cache: bool = True,
+                 memo: Optional[AnalysisMemo] = None,
+                 per_host: int = DEFAULT_PER_HOST,
+                 host_rate: float = DEFAULT_RATE,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT,
+                 parser: str = DEFAULT_BACKEND,
+                 streaming: bool = False,
+                 stemmer: str = 'auto',
+                 dedup: bool = True):
+        """
+        Инициализация анализатора
+        
+        Все запросы идут через одну сессию с пулом keep-alive соединений.
+        host_pool_sizes задает размер пула для отдельных хостов.
+        Ответы сохраняются в кеш на диске (ads/.http_cache), use_cache=False отключает его.
+        Результаты анализа запоминаются по хешу тела страницы (analysis_memo.py):
+        страница с тем же содержимым не разбирается повторно; use_cache=False
+        отключает и эту память.
+        Планировщик ограничивает каждый хост: per_host одновременных запросов,
+        host_rate запросов в секунду (или Crawl-delay из robots.txt).
+        Временные ошибки повторяются по retry_policy, хосты с ошибками подряд
+        отключаются circuit breaker'ом.
+        parser — HTML парсер: 'html.parser' (по умолчанию), 'selectolax', 'lxml'
+        или 'auto' (самый быстрый установленный); на испорченном HTML быстрые
+        парсеры дают другие SEOData (см. html_backends.py).
+        streaming=True — потоковый анализ без дерева: тело разбирается кусками
+        по мере загрузки, память не зависит от размера страницы (без кеша ответов).
+        stemmer — стемминг ключевых слов: 'auto', 'light', 'snowball' или 'none'
+        (формы слова считаются вместе, основы запоминаются в LRU кеше).
+        dedup=True — почти одинаковые страницы одного сайта (MinHash) не
+        анализируются повторно: вместо SEOData возвращается DuplicatePage.
+        """
+        self.session = PooledSession(pool_connections=pool_connections,
+                                     pool_maxsize=pool_maxsize,
+                                     host_pool_sizes=host_pool_sizes,
+                                     http2=http2)
+        self.cache = cache if cache is not None else (ResponseCache() if use_cache else None)
+        self._robots: Dict[str, 'RobotsRules'] = {}
+        self.scheduler = HostScheduler(per_host=per_host, rate=host_rate)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.timeout = (connect_timeout, read_timeout)
+        self.failures: List[FetchFailure] = []
+        self.parser = get_backend(parser)
+        self.streaming = streaming
+        # Общий словарь слов фраз: фраза хранится как целое число из ID слов
+        self.vocabulary = Vocabulary()
+        self.stemmer = get_stemmer(stemmer)
+        if memo is None and use_cache and not streaming:
+            memo = AnalysisMemo(analyzer_version=ANALYZER_VERSION, parser=self.parser.name,
+                                stemmer=self.stemmer.name)
+        self.memo = memo
+        self.near_duplicates = NearDuplicateIndex() if dedup else None
+        # Сводки графов внутренних ссылок обойденных сайтов (сайт -> link_report)
+        self.link_graphs: Dict[str, Dict] = {}
+        # Внешние ссылки всех страниц: сайт -> домен (кандидаты в конкуренты)
+        from .domain_graph import DomainGraph
+        self.external_domains = DomainGraph()
+        
+    def close(self):
+        """Закрытие HTTP сессии и кеша"""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.memo is not None:
+            self.memo.close()
+    
+    def connection_stats(self) -> Dict[str, Dict[str, int]]:
+        """Статистика соединений по хостам (новые / переиспользованные)"""
+        return self.session.stats.snapshot()
+    
+    def print_connection_stats(self):
+        """Вывод статистики соединений"""
+        totals = self.session.stats.totals()
+        protocol = "HTTP/2" if self.session.http2 else "HTTP/1.1"
+        print(f"[HTTP] {protocol}: запросов {totals['requests']}, "
+              f"новых соединений {totals['new_connections']}, "
+              f"переиспользовано {totals['reused_connections']}")
+        
+    def print_scheduler_stats(self):
+        """Вывод метрик планировщика по хостам"""
+        for host, m in self.scheduler.metrics().items():
+            print(f"[ПЛАНИРОВЩИК] {host}: запросов {m['dispatched']}, "
+                  f"макс. очередь {m['max_queue_depth']}, "
+                  f"ожидание ср. {m['avg_wait']:.2f} с / макс. {m['max_wait']:.2f} с, "
+                  f"429/503: {m['throttled']}, скорость {m['rate']:.2f} запр/с")
+    
+    def print_stemmer_stats(self):
+        """Вывод доли попаданий в кеш основ слов"""
+        stats = self.stemmer.stats()
+        if not stats["hits"] and not stats["misses"]:
+            return
+        print(f"[СТЕММИНГ] {self.stemmer.name}: кеш основ — попаданий {stats['hits']}, "
+              f"промахов {stats['misses']} ({stats['hit_ratio']:.1%}), слов в кеше {stats['size']}")
+    
+    def print_duplicate_stats(self):
+        """Вывод почти одинаковых страниц, которые не анализировались"""
+        if self.near_duplicates is None or not self.near_duplicates.pages:
+            return
+        stats = self.near_duplicates.stats()
+        print(f"[ДУБЛИКАТЫ] страниц {stats['pages']}, почти одинаковых {stats['duplicates']} "
+              f"(сравнений отпечатков {stats['comparisons']})")
+        for duplicate in self.near_duplicates.duplicates[:10]:
+            print(f"  {duplicate.url} ~ {duplicate.duplicate_of} (сходство {duplicate.similarity:.2f})")
+    
+    def print_domain_candidates(self, known: Iterable[str] = (), top_n: int = 10):
+        """Вывод доменов из внешних ссылок: кандидаты в конкуренты и партнеры"""
+        if not len(self.external_domains):
+            return
+        candidates = self.external_domains.candidates(known, top_n=top_n)
+        for title, key in (("кандидаты в конкуренты", "competitors"), ("партнеры", "partners")):
+            if candidates[key]:
+                print(f"[ДОМЕНЫ] {title}: " + ", ".join(f"{row['name']} ({row['sites']} сайт., {row['pages']} стр.)"
+                                                       for row in candidates[key]))
+    
+    def print_cache_stats(self):
+        """Вывод статистики кеша ответов и памяти результатов анализа"""
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"[КЕШ] из кеша: {stats['hits']}, не изменились (304): {stats['revalidated']}, "
+                  f"загружено: {stats['misses']}")
+        if self.memo is not None:
+            stats = self.memo.stats()
+            print(f"[АНАЛИЗ] по хешу содержимого: попаданий {stats['hits']}, "
+                  f"разобрано заново {stats['misses']} ({stats['hit_ratio']:.1%}), "
+                  f"записей {stats['entries']} ({stats['bytes'] / 1024:.0f} КБ), вытеснено {stats['evicted']}")
+        
+    def fetch(self, url: str) -> FetchResult:
+        """Загрузка страницы через кеш с условной перепроверкой"""
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            self.cache.record("hits")
+            return FetchResult(url=url, text=entry.text, from_cache=True, cache_entry=entry)
+        
+        headers = entry.conditional_headers() if entry is not None else {}
+        response = self._request(url, headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            self.cache.record("revalidated")
+            return FetchResult(url=url, text=entry.text, from_cache=True, cache_entry=entry)
+        
+        if self.cache is not None:
+            entry = self.cache.put(url, response.text, response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'))
+            self.cache.record("misses")
+        return FetchResult(url=url, text=response.text, cache_entry=entry)
+    
+    def _request(self, url: str, headers: Dict[str, str]):
+        """GET с повторами временных ошибок и circuit breaker (FetchError при неудаче)"""
+        host = host_key(url)
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow(host):
+                raise FetchError(FetchFailure(url=url, reason='circuit_open', attempts=attempt,
+                                              message=f"хост {host} временно отключен"))
+            attempt += 1
+            status_code, retry_after = None, None
+            try:
+                response = self.session.get(url, timeout=self.timeout, headers=headers)
+                status_code = response.status_code
+                retry_after = response.headers.get('Retry-After')
+                self.scheduler.observe(host, status_code, retry_after)
+                reason = classify_status(status_code)
+                message = f"HTTP {status_code}"
+            except Exception as e:
+                reason = classify_exception(e)
+                message = str(e)
+            
+            if reason in HOST_FAILURE_REASONS:
+                self.circuit_breaker.record_failure(host)
+            else:
+                self.circuit_breaker.record_success(host)
+            if reason is None:
+                return response
+            
+            if not self.retry_policy.should_retry(reason, attempt):
+                raise FetchError(FetchFailure(url=url, reason=reason, attempts=attempt,
+                                              status_code=status_code, message=message))
+            delay = self.retry_policy.delay(attempt, retry_after)
+            print(f"[ПОВТОР] {url}: {reason}, попытка {attempt + 1} через {delay:.1f} с")
+            time.sleep(delay)
+            # Повтор — новый запрос: токен хоста (слот на все попытки занят вызывающим кодом)
+            self.scheduler.acquire_blocking(host, slot=False)
+        
+    def fetch_page(self, url: str) -> str:
+        """Получение HTML страницы"""
+        try:
+            return self.fetch(url).text
+        except Exception as e:
+            print(f"Ошибка при загрузке {url}: {e}")
+            return ""
+    
+    def extract_keywords(self, text: str, top_n: int = DEFAULT_TOP_N) -> List[str]:
+        """Извлечение ключевых слов из текста (формы одного слова считаются вместе)"""
+        tokens = TokenStream(text)
+        return top_keywords(tokens.terms, top_n, self._stem_function(tokens))
+    
+    def analyze_page(self, url: str) -> Union[SEOData, FetchFailure, DuplicatePage]:
+        """Анализ одной страницы (при ошибке — FetchFailure, для дубликата — DuplicatePage; оба ложны в if)"""
+        data, _ = self.analyze_page_with_links(url)
+        return data
+    
+    def analyze_page_with_links(self, url: str) -> Tuple[Union[SEOData, FetchFailure, DuplicatePage], List[str]]:
+        """Анализ страницы + абсолютные URL ее внутренних ссылок (для обхода сайта)"""
+        if self.streaming:
+            return self._analyze_streaming(url)
+        try:
+            page = self.fetch(url)
+            if not page.text:
+                raise FetchError(FetchFailure(url=url, reason='empty_body', attempts=1,
+                                              message="пустой ответ"))
+        except FetchError as e:
+            return self._record_failure(e.failure), []
+        except Exception as e:
+            return self._record_failure(FetchFailure(url=url, reason=classify_exception(e),
+                                                     message=str(e))), []
+        try:
+            return self._analyze_fetched(url, page)
+        except Exception as e:
+            # Ошибка разбора одной страницы не прерывает весь запуск
+            return self._record_failure(FetchFailure(url=url, reason='parse_error', attempts=1,
+                                                     message=f"{type(e).__name__}: {e}")), []
+    
+    def _analyze_fetched(self, url: str, page: FetchResult) -> Tuple[Union[SEOData, DuplicatePage], List[str]]:
+        """Анализ загруженной страницы (или сохраненный анализ, если содержимое не изменилось)"""
+        # Страница не изменилась (свежая запись или 304): повторно используем сохраненный анализ
+        entry = page.cache_entry
+        if (page.from_cache and entry.analysis and entry.analysis_version == ANALYZER_VERSION
+                and entry.analysis.get("parser") == self.parser.name
+                and entry.analysis.get("stemmer") == self.stemmer.name):
+            return self._reuse_analysis(url, entry.analysis)
+        
+        # Загружена заново, но с тем же содержимым: анализ из памяти по хешу тела
+        body_hash = content_hash(url, page.text) if self.memo is not None else None
+        analysis = self.memo.get(body_hash) if body_hash is not None else None
+        if analysis is not None:
+            if entry is not None:
+                self.cache.store_analysis(url, analysis, ANALYZER_VERSION)
+            return self._reuse_analysis(url, analysis)
+        
+        data, page_data, fingerprint = self._analyze_document(url, page.text)
+        # Дубликат не сохраняем: в другом запуске первой может оказаться эта страница
+        if not isinstance(data, DuplicatePage) and (entry is not None or body_hash is not None):
+            analysis = {"seo_data": asdict(data), "internal_urls": page_data.internal_urls,
+                        "external_urls": page_data.external_urls,
+                        "parser": self.parser.name, "stemmer": self.stemmer.name,
+                        "fingerprint": fingerprint.hex() if fingerprint else None}
+            if entry is not None:
+                self.cache.store_analysis(url, analysis, ANALYZER_VERSION)
+            if body_hash is not None:
+                self.memo.put(body_hash, analysis)
+        return data, page_data.internal_urls
+    
+    def _reuse_analysis(self, url: str, analysis: Dict) -> Tuple[Union[SEOData, DuplicatePage], List[str]]:
+        """SEOData и внутренние ссылки из сохраненного анализа (с проверкой на дубликат)"""
+        internal_urls = analysis["internal_urls"]
+        fingerprint = analysis.get("fingerprint")
+        duplicate = self._check_duplicate(url, bytes.fromhex(fingerprint) if fingerprint else None)
+        if duplicate is not None:
+            return duplicate, internal_urls
+        self.external_domains.add_page(url, analysis["external_urls"])
+        return SEOData(**analysis["seo_data"]), internal_urls
+    
+    def _analyze_html(self, url: str, html: str) -> Tuple[Union[SEOData, DuplicatePage], List[str]]:
+        """Извлечение SEO данных и внутренних ссылок из HTML"""
+        data, page, _ = self._analyze_document(url, html)
+        return data, page.internal_urls
+    
+    def _analyze_document(self, url: str, html: str) -> Tuple[Union[SEOData, DuplicatePage], ExtractedPage, Optional[bytes]]:
+        """_analyze_html + извлеченные поля и MinHash отпечаток текста страницы"""
+        # Все поля за один обход дерева выбранного парсера
+        page = self.parser.extract(html, url)
+        
+        # Текстовый контент: один проход токенизации для всех метрик
+        tokens = TokenStream(page.text)
+        # Почти одинаковые страницы отсекаем до подсчета ключевых слов и фраз
+        fingerprint = minhash(tokens.words)
+        duplicate = self._check_duplicate(url, fingerprint)
+        if duplicate is not None:
+            return duplicate, page, fingerprint
+        
+        self.external_domains.add_page(url, page.external_urls)
+        keywords = top_keywords(tokens.terms, stem=self._stem_function(tokens))
+        keyphrases = extract_keyphrases(tokens, self.vocabulary)
+        return self._seo_data(url, page, keywords, keyphrases, tokens.word_count), page, fingerprint
+    
+    def _check_duplicate(self, url: str, fingerprint: Optional[bytes]) -> Optional[DuplicatePage]:
+        """DuplicatePage, если на сайте уже есть почти такая же страница"""
+        if self.near_duplicates is None:
+            return None
+        from .crawler import site_host
+
+        return self.near_duplicates.check(url, fingerprint, scope=site_host(url))
+    
+    def _analyze_streaming(self, url: str) -> Tuple[Union[SEOData, FetchFailure, DuplicatePage], List[str]]:
+        """
+        Потоковый анализ: разбор идет по мере загрузки, дерево не строится
+        
+        Повторы и circuit breaker работают как в _request; при повторе
+        разбор начинается заново.
+        """
+        host = host_key(url)
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow(host):
+                return self._record_failure(FetchFailure(url=url, reason='circuit_open', attempts=attempt,
+                                                         message=f"хост {host} временно отключен")), []
+            attempt += 1
+            status_code, retry_after = None, None
+            parsing = False
+            try:
+                with self.session.stream_response(url, timeout=self.timeout) as response:
+                    status_code = response.status_code
+                    retry_after = response.headers.get('Retry-After')
+                    self.scheduler.observe(host, status_code, retry_after)
+                    reason = classify_status(status_code)
+                    message = f"HTTP {status_code}"
+                    if reason is None:
+                        parsing = True
+                        result = self.analyze_chunks(url, response.chunks, response.encoding)
+            except Exception as e:
+                reason = classify_exception(e)
+                message = str(e)
+                # Ошибка не сети, а разбора страницы: не повторяется, хост исправен
+                if parsing and reason == 'other':
+                    reason = 'parse_error'
+                    message = f"{type(e).__name__}: {e}"
+            
+            if reason in HOST_FAILURE_REASONS:
+                self.circuit_breaker.record_failure(host)
+            else:
+                self.circuit_breaker.record_success(host)
+            if reason is None:
+                break
+            
+            if not self.retry_policy.should_retry(reason, attempt):
+                return self._record_failure(FetchFailure(url=url, reason=reason, attempts=attempt,
+                                                         status_code=status_code, message=message)), []
+            delay = self.retry_policy.delay(attempt, retry_after)
+            print(f"[ПОВТОР] {url}: {reason}, попытка {attempt + 1} через {delay:.1f} с")
+            time.sleep(delay)
+            # Повтор — новый запрос: токен хоста (слот на все попытки занят вызывающим кодом)
+            self.scheduler.acquire_blocking(host, slot=False)
+        
+        if result is None:
+            return self._record_failure(FetchFailure(url=url, reason='empty_body', attempts=attempt,
+                                                     message="пустой ответ")), []
+        return result
+    
+    def analyze_chunks(self, url: str, chunks: Iterable[bytes],
+                       encoding: Optional[str] = None) -> Optional[Tuple[Union[SEOData, DuplicatePage], List[str]]]:
+        """Потоковый анализ тела страницы, поступающего кусками байтов (None — пустое тело)"""
+        from .streaming import TextStats, extract_stream, iter_decoded
+
+        stats = TextStats(self.vocabulary, self.stemmer)
+        page = extract_stream(iter_decoded(chunks, encoding), url, text_sink=stats.feed)
+        if page is None:
+            return None
+        stats.finish()
+        duplicate = self._check_duplicate(url, stats.fingerprint.value)
+        if duplicate is not None:
+            return duplicate, page.internal_urls
+        self.external_domains.add_page(url, page.external_urls)
+        return (self._seo_data(url, page, stats.keywords(), stats.keyphrases(), stats.word_count),
+                page.internal_urls)
+    
+    def _stem_function(self, tokens: TokenStream):
+        """Основы слов для текста (язык латинских слов — по словам-маркерам)"""
+        return stem_function(self.stemmer, latin_language(tokens.words))
+    
+    def _seo_data(self, url: str, page: ExtractedPage, keywords: List[str], keyphrases: List[str],
+                  word_count: int) -> SEOData:
+        """SEOData из извлеченных полей страницы"""
+        return SEOData(
+            url=url,
+            title=page.title,
+            meta_description=page.meta_description,
+            h1_tags=page.h1_tags,
+            h2_tags=page.h2_tags,
+            keywords=keywords,
+            keyphrases=keyphrases,
+            word_count=word_count,
+            internal_links=len(page.internal_urls),
+            external_links=page.external_links,
+            images_count=page.images_count,
+            images_with_alt=page.images_with_alt
+        )
+    
+    def _record_failure(self, failure: FetchFailure) -> FetchFailure:
+        """Сохранение причины неудачи для итоговой сводки"""
+        print(f"Ошибка при загрузке {failure.url}: {failure.reason} ({failure.message})")
+        self.failures.append(failure)
+        return failure
+    
+    def print_failures(self):
+        """Сводка неудачных загрузок по причинам"""
+        if not self.failures:
+            return
+        reasons = Counter(failure.reason for failure in self.failures)
+        summary = ", ".join(f"{reason}: {count}" for reason, count in reasons.most_common())
+        print(f"[ОШИБКИ] не загружено страниц: {len(self.failures)} ({summary})")
+    
+    def robots(self, site_url: str) -> 'RobotsRules':
+        """Правила robots.txt сайта (загружаются один раз на хост)"""
+        host = host_key(site_url)
+        if host not in self._robots:
+            from .discovery import fetch_robots
+
+            robots = fetch_robots(self.session, site_url)
+            self.scheduler.set_crawl_delay(host, robots.crawl_delay)
+            self._robots[host] = robots
+        return self._robots[host]
+    
+    def discover_urls(self, site_url: str, max_urls: Optional[int] = None) -> Iterator[str]:
+        """Поток URL сайта из sitemap (через robots.txt), запрещенные robots.txt пропускаются"""
+        from .discovery import discover_urls
+
+        return discover_urls(self.session, site_url, robots=self.robots(site_url), max_urls=max_urls,
+                             on_error=self._sitemap_failure)
+    
+    def _sitemap_failure(self, sitemap_url: str, error: Exception, urls_read: int):
+        """Оборванный sitemap — в сводку ошибок: часть URL сайта не попала в анализ"""
+        self._record_failure(FetchFailure(url=sitemap_url, reason='sitemap_error', attempts=1,
+                                          message=f"прочитано URL: {urls_read}; {error}"))
+    
+    def analyze_multiple_pages(self, urls: Iterable[str], concurrency: int = 1,
+                               per_host: Optional[int] = None) -> List[SEOData]:
+        """Анализ нескольких страниц"""
+        if concurrency > 1:
+            return self.analyze_multiple_pages_async(urls, concurrency, per_host)
+
+        results = []
+        for url in urls:
+            print(f"Анализ: {url}")
+            data = self.analyze_page(url)
+            if data:
+                results.append(data)
+        return results
+
+    def analyze_multiple_pages_async(self, urls: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY,
+                                     per_host: Optional[int] = None,
+                                     respect_robots: bool = True) -> List[SEOData]:
+        """
+        Параллельный анализ нескольких страниц (порядок результатов = порядок URL)
+        
+        Хосты обслуживаются по кругу с учетом лимитов планировщика; при
+        respect_robots перед первым запросом к хосту читается его Crawl-delay.
+        """
+        if per_host is not None:
+            self.scheduler.per_host = max(1, per_host)
+        
+        def worker(url: str):
+            print(f"Анализ: {url}")
+            return self.analyze_page(url)
+
+        results = run_in_order(urls, worker, concurrency=concurrency, scheduler=self.scheduler,
+                               host_setup=self.robots if respect_robots else None)
+        return [data for data in results if data]
+    
+    def crawl_site(self, seed_url: str, max_depth: Optional[int] = None,
+                   max_pages: Optional[int] = None,
+                   max_in_flight: Optional[int] = None,
+                   respect_robots: bool = True,
+                   sitemap: bool = False) -> Iterator[SEOData]:
+        """
+        Обход сайта по внутренним ссылкам начиная с seed_url (генератор SEOData)
+        
+        После обхода сводка графа ссылок (PageRank, глубина) сохраняется в
+        self.link_graphs; с sitemap=True в нее попадают и сироты — страницы
+        из sitemap, на которые нет ссылок. Лимиты None — значения по
+        умолчанию краулера (crawler.DEFAULT_MAX_*).
+        """
+        from .crawler import (SiteCrawler, normalize_url, site_host, DEFAULT_MAX_DEPTH, DEFAULT_MAX_PAGES,
+                              DEFAULT_MAX_IN_FLIGHT)
+        from .link_graph import link_report
+
+        can_fetch = self.robots(seed_url).can_fetch if respect_robots else None
+        
+        def analyze(url: str):
+            # Краулер работает в потоках: ждем токен хоста блокирующим вызовом
+            host = host_key(url)
+            self.scheduler.acquire_blocking(host)
+            try:
+                return self.analyze_page_with_links(url)
+            finally:
+                self.scheduler.release(host)
+        
+        crawler = SiteCrawler(analyze,
+                              max_depth=DEFAULT_MAX_DEPTH if max_depth is None else max_depth,
+                              max_pages=DEFAULT_MAX_PAGES if max_pages is None else max_pages,
+                              max_in_flight=DEFAULT_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight,
+                              can_fetch=can_fetch)
+        for data in crawler.crawl(seed_url):
+            print(f"Анализ: {data.url}")
+            yield data
+        print(f"[ОБХОД] {seed_url}: страниц {crawler.pages_crawled}, ошибок {crawler.pages_failed}, "
+              f"дубликатов {crawler.pages_duplicate}")
+        
+        home = normalize_url(seed_url)
+        sitemap_urls = None
+        if sitemap:
+            sitemap_urls = [url for url in map(normalize_url, self.discover_urls(seed_url)) if url]
+        graph = link_report(crawler.graph, home, sitemap_urls)
+        self.link_graphs[site_host(home)] = graph
+        orphans = ""
+        if sitemap:
+            orphans = f", сирот из sitemap {len(graph['orphans'])}"
+            if graph["sitemap_foreign"]:
+                orphans += f" (URL других хостов в sitemap: {graph['sitemap_foreign']})"
+        print(f"[ГРАФ] {site_host(home)}: страниц {graph['pages']}, ссылок {graph['edges']}, "
+              f"PageRank за {graph['pagerank_iterations']} итераций, глубже 3 кликов {len(graph['deep_pages'])}"
+              f"{orphans}")
+    
+    def generate_report(self, competitor_data: List[SEOData], output_file: str = "seo_report.json"):
+        """Генерация отчета в JSON"""
+        if not competitor_data:
+            print("Нет данных для отчета")
+            return None
+            
+        report = {
+            "analysis_date": datetime.now().isoformat(),
+            "competitors": [asdict(data) for data in competitor_data],
+            "summary": {
+                "avg_word_count": sum(d.word_count for d in competitor_data) / len(competitor_data) if competitor_data else 0,
+                "common_keywords": self._find_common_keywords(competitor_data),
+                "common_keyphrases": common_keyphrases(data.keyphrases for data in competitor_data),
+                "avg_internal_links": sum(d.internal_links for d in competitor_data) / len(competitor_data) if competitor_data else 0,
+                # Почти одинаковые страницы не вошли в средние (см. near_duplicates.py)
+                "duplicate_pages": ([asdict(d) for d in self.near_duplicates.duplicates]
+                                    if self.near_duplicates is not None else [])
+            }
+        }
+        if self.link_graphs:
+            report["link_graphs"] = self.link_graphs
+        if len(self.external_domains):
+            report["external_domains"] = self.external_domains.candidates()
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        print(f"Отчет сохранен: {output_file}")
+        return report
+    
+    def _find_common_keywords(self, data_list: List[SEOData]) -> List[str]:
+        """Поиск общих ключевых слов у конкурентов"""
+        all_keywords = []
+        for data in data_list:
+            all_keywords.extend(data.keywords)
+        
+        keyword_freq = Counter(all_keywords)
+        return [kw for kw, count in keyword_freq.most_common(15) if count > 1]
+
+
+def main(argv=None):
+    """SEO анализ конкурентов из командной строки"""
+    import argparse
+    import sys
+
+    from .crawler import DEFAULT_MAX_DEPTH, DEFAULT_MAX_PAGES
+    from .domain_graph import DEFAULT_TOP_DOMAINS
+    from .results_store import ResultsStore
+
+    parser = argparse.ArgumentParser(description="SEO анализ конкурентов")
+    parser.add_argument("urls", nargs="*", help="URL страниц для анализа")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Количество одновременных запросов (1 = последовательно)")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help="Максимум одновременных запросов к одному хосту")
+    parser.add_argument("--host-rate", type=float, default=DEFAULT_RATE,
+                        help="Максимум запросов в секунду к одному хосту")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_MAXSIZE,
+                        help="Размер пула keep-alive соединений на хост")
+    parser.add_argument("--http2", action="store_true", help="Использовать HTTP/2 (нужен httpx[http2])")
+    parser.add_argument("--parser", default=DEFAULT_BACKEND, choices=["auto", "selectolax", "lxml", "html.parser"],
+                        help="HTML парсер (auto = самый быстрый установленный)")
+    parser.add_argument("--stemmer", default="auto", choices=["auto", "light", "snowball", "none"],
+                        help="Стемминг ключевых слов (auto = light: эстонский по правилам, ru/en — Snowball)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Потоковый анализ без дерева: разбор во время загрузки, без кеша ответов")
+    parser.add_argument("--no-cache", action="store_true", help="Не использовать кеш ответов и память анализа на диске")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Не сохранять результаты в хранилище (ads/.results, см. results_store.py)")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Анализировать и почти одинаковые страницы (по умолчанию пропускаются)")
+    parser.add_argument("--crawl", action="store_true",
+                        help="Обходить весь сайт по внутренним ссылкам, а не только переданные URL")
+    parser.add_argument("--parquet", metavar="PATH",
+                        help="Записывать SEO данные страниц в Parquet по мере анализа (см. columnar.py)")
+    parser.add_argument("--discover", type=int, default=0, metavar="N",
+                        help="Затем проанализировать N новых школ из внешних ссылок (см. domain_graph.py)")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, help="Глубина обхода")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES, help="Бюджет страниц на сайт")
+    parser.add_argument("--sitemap", action="store_true",
+                        help="Брать URL из sitemap сайтов (robots.txt Sitemap:), а не только переданные; "
+                             "с --crawl — искать сирот (страницы sitemap без входящих ссылок)")
+    args = parser.parse_args(argv)
+
+    # Инициализация
+    analyzer = SEOAnalyzer(http2=args.http2, pool_maxsize=args.pool_size, use_cache=not args.no_cache,
+                           per_host=args.per_host, host_rate=args.host_rate, parser=args.parser,
+                           streaming=args.stream, stemmer=args.stemmer,
+                           dedup=not args.keep_duplicates)
+    
+    # Список конкурентов для анализа
+    competitor_urls = args.urls or [
+        "https://example-competitor1.com",
+        "https://example-competitor2.com",
+        "https://example-competitor3.com"
+    ]
+    
+    # Parquet пишется группами строк по мере обхода (при прерывании записанное сохраняется)
+    writer = None
+    if args.parquet:
+        from .columnar import CRAWL_ROW_GROUP_SIZE, ColumnarWriter
+        writer = ColumnarWriter(args.parquet, row_group_size=CRAWL_ROW_GROUP_SIZE)
+    
+    def collect(pages: Iterable[SEOData]) -> List[SEOData]:
+        results = []
+        for data in pages:
+            if writer is not None:
+                writer.add(data)
+            results.append(data)
+        return results
+    
+    def analyze_sites(site_urls: List[str]) -> List[SEOData]:
+        if args.crawl:
+            results = []
+            for seed_url in site_urls:
+                results.extend(collect(analyzer.crawl_site(seed_url, max_depth=args.max_depth,
+                                                           max_pages=args.max_pages,
+                                                           max_in_flight=args.per_host,
+                                                           sitemap=args.sitemap)))
+            return results
+        if args.sitemap:
+            sitemap_urls = (url for site_url in site_urls
+                            for url in analyzer.discover_urls(site_url, max_urls=args.max_pages))
+            return collect(analyzer.analyze_multiple_pages(sitemap_urls, concurrency=args.concurrency,
+                                                           per_host=args.per_host))
+        return collect(analyzer.analyze_multiple_pages(site_urls, concurrency=args.concurrency,
+                                                       per_host=args.per_host))
+    
+    # Анализ конкурентов
+    print("Начинаем анализ конкурентов...")
+    try:
+        competitor_data = analyze_sites(competitor_urls)
+        
+        # Уже известные сайты (переданные и из реестра sites.json) — не кандидаты
+        known_sites = competitor_urls + [site.url for site in default_registry()]
+        
+        # Новые сайты из внешних ссылок уже проанализированных
+        if args.discover:
+            candidates = analyzer.external_domains.candidates(known_sites, top_n=args.discover)["competitors"]
+            if candidates:
+                print("Новые конкуренты из внешних ссылок: " + ", ".join(row["name"] for row in candidates))
+                competitor_data.extend(analyze_sites([row["seed_url"] for row in candidates]))
+    finally:
+        if writer is not None:
+            writer.close()
+            print(f"[PARQUET] страниц {writer.rows_written}, групп строк {writer.row_groups} ({writer.path})")
+    
+    # Генерация отчета
+    if competitor_data:
+        report = analyzer.generate_report(competitor_data)
+        if not args.no_store:
+            store = ResultsStore()
+            run_id = store.start_run(" ".join(sys.argv[1:]), ANALYZER_VERSION)
+            store.add_pages(run_id, (asdict(data) for data in competitor_data))
+            store.finish_run(run_id)
+            store.close()
+            print(f"[ХРАНИЛИЩЕ] запуск {run_id}: страниц {len(competitor_data)} ({store.path})")
+    
+    analyzer.print_connection_stats()
+    analyzer.print_scheduler_stats()
+    analyzer.print_cache_stats()
+    analyzer.print_stemmer_stats()
+    analyzer.print_duplicate_stats()
+    analyzer.print_domain_candidates(known_sites, top_n=DEFAULT_TOP_DOMAINS // 3)
+    analyzer.print_failures()
+    analyzer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Асинхронный движок параллельной загрузки/анализа страниц.
+
+Блокирующая функция (например, SEOAnalyzer.analyze_page) выполняется в пуле
+потоков, а asyncio ограничивает параллелизм: глобальный лимит одновременных
+запросов, а выбор следующего URL делает HostScheduler — лимит и token bucket
+на каждый хост, round-robin между хостами. Результаты возвращаются в том же
+порядке, что и входные URL; если worker упал с исключением, результат
+для URL — None, остальные URL обрабатываются дальше.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+from .scheduler import HostScheduler
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 2
+BUFFER_PER_SLOT = 64  # сколько URL читаем вперед на один слот (для round-robin)
+
+_END = object()  # конец потока URL в очереди
+
+
+def host_key(url: str) -> str:
+    """Ключ хоста для лимитов (без учета регистра)"""
+    return urlparse(url).netloc.lower()
+
+
+async def gather_in_order(urls: Iterable[str],
+                          worker: Callable[[str], T],
+                          concurrency: int = DEFAULT_CONCURRENCY,
+                          per_host: int = DEFAULT_PER_HOST,
+                          executor: Optional[ThreadPoolExecutor] = None,
+                          scheduler: Optional[HostScheduler] = None,
+                          host_setup: Optional[Callable[[str], None]] = None) -> List[Optional[T]]:
+    """
+    Запуск worker(url) для всех URL с глобальным и по-хостовым лимитами
+
+    urls может быть генератором (например, потоком URL из sitemap): он
+    читается в отдельном потоке (генератор может ждать сеть, а цикл asyncio
+    блокировать нельзя) в ограниченную очередь; в очереди и в очередях
+    планировщика не больше concurrency * BUFFER_PER_SLOT URL каждая.
+    Исключение генератора прерывает запуск. host_setup(url) вызывается один раз
+    для каждого нового хоста до первого запроса к нему (например, загрузка
+    robots.txt и Crawl-delay).
+    """
+    concurrency = max(1, concurrency)
+    scheduler = scheduler if scheduler is not None else HostScheduler(per_host=per_host)
+    buffer_limit = concurrency * BUFFER_PER_SLOT
+
+    loop = asyncio.get_running_loop()
+    results: List[Optional[T]] = []
+    known_hosts = set()
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def run_one(host: str, index: int, url: str):
+        # Исключение worker для одного URL не должно отменять остальные задачи
+        try:
+            results[index] = await loop.run_in_executor(executor, worker, url)
+        except Exception as e:
+            print(f"Ошибка при обработке {url}: {e}")
+        finally:
+            scheduler.release(host)
+
+    async def setup_host(host: str, url: str):
+        try:
+            await loop.run_in_executor(executor, host_setup, url)
+        except Exception as e:
+            print(f"Ошибка подготовки хоста {host}: {e}")
+        finally:
+            scheduler.resume(host)
+
+    # URL читаются в отдельном потоке; очередь ограничена, генератор ждет свободного места
+    queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_limit)
+    stopped = threading.Event()
+
+    def read_urls():
+        last = _END
+        try:
+            for url in urls:
+                if stopped.is_set():
+                    return
+                asyncio.run_coroutine_threadsafe(queue.put(url), loop).result()
+        except Exception as e:
+            last = e
+        if not stopped.is_set():
+            asyncio.run_coroutine_threadsafe(queue.put(last), loop).result()
+
+    def take(item) -> bool:
+        """URL из очереди -> в планировщик; False — URL закончились"""
+        if item is _END:
+            return False
+        if isinstance(item, Exception):
+            raise item
+        index = len(results)
+        results.append(None)
+        host = host_key(item)
+        if host not in known_hosts:
+            known_hosts.add(host)
+            if host_setup is not None:
+                scheduler.pause(host)
+                setups.add(asyncio.ensure_future(setup_host(host, item)))
+        scheduler.push(host, (index, item))
+        return True
+
+    threading.Thread(target=read_urls, name="url-reader", daemon=True).start()
+    exhausted = False
+    getter = None     # ожидание следующего URL, когда очередь пуста
+    running = set()   # задачи запросов
+    setups = set()    # задачи подготовки хостов
+    try:
+        while True:
+            # Забираем URL вперед, чтобы в очередях были разные хосты
+            while not exhausted and getter is None and scheduler.pending() < buffer_limit:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    getter = asyncio.ensure_future(queue.get())
+                    break
+                exhausted = not take(item)
+
+            delay = None
+            while len(running) < concurrency:
+                ready, delay = scheduler.pop_ready()
+                if ready is None:
+                    break
+                host, (index, url) = ready
+                running.add(asyncio.ensure_future(run_one(host, index, url)))
+
+            waiting = running | setups | ({getter} if getter is not None else set())
+            if not waiting:
+                if exhausted and scheduler.pending() == 0:
+                    break
+                await asyncio.sleep(delay or 0)
+                continue
+
+            done, _ = await asyncio.wait(waiting, timeout=delay,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is getter:
+                    getter = None
+                    exhausted = not take(task.result())
+                    continue
+                running.discard(task)
+                setups.discard(task)
+                task.result()
+    finally:
+        stopped.set()
+        for task in running | setups | ({getter} if getter is not None else set()):
+            task.cancel()
+        # Освобождаем место в очереди: поток чтения не должен остаться в ожидании
+        while not queue.empty():
+            queue.get_nowait()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+    return results
+
+
+def run_in_order(urls: Iterable[str],
+                 worker: Callable[[str], T],
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 per_host: int = DEFAULT_PER_HOST,
+                 scheduler: Optional[HostScheduler] = None,
+                 host_setup: Optional[Callable[[str], None]] = None) -> List[Optional[T]]:
+    """Синхронная обертка над gather_in_order для обычных скриптов"""
+    return asyncio.run(gather_in_order(urls, worker, concurrency, per_host,
+                                       scheduler=scheduler, host_setup=host_setup))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк колоночного формата (columnar.py) против JSON.
+
+Синтетические страницы (как в bench_results_store.py) записываются:
+- в JSON, как generate_report: список asdict(SEOData), json.dump(indent=2);
+- в Parquet группами строк через ColumnarWriter.
+Выводится размер файлов, время записи и загрузки: json.load и
+pandas.DataFrame из него против load_dataframe (pd.ArrowDtype и обычные
+типы pandas). Содержимое сверяется через read_pages.
+
+    python -m ads.bench_columnar
+    python -m ads.bench_columnar --pages 100000 --row-group 10000
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+from .bench_results_store import synthetic_pages
+from .columnar import DEFAULT_ROW_GROUP_SIZE, ColumnarWriter, load_dataframe, read_pages
+from .seo_data import SEOData
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк Parquet против JSON")
+    parser.add_argument("--pages", type=int, default=100000, help="Страниц")
+    parser.add_argument("--sites", type=int, default=50, help="Сайтов")
+    parser.add_argument("--row-group", type=int, default=DEFAULT_ROW_GROUP_SIZE, help="Строк в группе Parquet")
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    pages = [SEOData(**page) for page in synthetic_pages(args.pages, args.sites)]
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "pages.json")
+        parquet_path = os.path.join(directory, "pages.parquet")
+
+        def write_json():
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump({"competitors": [asdict(data) for data in pages]}, f, ensure_ascii=False, indent=2)
+
+        def write_parquet():
+            with ColumnarWriter(parquet_path, row_group_size=args.row_group) as writer:
+                writer.add_all(pages)
+            return writer
+
+        def load_json():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)["competitors"]
+
+        _, json_written = timed(write_json)
+        writer, parquet_written = timed(write_parquet)
+        json_size, parquet_size = os.path.getsize(json_path), os.path.getsize(parquet_path)
+        print(f"[РАЗМЕР] JSON {json_size / 1024 / 1024:.1f} МБ, Parquet {parquet_size / 1024 / 1024:.1f} МБ "
+              f"({json_size / parquet_size:.1f}x меньше, групп строк {writer.row_groups})")
+        print(f"[ЗАПИСЬ] JSON {json_written:.2f} с, Parquet {parquet_written:.2f} с")
+
+        records, json_loaded = timed(load_json)
+        frame, json_frame = timed(lambda: pd.DataFrame(records))
+        print(f"[ЗАГРУЗКА] json.load {json_loaded:.2f} с, + pandas.DataFrame {json_loaded + json_frame:.2f} с")
+        arrow_frame, arrow_loaded = timed(lambda: load_dataframe(parquet_path))
+        numpy_frame, numpy_loaded = timed(lambda: load_dataframe(parquet_path, arrow_dtypes=False))
+        print(f"[ЗАГРУЗКА] Parquet -> DataFrame: pd.ArrowDtype {arrow_loaded:.2f} с "
+              f"({(json_loaded + json_frame) / arrow_loaded:.0f}x быстрее), "
+              f"типы pandas {numpy_loaded:.2f} с")
+        _, column_loaded = timed(lambda: load_dataframe(parquet_path, columns=["url", "word_count"]))
+        print(f"[ЗАГРУЗКА] две колонки (url, word_count): {column_loaded * 1000:.0f} мс")
+
+        restored, read_time = timed(lambda: list(read_pages(parquet_path)))
+        print(f"[ЧТЕНИЕ] read_pages -> SEOData: {read_time:.2f} с")
+        ok = (restored == pages and len(arrow_frame) == len(numpy_frame) == len(frame) == len(pages)
+              and list(arrow_frame["word_count"]) == [data.word_count for data in pages])
+    print(f"[СВЕРКА] {'совпадает' if ok else 'НЕ СОВПАДАЕТ'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
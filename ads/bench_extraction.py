@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк извлечения SEO полей: прежние find/find_all против одного обхода.
+
+Страницы берутся из кеша ответов (ads/.http_cache) или из переданных HTML
+файлов. Для каждой страницы проверяется, что результаты совпадают, и
+выводится время на страницу для обоих вариантов.
+
+    python -m ads.bench_extraction                     # страницы из кеша
+    python -m ads.bench_extraction page1.html ...      # свои файлы
+"""
+
+import argparse
+import io
+import sys
+import time
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from .extraction import extract_page
+from .http_cache import load_pages
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+
+def legacy_extract(soup, url):
+    """Прежняя логика analyze_page: отдельный обход дерева на каждое поле"""
+    title = soup.find('title')
+    title = title.get_text().strip() if title else ""
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    meta_desc = meta_desc.get('content', '').strip() if meta_desc else ""
+    h1_tags = [h1.get_text().strip() for h1 in soup.find_all('h1')]
+    h2_tags = [h2.get_text().strip() for h2 in soup.find_all('h2')]
+    text_content = soup.get_text()
+    links = soup.find_all('a', href=True)
+    internal_urls = [urljoin(url, link['href']) for link in links
+                     if urlparse(link['href']).netloc == '' or urlparse(url).netloc in link['href']]
+    images = soup.find_all('img')
+    return (title, meta_desc, h1_tags, h2_tags, text_content, internal_urls,
+            len(links) - len(internal_urls), len(images), sum(1 for img in images if img.get('alt')))
+
+
+def single_pass(soup, url):
+    page = extract_page(soup, url)
+    return (page.title, page.meta_description, page.h1_tags, page.h2_tags, page.text,
+            page.internal_urls, page.external_links, page.images_count, page.images_with_alt)
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк извлечения SEO полей")
+    parser.add_argument("files", nargs="*", help="HTML файлы (по умолчанию — страницы из кеша)")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов на страницу (берется лучшее время)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.files)
+    if not pages:
+        print("[ОШИБКА] Нет страниц: запустите анализ (кеш ads/.http_cache) или передайте HTML файлы")
+        return
+
+    total_legacy = total_single = 0.0
+    mismatches = 0
+    print(f"{'Страница':50} {'KB':>6} {'прежний, мс':>12} {'1 обход, мс':>12} {'ускорение':>10}")
+    for url, html in pages:
+        soup = BeautifulSoup(html, 'html.parser')
+        if legacy_extract(soup, url) != single_pass(soup, url):
+            mismatches += 1
+            print(f"[РАСХОЖДЕНИЕ] {url}")
+        legacy = best_time(lambda: legacy_extract(soup, url), args.repeat)
+        single = best_time(lambda: single_pass(soup, url), args.repeat)
+        total_legacy += legacy
+        total_single += single
+        print(f"{url[:50]:50} {len(html) / 1024:6.0f} {legacy * 1000:12.2f} {single * 1000:12.2f} "
+              f"{legacy / single:9.1f}x")
+
+    print(f"\nСтраниц: {len(pages)}, расхождений: {mismatches}")
+    print(f"Среднее на страницу: прежний {total_legacy / len(pages) * 1000:.2f} мс, "
+          f"один обход {total_single / len(pages) * 1000:.2f} мс "
+          f"(ускорение {total_legacy / total_single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
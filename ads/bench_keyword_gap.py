@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк TF-IDF разрыва: разреженные матрицы против циклов по Counter.
+
+Генерируется синтетический корпус (слова по закону Ципфа, у каждого
+сайта свои любимые темы), разрыв считается через tfidf.keyword_gap и
+наивной реализацией на словарях Python. Результаты сравниваются, время
+выводится для обоих вариантов.
+
+    python -m ads.bench_keyword_gap
+    python -m ads.bench_keyword_gap --pages 50000 --naive-pages 5000
+"""
+
+import argparse
+import io
+import math
+import sys
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from .tfidf import DocumentTermMatrix, keyword_gap
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+
+def synthetic_corpus(pages: int, sites: int, vocabulary: int, words: int, seed: int = 1):
+    """(сайт, url, термины) — у каждого сайта свой сдвиг популярности слов"""
+    rng = np.random.default_rng(seed)
+    names = [f"term{i}" for i in range(vocabulary)]
+    ranks = np.arange(1, vocabulary + 1)
+    for page in range(pages):
+        site = page % sites
+        weights = 1.0 / (ranks + (site * 37) % 100)
+        ids = rng.choice(vocabulary, size=words, p=weights / weights.sum())
+        yield f"site{site}.ee", f"https://site{site}.ee/p{page}", [names[i] for i in ids]
+
+
+def naive_gap(docs, target: str, top_n: int, min_sites: int):
+    """Тот же расчет на Counter и словарях (для сравнения)"""
+    df = Counter()
+    doc_counts = []
+    for site, _, terms in docs:
+        counts = Counter(terms)
+        doc_counts.append((site, counts))
+        df.update(counts.keys())
+    n_docs = len(doc_counts)
+
+    site_sums = defaultdict(lambda: defaultdict(float))
+    site_pages = Counter()
+    for site, counts in doc_counts:
+        weights = {term: (1 + math.log(tf)) * (math.log((1 + n_docs) / (1 + df[term])) + 1)
+                   for term, tf in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        for term, weight in weights.items():
+            site_sums[site][term] += weight / norm
+        site_pages[site] += 1
+
+    competitors = [site for site in site_sums if site != target]
+    gaps = {}
+    for term in df:
+        values = [site_sums[site].get(term, 0.0) / site_pages[site] for site in competitors]
+        if sum(1 for value in values if value > 0) < min_sites:
+            continue
+        gap = sum(values) / len(values) - site_sums[target].get(term, 0.0) / site_pages[target]
+        if gap > 0:
+            gaps[term] = gap
+    return [term for term, _ in sorted(gaps.items(), key=lambda item: -item[1])[:top_n]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк TF-IDF разрыва по ключевым словам")
+    parser.add_argument("--pages", type=int, default=20000, help="Страниц в корпусе")
+    parser.add_argument("--naive-pages", type=int, default=5000,
+                        help="Страниц для наивной реализации (она медленная)")
+    parser.add_argument("--sites", type=int, default=12, help="Сайтов")
+    parser.add_argument("--vocabulary", type=int, default=30000, help="Размер словаря")
+    parser.add_argument("--words", type=int, default=400, help="Слов на странице")
+    args = parser.parse_args()
+
+    print(f"Корпус: {args.pages} страниц, {args.sites} сайтов, {args.words} слов на странице")
+    docs = list(synthetic_corpus(args.pages, args.sites, args.vocabulary, args.words))
+    target = docs[0][0]
+
+    start = time.perf_counter()
+    matrix = DocumentTermMatrix()
+    for site, url, terms in docs:
+        matrix.add(site, url, terms)
+    built = time.perf_counter()
+    report = keyword_gap(matrix, target, top_n=30)
+    computed = time.perf_counter()
+    nnz = matrix.counts().nnz
+    print(f"[SPARSE] {args.pages} страниц: матрица {built - start:.2f} с ({nnz} ненулевых), "
+          f"TF-IDF и разрыв {computed - built:.3f} с")
+
+    subset = docs[:args.naive_pages]
+    start = time.perf_counter()
+    expected = naive_gap(subset, target, 30, 2)
+    naive_time = time.perf_counter() - start
+
+    small = DocumentTermMatrix()
+    for site, url, terms in subset:
+        small.add(site, url, terms)
+    start = time.perf_counter()
+    actual = [row["term"] for row in keyword_gap(small, target, top_n=30)["gaps"]]
+    sparse_time = time.perf_counter() - start
+    print(f"[СРАВНЕНИЕ] {len(subset)} страниц: Counter {naive_time:.2f} с, "
+          f"разреженные матрицы {sparse_time:.3f} с (без построения матрицы), "
+          f"top-30 {'совпадает' if actual == expected else 'НЕ СОВПАДАЕТ'}")
+    return 0 if actual == expected else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк графа внутренних ссылок (link_graph.py).
+
+Генерируется синтетический сайт: главная ссылается на разделы, разделы —
+на свои страницы, у каждой страницы общее меню и несколько случайных
+ссылок. Выводится время построения CSR, PageRank, глубины и сирот;
+на небольшом графе результат сверяется с наивной реализацией на
+словарях Python.
+
+    python -m ads.bench_link_graph
+    python -m ads.bench_link_graph --pages 100000 --links 10
+"""
+
+import argparse
+import io
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from .link_graph import LinkGraph, link_report
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+BASE = "https://site.ee"
+
+
+def synthetic_site(pages: int, links: int, sections: int = 20, seed: int = 1):
+    """(url, ссылки) для каждой страницы; последние 1% страниц никто не ссылается (сироты)"""
+    rng = np.random.default_rng(seed)
+    linked = pages - max(1, pages // 100)
+    menu = [f"{BASE}/s{i}" for i in range(sections)]
+    yield f"{BASE}/", menu
+    for section in range(sections):
+        children = range(section, linked, sections)
+        yield menu[section], [f"{BASE}/p{i}" for i in children][:200] + menu[:5]
+    for page in range(linked):
+        targets = rng.integers(0, linked, size=links)
+        yield f"{BASE}/p{page}", menu[:5] + [f"{BASE}/p{i}" for i in targets]
+
+
+def naive_pagerank(edges, damping=0.85, iterations=100):
+    """PageRank на словарях (для сверки)"""
+    nodes = sorted({node for edge in edges for node in edge} | {source for source, _ in edges})
+    out = {node: [] for node in nodes}
+    for source, target in edges:
+        out[source].append(target)
+    rank = {node: 1.0 / len(nodes) for node in nodes}
+    for _ in range(iterations):
+        dangling = sum(rank[node] for node in nodes if not out[node])
+        new = {node: (1 - damping + damping * dangling) / len(nodes) for node in nodes}
+        for node in nodes:
+            for target in out[node]:
+                new[target] += damping * rank[node] / len(out[node])
+        rank = new
+    return rank
+
+
+def naive_depth(edges, start):
+    out = {}
+    for source, target in edges:
+        out.setdefault(source, []).append(target)
+    depth = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for target in out.get(node, ()):
+            if target not in depth:
+                depth[target] = depth[node] + 1
+                queue.append(target)
+    return depth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк графа ссылок")
+    parser.add_argument("--pages", type=int, default=10000, help="Страниц на сайте")
+    parser.add_argument("--links", type=int, default=5, help="Случайных ссылок на странице (плюс меню)")
+    parser.add_argument("--check-pages", type=int, default=2000, help="Страниц для сверки с наивной реализацией")
+    args = parser.parse_args()
+
+    site = list(synthetic_site(args.pages, args.links))
+    sitemap = [f"{BASE}/p{i}" for i in range(args.pages)]
+
+    start = time.perf_counter()
+    graph = LinkGraph()
+    for url, links in site:
+        graph.add(url, links)
+    built = time.perf_counter()
+    report = link_report(graph, f"{BASE}/", sitemap)
+    computed = time.perf_counter()
+    print(f"[ГРАФ] страниц {report['pages']}, ребер {report['edges']}: добавление {built - start:.3f} с, "
+          f"CSR + PageRank ({report['pagerank_iterations']} итераций) + глубина + сироты "
+          f"{computed - built:.3f} с")
+    print(f"[ГРАФ] глубина: {report['depth_histogram']}, сирот {len(report['orphans'])}")
+
+    small = list(synthetic_site(args.check_pages, args.links, seed=2))
+    graph = LinkGraph()
+    for url, links in small:
+        graph.add(url, links)
+    report = link_report(graph, f"{BASE}/", top_n=args.check_pages * 2)
+    edges = list({(url, link) for url, links in small for link in links if link != url})
+    expected_rank = naive_pagerank(edges)
+    expected_depth = naive_depth(edges, f"{BASE}/")
+    rank_error = max(abs(row["pagerank"] - expected_rank[row["url"]]) for row in report["top_pages"])
+    depth_ok = all(row["depth"] == expected_depth.get(row["url"], -1) for row in report["top_pages"])
+    ok = rank_error < 1e-5 and depth_ok and len(report["top_pages"]) == len(expected_rank)
+    print(f"[СВЕРКА] {len(expected_rank)} страниц: макс. отклонение PageRank {rank_error:.2e}, "
+          f"глубина {'совпадает' if depth_ok else 'НЕ СОВПАДАЕТ'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк поиска почти одинаковых страниц (MinHash + LSH).
+
+Генерируются синтетические страницы (слова по закону Ципфа), часть из
+них — копии с несколькими замененными словами. Для разного размера
+индекса выводится время отпечатка и поиска на страницу и доля найденных
+копий; время поиска не должно расти вместе с индексом.
+
+    python -m ads.bench_near_duplicates
+    python -m ads.bench_near_duplicates --pages 200000 --words 600
+"""
+
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+
+from .near_duplicates import NearDuplicateIndex, minhash
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+
+def synthetic_pages(pages: int, words: int, vocabulary: int, copy_every: int, changes: int, seed: int = 1):
+    """(url, слова, url оригинала или None): каждая copy_every-я страница — копия предыдущей с правками"""
+    rng = np.random.default_rng(seed)
+    names = [f"w{i}" for i in range(vocabulary)]
+    weights = 1.0 / np.arange(1, vocabulary + 1)
+    weights /= weights.sum()
+    previous = None
+    for page in range(pages):
+        url = f"https://site.ee/p{page}"
+        if previous is not None and page % copy_every == 0:
+            text = list(previous[1])
+            for position in rng.choice(len(text), size=changes, replace=False):
+                text[position] = names[rng.integers(vocabulary)]
+            yield url, text, previous[0]
+            continue
+        text = [names[i] for i in rng.choice(vocabulary, size=words, p=weights)]
+        previous = (url, text)
+        yield url, text, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк MinHash + LSH")
+    parser.add_argument("--pages", type=int, default=50000, help="Страниц")
+    parser.add_argument("--words", type=int, default=400, help="Слов на странице")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="Размер словаря")
+    parser.add_argument("--copy-every", type=int, default=10, help="Каждая N-я страница — копия")
+    parser.add_argument("--changes", type=int, default=2, help="Замененных слов в копии")
+    args = parser.parse_args()
+
+    print(f"Генерация: {args.pages} страниц по {args.words} слов, каждая {args.copy_every}-я — копия")
+    pages = list(synthetic_pages(args.pages, args.words, args.vocabulary, args.copy_every, args.changes))
+
+    start = time.perf_counter()
+    fingerprints = [minhash(words) for _, words, _ in pages]
+    hashed = time.perf_counter() - start
+    print(f"[MINHASH] {hashed / len(pages) * 1e6:.0f} мкс на страницу")
+
+    index = NearDuplicateIndex()
+    checkpoint = max(1, len(pages) // 5)
+    found = expected = false_positives = 0
+    start = last = time.perf_counter()
+    print(f"{'Индекс':>8} {'мкс/страница':>13} {'сравнений/стр.':>15}")
+    last_comparisons = 0
+    for number, ((url, _, original), fingerprint) in enumerate(zip(pages, fingerprints), 1):
+        duplicate = index.check(url, fingerprint)
+        if original is not None:
+            expected += 1
+            found += duplicate is not None and duplicate.duplicate_of == original
+        elif duplicate is not None:
+            false_positives += 1
+        if number % checkpoint == 0:
+            now = time.perf_counter()
+            print(f"{number:8d} {(now - last) / checkpoint * 1e6:13.1f} "
+                  f"{(index.comparisons - last_comparisons) / checkpoint:15.2f}")
+            last, last_comparisons = now, index.comparisons
+    total = time.perf_counter() - start
+    print(f"[LSH] {len(pages)} страниц за {total:.2f} с; копий найдено {found} из {expected}, "
+          f"ложных срабатываний {false_positives}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
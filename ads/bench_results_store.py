@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк хранилища результатов (results_store.py) против JSON файлов.
+
+Генерируются синтетические результаты страниц (SEOData как словари) по
+нескольким сайтам. Замеряется:
+- запись пачками (одна транзакция на batch_size строк) и построчно
+  (транзакция на строку — на части страниц, с пересчетом на все);
+- чтение последних результатов всех страниц и одного сайта запросом;
+- изменения последнего запуска (run_diff.py): в нем меняется title у
+  каждой --changed-every страницы, остальные отсекаются по хешу;
+- для сравнения: те же записи как отдельные *_report.json — запись и
+  чтение glob + json.load, как раньше делал сравнительный отчет.
+
+    python -m ads.bench_results_store
+    python -m ads.bench_results_store --pages 100000 --runs 3
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from .results_store import ResultsStore
+from .run_diff import diff_run
+from .site_registry import SiteRegistry
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+WORDS = ("autokool", "sõidukool", "kategooria", "juhiload", "eksam", "teooria", "hind", "tallinn",
+         "tartu", "kursus", "libedasõit", "õpetaja", "registreeru", "автошкола", "курсы", "экзамен")
+
+
+def synthetic_pages(pages: int, sites: int, seed: int = 1):
+    rng = random.Random(seed)
+    for i in range(pages):
+        site = i % sites
+        words = [rng.choice(WORDS) for _ in range(30)]
+        yield {
+            "url": f"https://site{site}.ee/page{i // sites}",
+            "title": " ".join(words[:6]),
+            "meta_description": " ".join(words[:20]),
+            "h1_tags": [" ".join(words[:3])],
+            "h2_tags": [" ".join(words[j:j + 3]) for j in range(0, 15, 3)],
+            "keywords": words[:20],
+            "keyphrases": [" ".join(words[j:j + 2]) for j in range(0, 10, 2)],
+            "word_count": rng.randint(100, 2000),
+            "internal_links": rng.randint(5, 80),
+            "external_links": rng.randint(0, 20),
+            "images_count": rng.randint(0, 40),
+            "images_with_alt": rng.randint(0, 10),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк хранилища результатов")
+    parser.add_argument("--pages", type=int, default=100000, help="Страниц в запуске")
+    parser.add_argument("--sites", type=int, default=50, help="Сайтов")
+    parser.add_argument("--runs", type=int, default=2, help="Запусков (история)")
+    parser.add_argument("--row-commit-pages", type=int, default=2000,
+                        help="Страниц для замера записи с транзакцией на строку")
+    parser.add_argument("--json-pages", type=int, default=None,
+                        help="Страниц для сравнения с JSON файлами (по умолчанию --pages)")
+    parser.add_argument("--changed-every", type=int, default=100,
+                        help="В последнем запуске меняется каждая N-я страница")
+    args = parser.parse_args()
+    registry = SiteRegistry([])          # сайты без реестра: ключ — хост
+    pages = list(synthetic_pages(args.pages, args.sites))
+    changed_pages = [dict(page, title=page["title"] + " 2024") if i % args.changed_every == 1 else page
+                     for i, page in enumerate(pages)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultsStore(os.path.join(directory, "batched"), registry=registry)
+        for run in range(args.runs):
+            start = time.perf_counter()
+            run_id = store.start_run(f"bench {run}")
+            store.add_pages(run_id, changed_pages if run == args.runs - 1 else pages)
+            store.finish_run(run_id)
+            elapsed = time.perf_counter() - start
+            print(f"[ЗАПИСЬ] запуск {run + 1}: {len(pages)} страниц пачками по {store.batch_size} — "
+                  f"{elapsed:.2f} с ({len(pages) / elapsed:,.0f} стр/с)")
+
+        start = time.perf_counter()
+        diff = diff_run(store)
+        expected = sum(1 for i in range(len(pages)) if i % args.changed_every == 1) if args.runs > 1 else 0
+        print(f"[ИЗМЕНЕНИЯ] последний запуск: изменилось {len(diff.changed) - diff.new_pages}, "
+              f"новых {diff.new_pages} из {diff.pages} за {time.perf_counter() - start:.2f} с")
+
+        start = time.perf_counter()
+        latest = store.latest_pages()
+        elapsed = time.perf_counter() - start
+        print(f"[ЧТЕНИЕ] последние результаты всех страниц: {len(latest)} за {elapsed:.2f} с")
+        start = time.perf_counter()
+        one_site = store.latest_pages("site7.ee")
+        print(f"[ЧТЕНИЕ] последние результаты одного сайта: {len(one_site)} за "
+              f"{(time.perf_counter() - start) * 1000:.1f} мс")
+        start = time.perf_counter()
+        history = store.history(pages[0]["url"])
+        print(f"[ЧТЕНИЕ] история страницы: {len(history)} запусков за {(time.perf_counter() - start) * 1000:.2f} мс")
+        size = os.path.getsize(store.path)
+        store.close()
+        print(f"[РАЗМЕР] база {size / 1024 / 1024:.1f} МБ ({args.runs} запусков)")
+        ok = len(latest) == len(pages) and latest[0]["seo_data"] == next(
+            page for page in pages if page["url"] == latest[0]["url"])
+        ok = ok and len(diff.changed) - diff.new_pages == expected
+
+        rows = pages[:args.row_commit_pages]
+        row_store = ResultsStore(os.path.join(directory, "rows"), batch_size=1, registry=registry)
+        start = time.perf_counter()
+        run_id = row_store.start_run("bench rows")
+        row_store.add_pages(run_id, rows)
+        row_store.finish_run(run_id)
+        elapsed = time.perf_counter() - start
+        row_store.close()
+        print(f"[ЗАПИСЬ] транзакция на строку: {len(rows)} страниц за {elapsed:.2f} с "
+              f"({len(rows) / elapsed:,.0f} стр/с, на {len(pages)} страниц ~{elapsed * len(pages) / len(rows):.0f} с)")
+
+        json_pages = pages[:args.json_pages] if args.json_pages else pages
+        report_dir = os.path.join(directory, "json")
+        os.makedirs(report_dir)
+        start = time.perf_counter()
+        for i, page in enumerate(json_pages):
+            with open(os.path.join(report_dir, f"page{i}_report.json"), 'w', encoding='utf-8') as f:
+                json.dump({"analysis_date": "2024-01-01T00:00:00", "site_url": page["url"], "seo_data": page},
+                          f, ensure_ascii=False, indent=2)
+        written = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = []
+        for path in sorted(glob.glob(os.path.join(report_dir, "*_report.json"))):
+            with open(path, 'r', encoding='utf-8') as f:
+                loaded.append(json.load(f))
+        scanned = time.perf_counter() - start
+        print(f"[JSON] {len(json_pages)} файлов *_report.json: запись {written:.2f} с, "
+              f"glob + json.load {scanned:.2f} с (только последний запуск, без истории)")
+    print(f"[СВЕРКА] {'совпадает' if ok else 'НЕ СОВПАДАЕТ'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
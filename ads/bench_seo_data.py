@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк памяти SEOData: компактная запись против обычного dataclass.
+
+Синтетические страницы (как в bench_results_store.py) проходят через
+json.dumps/json.loads, чтобы у каждой страницы были свои объекты строк,
+как после разбора HTML или чтения кеша. Из них строятся записи старого
+вида (dataclass с __dict__, строки как есть) и SEOData (__slots__,
+интернированные строки). Для каждого варианта выводится память,
+удерживаемая всеми записями (tracemalloc), и время создания; asdict
+обоих сверяется.
+
+    python -m ads.bench_seo_data
+    python -m ads.bench_seo_data --pages 100000 --sites 50
+"""
+
+import argparse
+import gc
+import io
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, fields, make_dataclass
+
+from .bench_results_store import synthetic_pages
+from .seo_data import SEOData
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# SEOData до компактной записи: те же поля, __dict__ и списки строк как есть
+LegacySEOData = make_dataclass("LegacySEOData", [(field.name, field.type) for field in fields(SEOData)])
+
+
+def measure(record_type, encoded_pages):
+    """(записи, удерживаемая память в байтах, время создания в с)"""
+    # Время — без tracemalloc (он замедляет каждое выделение памяти)
+    start = time.perf_counter()
+    records = [record_type(**json.loads(page)) for page in encoded_pages]
+    elapsed = time.perf_counter() - start
+    del records
+    gc.collect()
+    tracemalloc.start()
+    records = [record_type(**json.loads(page)) for page in encoded_pages]
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память SEOData: __slots__ и интернирование строк")
+    parser.add_argument("--pages", type=int, default=100000, help="Страниц")
+    parser.add_argument("--sites", type=int, default=50, help="Сайтов")
+    args = parser.parse_args()
+
+    encoded_pages = [json.dumps(page, ensure_ascii=False) for page in synthetic_pages(args.pages, args.sites)]
+
+    legacy, legacy_size, legacy_time = measure(LegacySEOData, encoded_pages)
+    print(f"[СТАРЫЙ] dataclass: {legacy_size / 1024 / 1024:.1f} МБ "
+          f"({legacy_size / len(legacy):.0f} байт на страницу), создание {legacy_time:.2f} с")
+    compact, compact_size, compact_time = measure(SEOData, encoded_pages)
+    print(f"[НОВЫЙ] SEOData (__slots__, интернирование): {compact_size / 1024 / 1024:.1f} МБ "
+          f"({compact_size / len(compact):.0f} байт на страницу), создание {compact_time:.2f} с")
+    print(f"[ИТОГО] памяти в {legacy_size / compact_size:.1f} раза меньше")
+
+    start = time.perf_counter()
+    compact_dicts = [asdict(data) for data in compact]
+    print(f"[ASDICT] {len(compact_dicts)} записей за {time.perf_counter() - start:.2f} с")
+    ok = compact_dicts == [asdict(data) for data in legacy]
+    print(f"[СВЕРКА] {'совпадает' if ok else 'НЕ СОВПАДАЕТ'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Бенчмарк времени запуска: python -X importtime для команд пакета.
+
+Для каждого сценария интерпретатор запускается несколько раз; выводится
+лучшее время до выхода и суммарное время импортов из -X importtime, а
+также какие тяжелые зависимости загрузились. С --baseline REV те же
+замеры делаются для дерева ads/ из git-ревизии REV (извлекается во
+временный каталог): старые скрипты analyze_*.py загружали ads-1.py
+через importlib, этот сценарий есть в обеих раскладках.
+
+import ads.analyzer по-прежнему загружает numpy (~60 мс): MinHash
+отпечаток (near_duplicates.py) считается для каждой страницы, поэтому
+модуль импортируется сразу. Обход сайта, sitemap, граф ссылок (scipy) и
+граф внешних доменов загружаются только при использовании.
+
+    python -m ads.bench_startup
+    python -m ads.bench_startup --baseline HEAD~1 --repeat 10
+"""
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('asyncio', 'requests', 'bs4', 'lxml', 'selectolax', 'numpy', 'scipy')
+
+# Как analyze_*.py импортировали анализатор до пакета
+LEGACY_LOAD = ("import importlib.util, sys; "
+               "spec = importlib.util.spec_from_file_location('ads_1', 'ads-1.py'); "
+               "module = importlib.util.module_from_spec(spec); sys.modules['ads_1'] = module; "
+               "spec.loader.exec_module(module)")
+
+# (название, аргументы интерпретатора, каталог запуска относительно корня)
+SCENARIOS = [
+    ("python -c pass (сам интерпретатор)", ["-c", "pass"], "."),
+    ("import ads", ["-c", "import ads"], "."),
+    ("python -m ads --help", ["-m", "ads", "--help"], "."),
+    ("python -m ads list", ["-m", "ads", "list"], "."),
+    ("import ads.analyzer (analyze)", ["-c", "import ads.analyzer"], "."),
+    ("SEOAnalyzer() с парсером auto", ["-c", "import ads; ads.SEOAnalyzer(use_cache=False).close()"], "."),
+]
+LEGACY_SCENARIO = ("ads-1.py через importlib (analyze_*.py)", ["-c", LEGACY_LOAD], "ads")
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, int]]:
+    """(сумма времени импортов верхнего уровня в мс, модуль -> накопленное время в мкс)"""
+    total = 0
+    modules: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        cumulative = int(cumulative)
+        modules[name.strip()] = cumulative
+        if not name.startswith('  '):           # после '|' один пробел; вложенные — с отступом
+            total += cumulative
+    return total / 1000, modules
+
+
+def measure(args: List[str], cwd: str, repeat: int) -> Tuple[float, float, List[str]]:
+    """(лучшее время процесса в мс, лучшее время импортов в мс, загруженные тяжелые модули)"""
+    best_wall = best_imports = float('inf')
+    heavy: List[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=cwd,
+                                capture_output=True, text=True)
+        wall = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)}: код {result.returncode}\n{result.stderr[-2000:]}")
+        imports, modules = parse_importtime(result.stderr)
+        best_wall = min(best_wall, wall)
+        best_imports = min(best_imports, imports)
+        heavy = [name for name in HEAVY_MODULES if name in modules]
+    return best_wall, best_imports, heavy
+
+
+def run_scenarios(root: str, scenarios, repeat: int, label: str):
+    print(f"\n[{label}] {root}")
+    print(f"{'сценарий':44} {'процесс, мс':>12} {'импорты, мс':>12}  тяжелые модули")
+    for name, args, cwd in scenarios:
+        wall, imports, heavy = measure(args, os.path.join(root, cwd), repeat)
+        print(f"{name:44} {wall:12.1f} {imports:12.1f}  {', '.join(heavy) or '-'}")
+
+
+def extract_revision(revision: str, target: str) -> Optional[str]:
+    """Дерево ads/ ревизии revision в target (None, если git недоступен)"""
+    archive = subprocess.run(["git", "archive", "--format=tar", revision, "ads"], cwd=ROOT,
+                             capture_output=True)
+    if archive.returncode != 0:
+        print(f"[ОШИБКА] git archive {revision}: {archive.stderr.decode(errors='replace').strip()}")
+        return None
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        tar.extractall(target)
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время запуска команд пакета ads (-X importtime)")
+    parser.add_argument("--repeat", type=int, default=5, help="Запусков на сценарий (берется лучший)")
+    parser.add_argument("--baseline", metavar="REV", help="Сравнить с деревом ads/ из git-ревизии")
+    args = parser.parse_args()
+
+    run_scenarios(ROOT, SCENARIOS + [LEGACY_SCENARIO], args.repeat, "ТЕКУЩЕЕ")
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as target:
+            if extract_revision(args.baseline, target) is None:
+                return 1
+            scenarios = [SCENARIOS[0], LEGACY_SCENARIO]
+            if os.path.exists(os.path.join(target, "ads", "__init__.py")):
+                scenarios = SCENARIOS + [LEGACY_SCENARIO]
+            run_scenarios(target, scenarios, args.repeat, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверка HTML парсеров: одинаковые SEOData и скорость каждого.
+
+Страницы — набор tests/fixtures/html (корректные страницы и испорченный
+HTML) и все страницы из кеша ads/.http_cache, либо переданные HTML файлы.
+Для каждой SEOData, полученные через каждый установленный парсер,
+сравниваются с эталоном html.parser. Расхождения, записанные для страниц
+набора в known_differences.json, выводятся как известные и ошибкой не
+считаются. Затем выводится пропускная способность парсеров.
+Код возврата 1, если есть другие расхождения.
+
+    python -m ads.check_backends
+    python -m ads.check_backends page1.html page2.html
+"""
+
+import argparse
+import glob
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, List
+
+from .html_backends import available_backends
+from .analyzer import SEOAnalyzer
+from .http_cache import load_pages
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests", "fixtures", "html")
+
+
+def fixture_files() -> List[str]:
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+
+
+def known_differences() -> Dict[str, Dict[str, List[str]]]:
+    """{URL страницы набора: {парсер: поля, которые отличаются от html.parser}}"""
+    path = os.path.join(FIXTURES_DIR, "known_differences.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return {f"file://{name}": backends for name, backends in json.load(f).items()}
+
+
+def differing_fields(reference: SEOAnalyzer, analyzer: SEOAnalyzer, url: str, html: str):
+    """(поля SEOData, отличающиеся от reference, SEOData эталона, SEOData парсера)"""
+    expected, expected_links = reference._analyze_html(url, html)
+    data, links = analyzer._analyze_html(url, html)
+    expected, data = asdict(expected), asdict(data)
+    fields = [key for key in expected if expected[key] != data[key]]
+    if links != expected_links:
+        fields.append('internal_urls')
+    return fields, expected, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка совпадения и скорости HTML парсеров")
+    parser.add_argument("files", nargs="*", help="HTML файлы (по умолчанию — страницы из кеша)")
+    parser.add_argument("--repeat", type=int, default=3, help="Повторов для замера скорости")
+    args = parser.parse_args()
+
+    pages = load_pages(args.files) if args.files else load_pages(fixture_files()) + load_pages()
+    if not pages:
+        print("[ОШИБКА] Нет страниц: передайте HTML файлы")
+        return 1
+    known = {} if args.files else known_differences()
+
+    backends = available_backends()
+    analyzers = {name: SEOAnalyzer(use_cache=False, parser=name) for name in backends}
+    reference = analyzers['html.parser']
+
+    # Совпадение SEOData
+    mismatches = 0
+    for url, html in pages:
+        for name in backends:
+            if name == 'html.parser':
+                continue
+            fields, expected, data = differing_fields(reference, analyzers[name], url, html)
+            if fields and fields == known.get(url, {}).get(name):
+                print(f"[ИЗВЕСТНО] {name} / {url}: {', '.join(fields)}")
+            elif fields:
+                mismatches += 1
+                print(f"[РАСХОЖДЕНИЕ] {name} / {url}: {', '.join(fields)}")
+                for key in fields[:3]:
+                    if key in expected:
+                        print(f"    html.parser: {str(expected[key])[:100]}")
+                        print(f"    {name}: {str(data[key])[:100]}")
+
+    print(f"\n[ПРОВЕРКА] Страниц: {len(pages)}, парсеров: {len(backends)}, расхождений: {mismatches}")
+
+    # Пропускная способность (разбор + извлечение полей + ключевые слова)
+    total_bytes = sum(len(html.encode('utf-8')) for _, html in pages)
+    print(f"\n{'Парсер':12} {'страниц/с':>10} {'МБ/с':>8} {'мс/стр':>8}")
+    for name in backends:
+        analyzer = analyzers[name]
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for url, html in pages:
+                analyzer._analyze_html(url, html)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:12} {len(pages) / best:10.1f} {total_bytes / best / 1024 / 1024:8.2f} "
+              f"{best / len(pages) * 1000:8.2f}")
+
+    for analyzer in analyzers.values():
+        analyzer.close()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Проверка потокового анализа: те же SEOData и постоянная память.
+
+1. Каждая сохраненная страница (кеш ads/.http_cache или переданные HTML
+   файлы) подается в SEOAnalyzer.analyze_chunks кусками разного размера;
+   результат сравнивается с анализом через дерево html.parser.
+2. Кодировка при загрузке: локальный HTTP сервер отдает русскую страницу
+   в UTF-8 и windows-1251 с charset в Content-Type, только в <meta
+   charset> и без обоих; analyze_page в потоковом режиме должен дать то
+   же, что анализ правильно декодированного текста.
+3. Из страниц собираются документы в несколько мегабайт, и для обоих
+   способов замеряется пиковая память (tracemalloc) и время. Для анализа
+   через дерево учитывается и сам текст ответа, который нужно держать
+   целиком; потоковый анализ получает куски по 64 КБ, как из сети.
+Код возврата 1, если есть расхождения.
+
+    python -m ads.check_streaming
+    python -m ads.check_streaming page1.html --sizes 1 4 16
+"""
+
+import argparse
+import io
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .analyzer import SEOAnalyzer
+from .http_cache import load_pages
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+CHUNK_SIZES = (1, 13, 1024, 64 * 1024)
+NETWORK_CHUNK = 64 * 1024
+
+CHARSET_PAGE = ("<html><head>{meta}<title>Автошкола Виктория</title></head><body>"
+                "<h1>Курсы вождения</h1><p>Автошкола Виктория: курсы вождения категории B, "
+                "курсы вождения в Таллинне.</p></body></html>")
+# (Content-Type, кодировка тела, charset в <meta> или None)
+CHARSET_CASES = [
+    ("text/html", "utf-8", "utf-8"),
+    ("text/html", "windows-1251", "windows-1251"),
+    ("text/html; charset=windows-1251", "windows-1251", None),
+    ("text/html; charset=\"utf-8\"", "utf-8", None),
+    ("text/html", "utf-8", None),
+]
+
+
+def iter_chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def iter_repeated(unit: bytes, times: int, size: int = NETWORK_CHUNK):
+    """Большой документ кусками, не собирая его целиком в памяти"""
+    for _ in range(times):
+        yield from iter_chunks(unit, size)
+
+
+def measure(func):
+    """(результат, пиковая память в МБ, секунды)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1024 / 1024, elapsed
+
+
+def charset_pages():
+    """{путь: (Content-Type, тело, текст страницы)}"""
+    pages = {}
+    for number, (content_type, encoding, meta) in enumerate(CHARSET_CASES):
+        html = CHARSET_PAGE.format(meta=f'<meta charset="{meta}">' if meta else '')
+        pages[f"/page{number}"] = (content_type, html.encode(encoding), html)
+    return pages
+
+
+def check_charsets(analyzer: SEOAnalyzer) -> int:
+    """Кодировка страниц без charset в заголовке; число расхождений"""
+    pages = charset_pages()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            content_type, body, _ = pages[self.path]
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    mismatches = 0
+    try:
+        for path, (content_type, _, html) in pages.items():
+            url = f"http://127.0.0.1:{server.server_port}{path}"
+            expected = asdict(analyzer._analyze_html(url, html)[0])
+            data = analyzer.analyze_page(url)
+            data = asdict(data) if data else {}
+            fields = [key for key in expected if expected[key] != data.get(key)]
+            if fields:
+                mismatches += 1
+                print(f"[РАСХОЖДЕНИЕ] {content_type}, {CHARSET_CASES[int(path[5:])][1]}: {', '.join(fields)}")
+                print(f"    ожидалось: {expected['title']}")
+                print(f"    получено:  {data.get('title')}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(f"[КОДИРОВКА] Случаев: {len(pages)}, расхождений: {mismatches}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка потокового анализа страниц")
+    parser.add_argument("files", nargs="*", help="HTML файлы (по умолчанию — страницы из кеша)")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 8],
+                        help="Размеры больших документов для замера памяти, МБ")
+    args = parser.parse_args()
+
+    analyzer = SEOAnalyzer(use_cache=False, parser='html.parser', streaming=True)
+    mismatches = check_charsets(analyzer)
+
+    pages = load_pages(args.files)
+    if not pages:
+        print("[ОШИБКА] Нет страниц: запустите анализ (кеш ads/.http_cache) или передайте HTML файлы")
+        analyzer.close()
+        return 1
+
+    # Совпадение с анализом через дерево при любом разбиении на куски
+    for url, html in pages:
+        expected, expected_links = analyzer._analyze_html(url, html)
+        expected = asdict(expected)
+        body = html.encode('utf-8')
+        for size in CHUNK_SIZES:
+            data, links = analyzer.analyze_chunks(url, iter_chunks(body, size), 'utf-8')
+            data = asdict(data)
+            fields = [key for key in expected if expected[key] != data[key]]
+            if links != expected_links:
+                fields.append('internal_urls')
+            if fields:
+                mismatches += 1
+                print(f"[РАСХОЖДЕНИЕ] {url}, куски по {size} байт: {', '.join(fields)}")
+                for key in fields[:3]:
+                    if key in expected:
+                        print(f"    дерево: {str(expected[key])[:100]}")
+                        print(f"    поток:  {str(data[key])[:100]}")
+    print(f"[ПРОВЕРКА] Страниц: {len(pages)}, разбиений: {len(CHUNK_SIZES)}, расхождений: {mismatches}")
+
+    # Память и время на больших документах
+    unit = "".join(html for _, html in pages).encode('utf-8')
+    print(f"\n{'Размер':>8} {'дерево МБ':>10} {'поток МБ':>9} {'дерево с':>9} {'поток с':>8}")
+    for size_mb in args.sizes:
+        times = max(1, round(size_mb * 1024 * 1024 / len(unit)))
+        url = "file://large.html"
+
+        def tree():
+            html = (unit * times).decode('utf-8')
+            return analyzer._analyze_html(url, html)[0]
+
+        def stream():
+            return analyzer.analyze_chunks(url, iter_repeated(unit, times), 'utf-8')[0]
+
+        tree_data, tree_peak, tree_time = measure(tree)
+        stream_data, stream_peak, stream_time = measure(stream)
+        if asdict(tree_data) != asdict(stream_data):
+            mismatches += 1
+            print(f"[РАСХОЖДЕНИЕ] большой документ {size_mb:g} МБ")
+        print(f"{len(unit) * times / 1024 / 1024:7.1f}М {tree_peak:10.1f} {stream_peak:9.1f} "
+              f"{tree_time:9.2f} {stream_time:8.2f}")
+
+    analyzer.close()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
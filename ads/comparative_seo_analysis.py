@@ -2,39 +2,39 @@
 # -*- coding: utf-8 -*-
 """
 Сравнительный SEO анализ всех конкурентов
+
+Данные — последние результаты сайтов реестра sites.json из хранилища
+(ads/.results, см. results_store.py); пока оно пусто — файлы *_report.json.
+Сайты, которые анализировались, но не внесены в реестр (например, найденные
+через --discover), в рейтинг не попадают.
+
+    python -m ads.comparative_seo_analysis     # отчет в ads/
+    python ads/comparative_seo_analysis.py     # прежний запуск, то же самое
 """
 
 import json
 import glob
 from datetime import datetime
 import io
+import os
 import sys
 
+# Запуск файлом (python ads/comparative_seo_analysis.py): относительные импорты — через пакет ads
+if __name__ == "__main__" and not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "ads"
+
+from .results_store import DEFAULT_RESULTS_DIR, ResultsStore
+from .site_registry import default_registry
+
 # Установка кодировки UTF-8 для Windows
 if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
 def get_site_name(url):
-    """Получение короткого имени сайта из URL"""
-    name_map = {
-        "viktorijaautokool.ee": "Viktorija",
-        "xn--siduppe-10ad.ee": "Sõiduõppe ABC",
-        "autokooldrive.ee": "Autokool DRIVE",
-        "justdrive.ee": "Just DRIVE",
-        "startautokool.ee": "START AUTOKOOL",
-        "silverautokool.ee": "Silver Autokool",
-        "somero.ee": "Somero",
-        "origon.ee": "Origon",
-        "lakarosse.ee": "Lakarosse",
-        "deltaautokool.ee": "Delta Autokool",
-        "liiklusekspert.ee": "Liiklusekspert",
-        "atlanta.ee": "Atlanta"
-    }
-    for key, value in name_map.items():
-        if key in url:
-            return value
-    return url.split("//")[-1].split("/")[0].replace("www.", "")
+    """Получение короткого имени сайта из URL (реестр sites.json)"""
+    return default_registry().site_name(url)
 
 def calculate_seo_score(data):
     """Расчет SEO баллов для сайта"""
@@ -93,39 +93,58 @@ def calculate_seo_score(data):
     
     return score
 
-def load_all_reports():
-    """Загрузка всех отчетов"""
-    reports = []
-    json_files = glob.glob("*_report.json")
-    
+def report_entry(report):
+    """Отчет сайта ({"site_url", "seo_data"}) -> строка сравнения с баллами"""
+    seo_data = report["seo_data"]
+    seo_score = calculate_seo_score(seo_data)
+    
+    # Добавляем процент alt-текстов
+    images_count = seo_data.get("images_count", 0)
+    images_with_alt = seo_data.get("images_with_alt", 0)
+    alt_percentage = (images_with_alt / images_count * 100) if images_count > 0 else 0
+    
+    return {
+        "name": get_site_name(report["site_url"]),
+        "url": report["site_url"],
+        "data": seo_data,
+        "score": seo_score,
+        "alt_percentage": alt_percentage
+    }
+
+def load_store_reports(results_dir=DEFAULT_RESULTS_DIR):
+    """Последние результаты сайтов реестра из хранилища (пустой список, если его нет)"""
+    if not os.path.exists(os.path.join(results_dir, "results.sqlite")):
+        return []
+    registry = default_registry()
+    store = ResultsStore(results_dir)
+    try:
+        return [report_entry(report) for report in store.site_reports()
+                if registry.resolve(report["site_url"]) is not None]
+    finally:
+        store.close()
+
+def load_all_reports(report_dir=".", results_dir=DEFAULT_RESULTS_DIR):
+    """
+    Загрузка отчетов всех сайтов: из хранилища результатов (results_store.py),
+    а если оно пусто — из файлов *_report.json в report_dir
+    """
+    reports = load_store_reports(results_dir)
+    if reports:
+        return sorted(reports, key=lambda x: x["score"], reverse=True)
+    
+    json_files = glob.glob(os.path.join(report_dir, "*_report.json"))
     for json_file in sorted(json_files):
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
-                report = json.load(f)
-                site_name = get_site_name(report["site_url"])
-                seo_data = report["seo_data"]
-                seo_score = calculate_seo_score(seo_data)
-                
-                # Добавляем процент alt-текстов
-                images_count = seo_data.get("images_count", 0)
-                images_with_alt = seo_data.get("images_with_alt", 0)
-                alt_percentage = (images_with_alt / images_count * 100) if images_count > 0 else 0
-                
-                reports.append({
-                    "name": site_name,
-                    "url": report["site_url"],
-                    "data": seo_data,
-                    "score": seo_score,
-                    "alt_percentage": alt_percentage
-                })
+                reports.append(report_entry(json.load(f)))
         except Exception as e:
             print(f"Ошибка при загрузке {json_file}: {e}")
     
     return sorted(reports, key=lambda x: x["score"], reverse=True)
 
-def create_comparative_report():
-    """Создание сравнительного отчета"""
-    reports = load_all_reports()
+def create_comparative_report(report_dir=".", results_dir=DEFAULT_RESULTS_DIR):
+    """Создание сравнительного отчета в report_dir (данные — из хранилища или *_report.json)"""
+    reports = load_all_reports(report_dir, results_dir)
     
     analysis_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
@@ -282,10 +301,11 @@ def create_comparative_report():
 """
     
     # Сохранение отчета
-    with open("comparative_seo_analysis.md", 'w', encoding='utf-8') as f:
+    output_file = os.path.join(report_dir, "comparative_seo_analysis.md")
+    with open(output_file, 'w', encoding='utf-8') as f:
         f.write(md_content)
     
-    print(f"\n[УСПЕХ] Сравнительный отчет сохранен: comparative_seo_analysis.md")
+    print(f"\n[УСПЕХ] Сравнительный отчет сохранен: {output_file}")
     
     # Вывод в консоль
     print("\n" + "="*70)
@@ -299,5 +319,5 @@ def create_comparative_report():
     print("="*70)
 
 if __name__ == "__main__":
-    create_comparative_report()
+    create_comparative_report(os.path.dirname(os.path.abspath(__file__)))
 
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Обход всего сайта на базе SEOAnalyzer.
+
+Начиная с seed URL, краулер идет по внутренним ссылкам, которые уже
+выделяет analyze_page. Очередь (frontier) дедуплицируется по 64-битным
+отпечаткам нормализованных URL, обход ограничен глубиной и бюджетом страниц,
+а число одновременных запросов — max_in_flight. Страницы отдаются
+генератором по мере готовности, поэтому результаты не копятся в памяти
+краулера, а очередь никогда не превышает бюджет страниц.
+Почти одинаковые страницы (DuplicatePage) не отдаются, но их ссылки
+обходятся как обычно. Ссылки всех обойденных страниц сохраняются в
+граф сайта (link_graph.LinkGraph).
+"""
+
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .link_graph import LinkGraph
+from .near_duplicates import DuplicatePage
+
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_MAX_PAGES = 500
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Параметры, которые не меняют содержимое страницы
+TRACKING_PARAMS = {'gclid', 'fbclid', 'yclid', 'msclkid', '_ga'}
+# Файлы, которые не являются HTML страницами
+SKIP_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.pdf',
+                   '.zip', '.doc', '.docx', '.xls', '.xlsx', '.mp4', '.mp3', '.css', '.js')
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """
+    Нормализация URL для дедупликации.
+
+    Относительные ссылки разрешаются от base, схема и хост приводятся к
+    нижнему регистру, порт по умолчанию и фрагмент удаляются, трекинговые
+    параметры отбрасываются, остальные сортируются. Для ссылок не на
+    HTTP(S) страницы (mailto:, tel:, javascript:, файлы) возвращает None.
+    """
+    if base:
+        url = urljoin(base, url.strip())
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return None
+
+    host = parts.hostname.lower()
+    port = parts.port if parts.port not in (None, 80 if scheme == 'http' else 443) else None
+    netloc = f"{host}:{port}" if port else host
+
+    path = parts.path or '/'
+    if path.lower().endswith(SKIP_EXTENSIONS):
+        return None
+
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS]
+    return urlunsplit((scheme, netloc, path, urlencode(sorted(query)), ''))
+
+
+def site_host(url: str) -> str:
+    """Хост без www. — страницы www.site.ee и site.ee считаются одним сайтом"""
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def url_fingerprint(url: str) -> int:
+    """Компактный 64-битный отпечаток URL для множества просмотренных"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class SiteCrawler:
+    """
+    Обход сайта в ширину с бюджетами глубины и страниц.
+
+    analyze — функция url -> (SEOData или FetchFailure, список внутренних URL),
+    обычно SEOAnalyzer.analyze_page_with_links. can_fetch — фильтр URL,
+    например RobotsRules.can_fetch.
+    """
+
+    def __init__(self, analyze: Callable[[str], Tuple[Optional[object], List[str]]],
+                 max_depth: int = DEFAULT_MAX_DEPTH,
+                 max_pages: int = DEFAULT_MAX_PAGES,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 can_fetch: Optional[Callable[[str], bool]] = None):
+        self.analyze = analyze
+        self.can_fetch = can_fetch
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_in_flight = max(1, max_in_flight)
+        self.pages_crawled = 0
+        self.pages_failed = 0
+        self.pages_duplicate = 0
+        self.graph = LinkGraph()
+
+    def crawl(self, seed: str) -> Iterator[object]:
+        """Генератор SEOData для страниц сайта в порядке обхода"""
+        seed = normalize_url(seed)
+        if seed is None or (self.can_fetch is not None and not self.can_fetch(seed)):
+            return
+        host = site_host(seed)
+
+        seen: Set[int] = {url_fingerprint(seed)}
+        frontier = deque([(seed, 0)])
+        admitted = 1  # сколько URL уже принято в обход (не больше max_pages)
+
+        def site_links(links: List[str]) -> List[str]:
+            """Нормализованные ссылки на страницы этого же сайта"""
+            result = []
+            for link in links:
+                normalized = normalize_url(link)
+                if normalized is not None and site_host(normalized) == host:
+                    result.append(normalized)
+            return result
+
+        def admit(links: List[str], depth: int):
+            nonlocal admitted
+            if depth > self.max_depth:
+                return
+            for normalized in links:
+                if admitted >= self.max_pages:
+                    return
+                fingerprint = url_fingerprint(normalized)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                if self.can_fetch is not None and not self.can_fetch(normalized):
+                    continue
+                frontier.append((normalized, depth))
+                admitted += 1
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            in_flight = {}
+            while frontier or in_flight:
+                while frontier and len(in_flight) < self.max_in_flight:
+                    url, depth = frontier.popleft()
+                    in_flight[executor.submit(self.analyze, url)] = (url, depth)
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url, depth = in_flight.pop(future)
+                    try:
+                        data, links = future.result()
+                    except Exception as e:
+                        print(f"Ошибка при обходе: {e}")
+                        data, links = None, []
+                    duplicate = isinstance(data, DuplicatePage)
+                    if not data and not duplicate:
+                        self.pages_failed += 1
+                        continue
+                    links = site_links(links)
+                    self.graph.add(url, links)
+                    admit(links, depth + 1)
+                    if duplicate:
+                        self.pages_duplicate += 1
+                        continue
+                    self.pages_crawled += 1
+                    yield data
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Поиск URL сайта через robots.txt и sitemap.
+
+robots.txt разбирается один раз: правила Allow/Disallow нужной группы
+компилируются в регулярные выражения (поддержка * и $), побеждает самое
+длинное совпавшее правило. Строки Sitemap: ведут к sitemap файлам, которые
+разбираются потоково (XMLPullParser, gzip распаковывается на лету): в
+памяти не держится ни файл, ни дерево XML, ни список его URL.
+URL отдаются генератором в analyze_multiple_pages; gather_in_order читает
+его в отдельном потоке, чтобы загрузка sitemap не блокировала цикл asyncio.
+"""
+
+import re
+import zlib
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Pattern, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+ROBOTS_AGENT = "*"
+MAX_SITEMAP_DEPTH = 3  # вложенность sitemap index -> sitemap
+FEED_SIZE = 64 * 1024  # сколько распакованных байт отдаем парсеру за раз
+
+# on_error(url sitemap, исключение, сколько URL прочитано до ошибки)
+SitemapErrorHandler = Callable[[str, Exception, int], None]
+
+
+def _compile_rule(pattern: str) -> Pattern:
+    """Правило robots.txt -> регулярное выражение (* = любая строка, $ = конец URL)"""
+    anchored = pattern.endswith('$')
+    if anchored:
+        pattern = pattern[:-1]
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return re.compile(regex + (r'\Z' if anchored else ''))
+
+
+@dataclass
+class RobotsRules:
+    """Правила robots.txt для одного user-agent"""
+    rules: List[Tuple[int, bool, Pattern]] = field(default_factory=list)  # (длина, allow, regex)
+    crawl_delay: Optional[float] = None
+    sitemaps: List[str] = field(default_factory=list)
+    disallow_all: bool = False
+
+    def can_fetch(self, url: str) -> bool:
+        """Разрешен ли URL (самое длинное совпавшее правило, при равенстве Allow)"""
+        if self.disallow_all:
+            return False
+        parts = urlsplit(url)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        for _, allow, regex in self.rules:
+            if regex.match(path):
+                return allow
+        return True
+
+    @classmethod
+    def parse(cls, text: str, agent: str = ROBOTS_AGENT) -> "RobotsRules":
+        """Разбор robots.txt: группа для agent, иначе группа '*'"""
+        agent = agent.lower()
+        groups = []          # [[agents, [(allow, pattern)], crawl_delay]]
+        sitemaps = []
+        current = None
+        in_agent_lines = False
+
+        for raw_line in text.splitlines():
+            line = raw_line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            key, value = line.split(':', 1)
+            key, value = key.strip().lower(), value.strip()
+
+            if key == 'user-agent':
+                if current is None or not in_agent_lines:
+                    current = [[], [], None]
+                    groups.append(current)
+                current[0].append(value.lower())
+                in_agent_lines = True
+                continue
+            in_agent_lines = False
+
+            if key == 'sitemap':
+                if value:
+                    sitemaps.append(value)
+            elif current is None:
+                continue
+            elif key in ('allow', 'disallow'):
+                if value:  # пустой Disallow ничего не запрещает
+                    current[1].append((key == 'allow', value))
+            elif key == 'crawl-delay':
+                try:
+                    current[2] = float(value)
+                except ValueError:
+                    pass
+
+        selected = None
+        for agents, rules, delay in groups:
+            if agent != '*' and any(a != '*' and a in agent for a in agents):
+                selected = (rules, delay)
+                break
+            if '*' in agents and selected is None:
+                selected = (rules, delay)
+
+        robots = cls(sitemaps=sitemaps)
+        if selected is not None:
+            rules, robots.crawl_delay = selected
+            compiled = [(len(pattern), allow, _compile_rule(pattern)) for allow, pattern in rules]
+            # Длинные правила первыми, при равной длине Allow важнее
+            robots.rules = sorted(compiled, key=lambda rule: (-rule[0], not rule[1]))
+        return robots
+
+
+def fetch_robots(session, site_url: str, agent: str = ROBOTS_AGENT) -> RobotsRules:
+    """
+    Загрузка robots.txt сайта.
+
+    404 и другие 4xx — ограничений нет; 5xx и сетевые ошибки — сайт
+    считается полностью закрытым (RFC 9309).
+    """
+    robots_url = urljoin(site_url, '/robots.txt')
+    try:
+        response = session.get(robots_url, timeout=10)
+    except Exception as e:
+        print(f"[ROBOTS] Не удалось загрузить {robots_url}: {e}")
+        return RobotsRules(disallow_all=True)
+    if response.status_code >= 500:
+        print(f"[ROBOTS] {robots_url}: HTTP {response.status_code}, обход запрещен")
+        return RobotsRules(disallow_all=True)
+    if response.status_code >= 400:
+        return RobotsRules()
+    return RobotsRules.parse(response.text, agent)
+
+
+def _local_name(tag: str) -> str:
+    """Имя тега без XML namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap_entries(chunks: Iterator[bytes]) -> Iterator[Tuple[str, str]]:
+    """
+    Потоковый разбор sitemap: пары (тип, loc), тип = 'url' или 'sitemap'.
+
+    Куски могут быть сжаты gzip — это определяется по сигнатуре. Обработанные
+    элементы сразу удаляются из дерева, память не зависит от размера файла.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    decompressor = None
+    head = b''    # начало тела, пока не набралось на сигнатуру gzip
+    root = None
+
+    def events():
+        nonlocal root
+        for event, elem in parser.read_events():
+            name = _local_name(elem.tag)
+            if event == 'start':
+                if root is None:
+                    root = elem
+                continue
+            if name in ('url', 'sitemap'):
+                loc = next((child.text for child in elem if _local_name(child.tag) == 'loc'), None)
+                if loc and loc.strip():
+                    yield name, loc.strip()
+                root.clear()
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if head is not None:
+            # Сигнатура gzip — 2 байта, а первый кусок может быть короче
+            head += chunk
+            if len(head) < 2:
+                continue
+            chunk, head = head, None
+            if chunk[:2] == b'\x1f\x8b':
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if decompressor is None:
+            parser.feed(chunk)
+            yield from events()
+            continue
+        # gzip сжимает sitemap в десятки раз: распаковываем порциями
+        while chunk:
+            parser.feed(decompressor.decompress(chunk, FEED_SIZE))
+            chunk = decompressor.unconsumed_tail
+            yield from events()
+
+    if head:
+        parser.feed(head)
+    if decompressor is not None:
+        parser.feed(decompressor.flush())
+    parser.close()
+    yield from events()
+
+
+def _print_sitemap_error(sitemap_url: str, error: Exception, urls_read: int):
+    print(f"[SITEMAP] Ошибка при чтении {sitemap_url} (прочитано URL: {urls_read}): {error}")
+
+
+def iter_sitemap_urls(session, sitemap_url: str, depth: int = 0,
+                      visited: Optional[Set[str]] = None,
+                      on_error: Optional[SitemapErrorHandler] = None) -> Iterator[str]:
+    """
+    URL страниц из sitemap, рекурсивно по sitemap index.
+
+    URL страниц отдаются по мере разбора: файл на 50 тысяч URL не
+    держится в памяти, а при max_urls чтение останавливается на первых
+    URL. Копятся только ссылки на вложенные sitemap — по ним идем после
+    закрытия ответа. Оборванный или испорченный sitemap передается в
+    on_error(url, ошибка, сколько URL успели прочитать); уже отданные URL
+    остаются у вызывающего.
+    """
+    visited = visited if visited is not None else set()
+    on_error = on_error if on_error is not None else _print_sitemap_error
+    if sitemap_url in visited or depth > MAX_SITEMAP_DEPTH:
+        return
+    visited.add(sitemap_url)
+
+    nested = []
+    urls_read = 0
+    try:
+        with session.stream(sitemap_url, timeout=30) as chunks:
+            for kind, loc in iter_sitemap_entries(chunks):
+                if kind == 'url':
+                    urls_read += 1
+                    yield loc
+                else:
+                    nested.append(loc)
+    except Exception as e:
+        on_error(sitemap_url, e, urls_read)
+
+    for loc in nested:
+        yield from iter_sitemap_urls(session, loc, depth + 1, visited, on_error)
+
+
+def discover_urls(session, site_url: str, robots: Optional[RobotsRules] = None,
+                  max_urls: Optional[int] = None,
+                  on_error: Optional[SitemapErrorHandler] = None) -> Iterator[str]:
+    """
+    Поток URL сайта: sitemap из robots.txt (или /sitemap.xml), с фильтром robots.
+
+    Повторы внутри одного запуска отбрасываются по хешу URL; ошибки чтения
+    sitemap передаются в on_error (см. iter_sitemap_urls).
+    """
+    robots = robots if robots is not None else fetch_robots(session, site_url)
+    sitemaps = robots.sitemaps or [urljoin(site_url, '/sitemap.xml')]
+
+    seen: Set[int] = set()
+    visited: Set[str] = set()
+    count = 0
+    for sitemap_url in sitemaps:
+        for url in iter_sitemap_urls(session, sitemap_url, visited=visited, on_error=on_error):
+            key = hash(url)
+            if key in seen or not robots.can_fetch(url):
+                continue
+            seen.add(key)
+            yield url
+            count += 1
+            if max_urls is not None and count >= max_urls:
+                return
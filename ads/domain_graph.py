@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Граф внешних ссылок между сайтами и кандидаты в конкуренты.
+
+Раньше внешние ссылки только считались (external_links). Но на кого
+ссылаются автошколы — самый дешевый способ найти другие школы и
+партнеров (creditinfo, transpordiamet). Каждая внешняя ссылка сводится к
+регистрируемому домену (domains.py), домены получают целые ID, а ребро
+сайт -> домен хранит число страниц сайта с такой ссылкой.
+
+Кандидаты — домены, на которые ссылаются проанализированные сайты, кроме
+самих этих сайтов, уже известных конкурентов и общих площадок (соцсети,
+карты, CDN). Ранжирование: число разных сайтов со ссылкой, затем число
+страниц. Домены со словами школы в имени (autokool, driving, ...) —
+кандидаты в конкуренты, остальные — партнеры. Главные страницы
+кандидатов можно сразу передать краулеру (ads-1.py --discover N).
+"""
+
+import threading
+from typing import Dict, Iterable, List, Set
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .domains import display_host, registrable_domain, url_domain
+
+DEFAULT_TOP_DOMAINS = 30
+
+# Площадки, на которые ссылаются все подряд: не конкуренты и не партнеры
+IGNORED_DOMAINS = frozenset({
+    'facebook.com', 'fb.com', 'fb.me', 'instagram.com', 'youtube.com', 'youtu.be', 'twitter.com', 'x.com',
+    'tiktok.com', 'linkedin.com', 'pinterest.com', 'vk.com', 'telegram.org', 't.me', 'whatsapp.com',
+    'wa.me', 'google.com', 'google.ee', 'goo.gl', 'gstatic.com', 'googleapis.com', 'googletagmanager.com',
+    'google-analytics.com', 'doubleclick.net', 'apple.com', 'microsoft.com', 'bing.com',
+    'wordpress.org', 'wordpress.com', 'wix.com', 'wixsite.com', 'zone.ee', 'w3.org', 'schema.org',
+    'cloudflare.com', 'jsdelivr.net', 'bootstrapcdn.com', 'fontawesome.com', 'gravatar.com',
+    'waze.com', 'openstreetmap.org', 'tripadvisor.com', 'booking.com', 'wikipedia.org',
+})
+
+# Слова в домене, по которым он похож на автошколу
+SCHOOL_MARKERS = ('autokool', 'soidukool', 'sõidukool', 'soiduope', 'sõiduõpe', 'sõiduõppe', 'driving',
+                  'drive', 'autoschool', 'autoshkola', 'avtoshkola', 'liiklus', 'juhiload', 'koolitus')
+
+
+def looks_like_school(domain: str) -> bool:
+    name = display_host(domain)
+    return any(marker in name for marker in SCHOOL_MARKERS)
+
+
+class DomainGraph:
+    """
+    Ребра сайт -> домен внешней ссылки с числом страниц.
+
+    Пара (источник, цель) упакована в одно целое: источник << 32 | цель.
+    Общий для потоков анализатора: добавление страницы под блокировкой.
+    """
+
+    def __init__(self):
+        self.domains: Dict[str, int] = {}
+        self._pages: Dict[int, int] = {}
+        self._origins: Dict[int, str] = {}      # ID -> первая встреченная схема и хост (главная для краулера)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def domain_id(self, domain: str) -> int:
+        domains = self.domains
+        return domains.setdefault(domain, len(domains))
+
+    def add_page(self, url: str, external_urls: Iterable[str]):
+        """Страница url и ее внешние ссылки (каждый домен считается один раз на страницу)"""
+        source = url_domain(url)
+        if not source:
+            return
+        targets: Dict[str, str] = {}
+        for link in external_urls:
+            domain = url_domain(link)
+            if domain and domain != source and domain not in targets:
+                targets[domain] = link
+        with self._lock:
+            source_id = self.domain_id(source) << 32
+            pages = self._pages
+            for target, link in targets.items():
+                target_id = self.domain_id(target)
+                key = source_id | target_id
+                pages[key] = pages.get(key, 0) + 1
+                if target_id not in self._origins:
+                    parts = urlsplit(link.strip())
+                    self._origins[target_id] = f"{parts.scheme or 'https'}://{parts.netloc}/"
+
+    @property
+    def names(self) -> List[str]:
+        """Домены по ID"""
+        return list(self.domains)
+
+    def edges(self):
+        """(источники, цели, число страниц) — массивы numpy по ребрам"""
+        with self._lock:
+            keys = np.fromiter(self._pages.keys(), dtype=np.int64, count=len(self._pages))
+            pages = np.fromiter(self._pages.values(), dtype=np.int64, count=len(self._pages))
+        return keys >> 32, keys & 0xFFFFFFFF, pages
+
+    def candidates(self, known: Iterable[str] = (), top_n: int = DEFAULT_TOP_DOMAINS,
+                   min_sites: int = 1) -> Dict[str, List[Dict]]:
+        """
+        Ранжированные домены, на которые ссылаются сайты, кроме known (URL или
+        хосты) и самих сайтов-источников: {"competitors": [...], "partners": [...]}.
+        """
+        sources, targets, pages = self.edges()
+        names = self.names
+        n = len(names)
+        sites = np.bincount(targets, minlength=n)                 # разных сайтов со ссылкой
+        page_counts = np.bincount(targets, weights=pages, minlength=n)
+
+        excluded: Set[int] = set(np.unique(sources).tolist())
+        for site in known:
+            domain = url_domain(site) if '//' in site else registrable_domain(site)
+            if domain in self.domains:
+                excluded.add(self.domains[domain])
+        excluded.update(self.domains[domain] for domain in IGNORED_DOMAINS if domain in self.domains)
+
+        order = np.lexsort((-page_counts, -sites))
+        competitors, partners = [], []
+        for domain_id in order:
+            if sites[domain_id] < min_sites:
+                break
+            if domain_id in excluded:
+                continue
+            domain = names[domain_id]
+            bucket = competitors if looks_like_school(domain) else partners
+            if len(bucket) >= top_n:
+                if len(competitors) >= top_n and len(partners) >= top_n:
+                    break
+                continue
+            linked_from = sorted(names[source] for source in sources[targets == domain_id])
+            bucket.append({
+                "domain": domain,
+                "name": display_host(domain),
+                "sites": int(sites[domain_id]),
+                "pages": int(page_counts[domain_id]),
+                "linked_from": linked_from,
+                "seed_url": self._origins.get(domain_id, f"https://{domain}/"),
+            })
+        return {"competitors": competitors, "partners": partners}
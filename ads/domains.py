@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Нормализация хостов и регистрируемые домены.
+
+Ссылки на один сайт приходят с разными хостами: www.site.ee, site.ee,
+Site.EE:443, m.site.ee, õ-домены в Unicode и в punycode (xn--...).
+Для сравнения сайтов нужен регистрируемый домен — публичный суффикс
+(ee, com.ee, co.uk) плюс одна метка слева: www.m.site.ee -> site.ee.
+
+Если установлен пакет publicsuffixlist, суффиксы берутся из полного
+Public Suffix List; иначе — из встроенного списка вторых уровней,
+которого хватает для эстонских и соседних доменов.
+"""
+
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import urlsplit
+
+# Публичные суффиксы второго уровня (без publicsuffixlist)
+SECOND_LEVEL_SUFFIXES = frozenset({
+    'com.ee', 'pri.ee', 'fie.ee', 'med.ee', 'org.ee', 'edu.ee', 'gov.ee', 'riik.ee', 'lib.ee',
+    'com.lv', 'org.lv', 'gov.lv', 'edu.lv', 'gov.lt',
+    'com.ru', 'org.ru', 'net.ru', 'msk.ru', 'spb.ru', 'com.ua', 'org.ua', 'in.ua', 'kiev.ua',
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'com.pl', 'org.pl', 'net.pl',
+    'com.au', 'net.au', 'org.au', 'co.nz', 'co.jp', 'co.za', 'com.br', 'com.tr', 'com.cn',
+    'github.io', 'gitlab.io', 'herokuapp.com', 'netlify.app', 'vercel.app', 'web.app',
+    'blogspot.com', 'wixsite.com', 'zone.ee',
+})
+
+try:
+    from publicsuffixlist import PublicSuffixList
+except ImportError:
+    _psl = None
+else:
+    _psl = PublicSuffixList()
+
+
+def normalize_host(host: str) -> str:
+    """Хост в нижнем регистре, без порта, точки в конце и www.; Unicode -> punycode"""
+    host = host.strip().lower()
+    if host.startswith('['):
+        return host                       # IPv6
+    host = host.rsplit(':', 1)[0] if host.count(':') == 1 else host
+    host = host.rstrip('.')
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            pass
+    return host
+
+
+def display_host(host: str) -> str:
+    """punycode -> Unicode для вывода (xn--siduppe-10ad.ee -> sõiduõppe.ee)"""
+    if 'xn--' not in host:
+        return host
+    try:
+        return host.encode('ascii').decode('idna')
+    except UnicodeError:
+        return host
+
+
+def _is_ip(host: str) -> bool:
+    return host.startswith('[') or host.replace('.', '').isdigit()
+
+
+@lru_cache(maxsize=65536)
+def registrable_domain(host: str) -> str:
+    """Регистрируемый домен хоста (www.m.site.ee -> site.ee, a.b.com.ee -> b.com.ee)"""
+    host = normalize_host(host)
+    if not host or _is_ip(host) or '.' not in host:
+        return host
+    if _psl is not None:
+        return _psl.privatesuffix(host) or host
+    labels = host.split('.')
+    suffix_length = 2 if '.'.join(labels[-2:]) in SECOND_LEVEL_SUFFIXES else 1
+    if len(labels) <= suffix_length:
+        return host
+    return '.'.join(labels[-(suffix_length + 1):])
+
+
+def url_domain(url: str) -> Optional[str]:
+    """Регистрируемый домен URL (None для ссылок без хоста: mailto:, tel:, относительных)"""
+    try:
+        host = urlsplit(url.strip()).hostname
+    except ValueError:
+        return None
+    return registrable_domain(host) if host else None
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Извлечение SEO полей страницы за один проход.
+
+Раньше analyze_page вызывал find('title'), find('meta'), find_all для h1,
+h2, a, img и get_text() — каждый вызов заново обходил все дерево, а для
+каждой ссылки повторно разбирался URL страницы. Теперь PageBuilder
+получает поток событий (начало тега, текст, конец тега) и собирает все
+поля попутно, хост страницы разбирается один раз. Источником событий
+может быть обход дерева любого парсера (см. html_backends) или потоковый
+токенизатор. Результат полностью совпадает с прежней логикой.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlsplit
+
+# Теги, текст внутри которых get_text() не учитывает
+NON_TEXT_TAGS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+# Как BeautifulSoup: строка только из этих пробелов сворачивается в ' ' или '\n',
+# кроме текста внутри pre/textarea
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+
+
+@dataclass
+class ExtractedPage:
+    """Поля страницы до подсчета ключевых слов"""
+    title: str = ""
+    meta_description: str = ""
+    h1_tags: List[str] = field(default_factory=list)
+    h2_tags: List[str] = field(default_factory=list)
+    text: str = ""
+    internal_urls: List[str] = field(default_factory=list)
+    external_urls: List[str] = field(default_factory=list)
+    external_links: int = 0
+    images_count: int = 0
+    images_with_alt: int = 0
+
+
+class PageBuilder:
+    """
+    Сборщик ExtractedPage из событий start / text / end.
+
+    События должны быть сбалансированы: на каждый start — ровно один end
+    (для пустых тегов вроде <img> — сразу). Значения атрибутов без значения
+    передаются как '' (как в BeautifulSoup). Пробельные строки сворачиваются
+    так же, как это делает BeautifulSoup, чтобы все парсеры давали один текст.
+
+    text_sink получает текст страницы по частям вместо накопления в
+    ExtractedPage.text (потоковый анализ: память не зависит от размера).
+    """
+
+    def __init__(self, url: str, text_sink: Optional[Callable[[str], None]] = None):
+        self.url = url
+        self.page_netloc = urlsplit(url).netloc
+        self.page = ExtractedPage()
+        self._text_parts = []
+        self._emit_text = text_sink or self._text_parts.append
+        self._depth = 0
+        self._title_depth = None    # глубина открытого первого <title>
+        self._title_parts = None
+        self._title_seen = False
+        self._meta_seen = False
+        self._captures = []         # открытые h1/h2: [глубина, части текста, список, индекс]
+        self._preserve = []         # глубины открытых pre/textarea
+
+    def start(self, name: str, attrs: Dict[str, Optional[str]]):
+        self._depth += 1
+        page = self.page
+        if name == 'a':
+            href = attrs.get('href')
+            if href is not None:
+                if urlsplit(href).netloc == '' or self.page_netloc in href:
+                    page.internal_urls.append(urljoin(self.url, href))
+                else:
+                    page.external_urls.append(href)
+                    page.external_links += 1
+        elif name == 'img':
+            page.images_count += 1
+            if attrs.get('alt'):
+                page.images_with_alt += 1
+        elif name == 'meta':
+            if not self._meta_seen and attrs.get('name') == 'description':
+                self._meta_seen = True
+                page.meta_description = (attrs.get('content') or '').strip()
+        elif name == 'h1' or name == 'h2':
+            # Позиция в списке фиксируется при входе, как в find_all
+            target = page.h1_tags if name == 'h1' else page.h2_tags
+            target.append("")
+            self._captures.append([self._depth, [], target, len(target) - 1])
+        elif name == 'title' and not self._title_seen:
+            self._title_seen = True
+            self._title_depth = self._depth
+            self._title_parts = []
+        elif name in PRESERVE_WHITESPACE_TAGS:
+            self._preserve.append(self._depth)
+
+    def text(self, data: str):
+        """Текстовый узел целиком"""
+        if not data:
+            return
+        if not self._preserve and not data.strip(ASCII_SPACES):
+            data = '\n' if '\n' in data else ' '
+        self.text_part(data)
+
+    def text_part(self, data: str):
+        """Часть текстового узла, в котором уже есть непробельные символы"""
+        self._emit_text(data)
+        for capture in self._captures:
+            capture[1].append(data)
+        if self._title_parts is not None:
+            self._title_parts.append(data)
+
+    def end(self):
+        captures = self._captures
+        if captures and captures[-1][0] == self._depth:
+            _, parts, target, index = captures.pop()
+            target[index] = "".join(parts).strip()
+        if self._title_depth == self._depth:
+            self.page.title = "".join(self._title_parts).strip()
+            self._title_depth = self._title_parts = None
+        if self._preserve and self._preserve[-1] == self._depth:
+            self._preserve.pop()
+        self._depth -= 1
+
+    def finish(self) -> ExtractedPage:
+        self.page.text = "".join(self._text_parts)
+        return self.page
+
+
+def extract_page(soup, url: str) -> ExtractedPage:
+    """Все SEO поля страницы за один обход дерева BeautifulSoup"""
+    # bs4 нужен только этому обходу: с selectolax и lxml он не загружается
+    from bs4 import CData, NavigableString, Tag
+
+    # Те же типы строк, что учитывает soup.get_text(): без комментариев,
+    # doctype, а также содержимого script/style/template и rt/rp
+    text_string_types = (NavigableString, CData)
+    builder = PageBuilder(url)
+    start, text, end = builder.start, builder.text, builder.end
+
+    stack = [iter(soup.contents)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if stack:
+                end()
+            continue
+        if isinstance(node, NavigableString):
+            if type(node) in text_string_types:
+                text(node)
+        elif isinstance(node, Tag):
+            start(node.name, node.attrs)
+            if node.contents:
+                stack.append(iter(node.contents))
+            else:
+                end()
+
+    return builder.finish()
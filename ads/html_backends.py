@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Сменные HTML парсеры для analyze_page.
+
+html.parser (BeautifulSoup) — самый медленный вариант и при параллельной
+загрузке занимает почти все время CPU. Здесь есть реализации на lxml и
+selectolax (lexbor); каждая обходит свое дерево и отдает события в общий
+PageBuilder, поэтому правила извлечения полей одни и те же.
+
+По умолчанию остается html.parser: на корректном HTML результаты
+одинаковы, но на испорченном lxml и selectolax строят другое дерево
+(алгоритм HTML5 или libxml2), и SEOData отличаются:
+- незакрытый <h1> у html.parser вкладывает в себя все до конца документа,
+  у selectolax закрывается следующим заголовком;
+- текст и ссылки прямо внутри <table> selectolax переносит перед таблицей
+  (foster parenting) — меняются ключевые слова и число слов;
+- из повторенного атрибута (два href или alt) lxml и selectolax берут
+  первое значение, BeautifulSoup — последнее: меняются внутренние и
+  внешние ссылки, изображения с alt и meta description.
+Быстрые парсеры включаются явно (parser='selectolax', 'lxml' или 'auto' —
+самый быстрый установленный); если пакет не установлен, выбирается
+следующий по скорости, html.parser всегда остается запасным.
+
+Примеры таких страниц — tests/fixtures/html (known_differences.json —
+ожидаемые расхождения), проверка совпадения и замер скорости:
+check_backends.py.
+"""
+
+from typing import Dict, List
+
+from .extraction import ExtractedPage, PageBuilder, NON_TEXT_TAGS, extract_page
+
+DEFAULT_BACKEND = 'html.parser'
+# Порядок выбора для parser='auto': от быстрого к медленному
+AUTO_ORDER = ('selectolax', 'lxml', 'html.parser')
+
+
+class ParserBackend:
+    """Базовый класс: HTML -> ExtractedPage"""
+    name = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def extract(self, html: str, url: str) -> ExtractedPage:
+        raise NotImplementedError
+
+
+class HtmlParserBackend(ParserBackend):
+    """BeautifulSoup + html.parser из стандартной библиотеки (эталон)"""
+    name = "html.parser"
+
+    def extract(self, html: str, url: str) -> ExtractedPage:
+        from bs4 import BeautifulSoup
+        return extract_page(BeautifulSoup(html, 'html.parser'), url)
+
+
+class LxmlBackend(ParserBackend):
+    """lxml.html (libxml2)"""
+    name = "lxml"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import lxml.html  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self):
+        import lxml.html
+        self._lxml_html = lxml.html
+        # Разбираем байты: str с XML-объявлением кодировки lxml не принимает
+        self._parser = lxml.html.HTMLParser(encoding='utf-8')
+
+    def extract(self, html: str, url: str) -> ExtractedPage:
+        builder = PageBuilder(url)
+        try:
+            root = self._lxml_html.document_fromstring(html.encode('utf-8'), parser=self._parser)
+        except Exception:
+            # Пустой документ или только комментарии
+            return builder.finish()
+
+        start, text, end = builder.start, builder.text, builder.end
+        skip = 0  # глубина внутри script/style/...
+
+        start(root.tag, root.attrib)
+        if root.text:
+            text(root.text)
+        stack = [(root, iter(root))]
+        while stack:
+            element, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                end()
+                if element.tag in NON_TEXT_TAGS:
+                    skip -= 1
+                if element.tail and stack and not skip:
+                    text(element.tail)
+                continue
+
+            tag = child.tag
+            if not isinstance(tag, str):
+                # Комментарий или processing instruction: учитываем только хвост
+                if child.tail and not skip:
+                    text(child.tail)
+                continue
+            start(tag, child.attrib)
+            if tag in NON_TEXT_TAGS:
+                skip += 1
+            if child.text and not skip:
+                text(child.text)
+            stack.append((child, iter(child)))
+
+        return builder.finish()
+
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax с движком lexbor"""
+    name = "selectolax"
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            from selectolax.lexbor import LexborHTMLParser  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def extract(self, html: str, url: str) -> ExtractedPage:
+        builder = PageBuilder(url)
+        start, text, end = builder.start, builder.text, builder.end
+        skip = 0
+
+        node = self._parser_class(html).root
+        stack = []
+        while node is not None:
+            if node.is_element_node:
+                name = node.tag
+                attrs = {key: ('' if value is None else value) for key, value in node.attributes.items()}
+                start(name, attrs)
+                if name in NON_TEXT_TAGS:
+                    skip += 1
+                child = node.child
+                if child is not None:
+                    stack.append(node)
+                    node = child
+                    continue
+                end()
+                if name in NON_TEXT_TAGS:
+                    skip -= 1
+            elif node.is_text_node and not skip:
+                text(node.text_content)
+
+            following = node.next
+            while following is None and stack:
+                parent = stack.pop()
+                end()
+                if parent.tag in NON_TEXT_TAGS:
+                    skip -= 1
+                following = parent.next
+            node = following
+
+        return builder.finish()
+
+
+BACKENDS: Dict[str, type] = {
+    HtmlParserBackend.name: HtmlParserBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+
+def available_backends() -> List[str]:
+    """Установленные парсеры в порядке AUTO_ORDER"""
+    return [name for name in AUTO_ORDER if BACKENDS[name].available()]
+
+
+def get_backend(name: str = DEFAULT_BACKEND) -> ParserBackend:
+    """Парсер по имени; 'auto' — самый быстрый из установленных"""
+    if name == 'auto':
+        # Первый установленный: остальные парсеры не импортируются
+        name = next(name for name in AUTO_ORDER if BACKENDS[name].available())
+    backend_class = BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Неизвестный парсер: {name} (доступны: {', '.join(BACKENDS)})")
+    if not backend_class.available():
+        print(f"[ПАРСЕР] {name} не установлен, используем html.parser")
+        backend_class = HtmlParserBackend
+    return backend_class()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Постоянный кеш HTTP ответов для SEOAnalyzer.fetch_page.
+
+Хранит тело страницы вместе с ETag/Last-Modified в SQLite базе
+(ads/.http_cache/responses.sqlite). Пока запись свежая (TTL), страница берется
+из кеша без запроса. После истечения TTL выполняется условный запрос
+(If-None-Match / If-Modified-Since): ответ 304 означает, что страница не
+изменилась, и можно повторно использовать сохраненный результат анализа.
+Размер кеша ограничен, старые записи вытесняются по LRU. get() только
+читает базу: время обращения копится в памяти и записывается одним запросом
+вместе со следующим put(), перед вытеснением и при close().
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+DEFAULT_TTL = 6 * 60 * 60               # 6 часов без повторной проверки
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024   # 256 МБ тел страниц
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    analysis TEXT,
+    analysis_version INTEGER
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses(accessed_at);
+"""
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    analysis: Optional[Dict] = None
+    analysis_version: Optional[int] = None
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Запись моложе TTL и не требует проверки на сервере"""
+        return time.time() - self.stored_at < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Заголовки условного запроса для повторной проверки"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Кеш ответов в SQLite с TTL, ограничением размера и LRU вытеснением"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "responses.sqlite")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # Суммарный размер тел: считается один раз, дальше обновляется при записи и удалении
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        # url -> время последнего обращения, еще не записанное в базу
+        self._accessed: Dict[str, float] = {}
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Запись для URL (время доступа для LRU запоминается в памяти)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at, analysis, analysis_version "
+                "FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._accessed[url] = time.time()
+
+        body, etag, last_modified, stored_at, analysis, analysis_version = row
+        return CacheEntry(
+            url=url,
+            text=body.decode('utf-8'),
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=stored_at,
+            analysis=json.loads(analysis) if analysis else None,
+            analysis_version=analysis_version
+        )
+
+    def put(self, url: str, text: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CacheEntry:
+        """Сохранение нового тела страницы (старый результат анализа сбрасывается)"""
+        body = text.encode('utf-8')
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, size, etag, last_modified, stored_at, accessed_at, analysis, analysis_version) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL)",
+                (url, body, len(body), etag, last_modified, now, now))
+            self._accessed.pop(url, None)
+            self._flush_accessed()
+            self._bytes += len(body) - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+        return CacheEntry(url=url, text=text, etag=etag, last_modified=last_modified, stored_at=now)
+
+    def refresh(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Ответ 304: страница не изменилась, продлеваем срок свежести"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (time.time(), etag, last_modified, url))
+            self._conn.commit()
+
+    def store_analysis(self, url: str, analysis: Dict, version: int):
+        """Сохранение результата анализа для неизменившейся страницы"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET analysis = ?, analysis_version = ? WHERE url = ?",
+                (json.dumps(analysis, ensure_ascii=False), version, url))
+            self._conn.commit()
+
+    def _flush_accessed(self):
+        """Запись накопленных времен обращения (без commit)"""
+        if self._accessed:
+            self._conn.executemany("UPDATE responses SET accessed_at = ? WHERE url = ?",
+                                   [(accessed_at, url) for url, accessed_at in self._accessed.items()])
+            self._accessed.clear()
+
+    def _evict(self):
+        """LRU вытеснение, пока суммарный размер больше лимита (таблица читается только при вытеснении)"""
+        if self._bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        for url, size in rows:
+            if self._bytes <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._bytes -= size
+
+    def iter_pages(self) -> Iterator[Tuple[str, str]]:
+        """Все сохраненные страницы (url, html) — для бенчмарков и проверок"""
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM responses ORDER BY url").fetchall()
+        for (url,) in rows:
+            with self._lock:
+                row = self._conn.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is not None:
+                yield url, row[0].decode('utf-8')
+
+    def record(self, outcome: str):
+        """Учет результата обращения: hits, revalidated или misses"""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        """Счетчики попаданий за текущий запуск"""
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+
+def load_pages(paths: Optional[List[str]] = None, cache_dir: str = DEFAULT_CACHE_DIR) -> List[Tuple[str, str]]:
+    """
+    Страницы для бенчмарков: HTML файлы из paths или все страницы из кеша.
+
+    Для файла URL страницы — file://<имя файла>.
+    """
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                pages.append((f"file://{os.path.basename(path)}", f.read()))
+        return pages
+    if not os.path.exists(os.path.join(cache_dir, "responses.sqlite")):
+        return []
+    cache = ResponseCache(cache_dir)
+    try:
+        return list(cache.iter_pages())
+    finally:
+        cache.close()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Пул HTTP соединений для SEOAnalyzer.
+
+Одна сессия на анализатор: keep-alive, пул соединений с настраиваемым
+размером для отдельных хостов и (опционально) HTTP/2 через httpx.
+Счетчики новых и переиспользованных соединений показывают, сколько
+TCP+TLS рукопожатий удалось сэкономить.
+
+requests/urllib3 и httpx импортируются только для выбранного варианта.
+"""
+
+import re
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, Mapping, Optional
+from urllib.parse import urlparse
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+DEFAULT_POOL_CONNECTIONS = 16  # сколько хостов держим в пуле одновременно
+DEFAULT_POOL_MAXSIZE = 4       # соединений на один хост
+CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.IGNORECASE)
+
+
+def content_charset(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    charset из Content-Type; None — не указан.
+
+    response.encoding в requests для text/* без charset — 'ISO-8859-1'
+    (RFC 2616), и кодировка из <meta charset> тогда не определялась бы.
+    """
+    match = CHARSET_RE.search(headers.get('Content-Type') or '')
+    return match.group(1) if match else None
+
+
+class ConnectionStats:
+    """Потокобезопасные счетчики запросов и соединений по хостам"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._new_connections: Dict[str, int] = defaultdict(int)
+
+    def record_request(self, host: str):
+        with self._lock:
+            self._requests[host] += 1
+
+    def record_new_connection(self, host: str):
+        with self._lock:
+            self._new_connections[host] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Статистика по хостам: запросы, новые и переиспользованные соединения"""
+        with self._lock:
+            hosts = set(self._requests) | set(self._new_connections)
+            stats = {}
+            for host in sorted(hosts):
+                requests_count = self._requests.get(host, 0)
+                new = self._new_connections.get(host, 0)
+                stats[host] = {
+                    "requests": requests_count,
+                    "new_connections": new,
+                    "reused_connections": max(0, requests_count - new),
+                }
+            return stats
+
+    def totals(self) -> Dict[str, int]:
+        """Суммарная статистика по всем хостам"""
+        totals = {"requests": 0, "new_connections": 0, "reused_connections": 0}
+        for host_stats in self.snapshot().values():
+            for key in totals:
+                totals[key] += host_stats[key]
+        return totals
+
+
+@lru_cache(maxsize=None)
+def _counting_adapter_class():
+    """
+    HTTPAdapter, который считает запросы и открытие новых соединений.
+
+    Класс создается при первой сессии requests: модуль импортируется без
+    requests и urllib3 (они не нужны для HTTP/2 через httpx).
+    """
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CountingAdapter(HTTPAdapter):
+        def __init__(self, stats: ConnectionStats, **kwargs):
+            self._stats = stats
+            super().__init__(**kwargs)
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            stats = self._stats
+
+            class CountingHTTPPool(HTTPConnectionPool):
+                def _new_conn(self):
+                    stats.record_new_connection(self.host)
+                    return super()._new_conn()
+
+            class CountingHTTPSPool(HTTPSConnectionPool):
+                def _new_conn(self):
+                    stats.record_new_connection(self.host)
+                    return super()._new_conn()
+
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": CountingHTTPPool,
+                "https": CountingHTTPSPool,
+            }
+
+        def send(self, request, *args, **kwargs):
+            self._stats.record_request(urlparse(request.url).hostname or "")
+            return super().send(request, *args, **kwargs)
+
+    return CountingAdapter
+
+
+@dataclass
+class StreamedResponse:
+    """Ответ, тело которого читается кусками по мере загрузки"""
+    status_code: int
+    headers: Mapping[str, str]
+    encoding: Optional[str]     # charset из Content-Type (None — не указан)
+    chunks: Iterator[bytes]
+
+
+class PooledSession:
+    """
+    Общая HTTP сессия с пулом keep-alive соединений.
+
+    host_pool_sizes позволяет задать отдельный размер пула для хоста,
+    например {"viktorijaautokool.ee": 8}. При http2=True используется httpx
+    (если установлен пакет httpx[http2]), иначе requests. У httpx лимиты
+    только общие, поэтому с HTTP/2 host_pool_sizes не действует (выводится
+    предупреждение): запросы к хосту мультиплексируются в одном соединении.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 host_pool_sizes: Optional[Dict[str, int]] = None,
+                 http2: bool = False,
+                 headers: Optional[Dict[str, str]] = None):
+        self.stats = ConnectionStats()
+        self.http2 = False
+        self._client = None
+        self._session = None
+        self._streams_lock = threading.Lock()
+        # Соединения httpx по хостам; слабые ссылки: id закрытого соединения может достаться новому
+        self._seen_streams: Dict[str, weakref.WeakSet] = defaultdict(weakref.WeakSet)
+        headers = dict(headers or DEFAULT_HEADERS)
+
+        if http2:
+            try:
+                import httpx
+                import h2  # noqa: F401 - httpx требует h2 для HTTP/2
+            except ImportError:
+                print("[HTTP] httpx[http2] не установлен, используем HTTP/1.1 (requests)")
+            else:
+                if host_pool_sizes:
+                    print("[HTTP] HTTP/2 (httpx): размеры пула для отдельных хостов не поддерживаются, "
+                          f"для {', '.join(sorted(host_pool_sizes))} действует общий лимит {pool_maxsize}")
+                limits = httpx.Limits(max_connections=pool_connections * pool_maxsize,
+                                      max_keepalive_connections=pool_connections * pool_maxsize)
+                self._client = httpx.Client(http2=True, limits=limits, headers=headers,
+                                            follow_redirects=True)
+                self.http2 = True
+                return
+
+        import requests
+
+        counting_adapter = _counting_adapter_class()
+        self._session = requests.Session()
+        self._session.headers.update(headers)
+        default_adapter = counting_adapter(self.stats, pool_connections=pool_connections,
+                                           pool_maxsize=pool_maxsize)
+        self._session.mount("http://", default_adapter)
+        self._session.mount("https://", default_adapter)
+        for host, size in (host_pool_sizes or {}).items():
+            adapter = counting_adapter(self.stats, pool_connections=1, pool_maxsize=size)
+            # Префикс со слешем: "https://site.ee" совпал бы и с https://site.ee.evil.com
+            for scheme in ("http", "https"):
+                for name in (host, f"www.{host}"):
+                    self._session.mount(f"{scheme}://{name}/", adapter)
+
+    def get(self, url: str, timeout=10, **kwargs):
+        """
+        GET запрос через пул (ответ requests.Response или httpx.Response)
+
+        timeout — число или пара (таймаут соединения, таймаут чтения).
+        """
+        if self._client is None:
+            return self._session.get(url, timeout=timeout, **kwargs)
+
+        response = self._client.get(url, timeout=self._httpx_timeout(timeout), **kwargs)
+        self._record_httpx(response)
+        return response
+
+    def _record_httpx(self, response):
+        """Счетчики запросов и соединений для ответа httpx"""
+        host = response.url.host
+        self.stats.record_request(host)
+        stream = response.extensions.get("network_stream")
+        with self._streams_lock:
+            seen = self._seen_streams[host]
+            if stream is None or stream not in seen:
+                self.stats.record_new_connection(host)
+                if stream is not None:
+                    seen.add(stream)
+
+    @contextmanager
+    def stream(self, url: str, timeout=10, chunk_size: int = 64 * 1024) -> Iterator[Iterator[bytes]]:
+        """
+        Потоковая загрузка тела ответа кусками (для больших sitemap и т.п.)
+
+        with session.stream(url) as chunks:
+            for chunk in chunks: ...
+        """
+        if self._client is None:
+            response = self._session.get(url, timeout=timeout, stream=True)
+            try:
+                response.raise_for_status()
+                yield response.iter_content(chunk_size=chunk_size)
+            finally:
+                response.close()
+            return
+
+        with self._client.stream("GET", url, timeout=self._httpx_timeout(timeout)) as response:
+            self.stats.record_request(response.url.host)
+            response.raise_for_status()
+            yield response.iter_bytes(chunk_size=chunk_size)
+
+    @contextmanager
+    def stream_response(self, url: str, timeout=10, headers: Optional[Dict[str, str]] = None,
+                        chunk_size: int = 64 * 1024) -> Iterator[StreamedResponse]:
+        """
+        Потоковый GET без проверки статуса: заголовки сразу, тело — кусками
+
+        with session.stream_response(url) as response:
+            if response.status_code == 200:
+                for chunk in response.chunks: ...
+        """
+        if self._client is None:
+            response = self._session.get(url, timeout=timeout, headers=headers, stream=True)
+            try:
+                yield StreamedResponse(response.status_code, response.headers, content_charset(response.headers),
+                                       response.iter_content(chunk_size=chunk_size))
+            finally:
+                response.close()
+            return
+
+        with self._client.stream("GET", url, timeout=self._httpx_timeout(timeout),
+                                 headers=headers) as response:
+            self._record_httpx(response)
+            yield StreamedResponse(response.status_code, response.headers, response.charset_encoding,
+                                   response.iter_bytes(chunk_size=chunk_size))
+
+    @staticmethod
+    def _httpx_timeout(timeout):
+        """Пара (connect, read) в формате httpx"""
+        if isinstance(timeout, tuple):
+            import httpx
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return timeout
+
+    def close(self):
+        """Закрытие всех соединений пула"""
+        if self._client is not None:
+            self._client.close()
+        if self._session is not None:
+            self._session.close()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ключевые фразы (биграммы и триграммы) для эстонских, русских и английских страниц.
+
+extract_keywords считает только отдельные слова от 3 букв и не видит
+фраз, по которым идут ставки в google_ads_keywords.csv ("autokool nõmme",
+"b kategooria"). Здесь слова берутся из общего потока токенов
+(TokenStream.phrase_words) и режутся на отрезки по знакам препинания,
+переводам строк, числам и стоп-словам трех языков, внутри отрезков
+считаются фразы из 2-3 слов подряд.
+
+Память не растет с объемом обхода:
+- слова хранятся в общем словаре Vocabulary с целыми ID, а фраза — одно
+  целое число (ID слов по ID_BITS бит);
+- частоты считаются в SpaceSaving — top-k с ограниченным числом
+  счетчиков (алгоритм space-saving), редкие фразы вытесняются.
+"""
+
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .text_tokens import STOP_WORDS, TokenStream
+
+# Стоп-слова на границах фраз: общие из text_tokens плюс служебные слова трех языков
+PHRASE_STOP_WORDS = (STOP_WORDS | frozenset({
+    # эстонский
+    'ning', 'ega', 'aga', 'kuid', 'vaid', 'sest', 'kas', 'ei', 'ära', 'on', 'ole', 'olla', 'oleme',
+    'olete', 'olen', 'oled', 'olid', 'oma', 'ma', 'mina', 'sa', 'sina', 'ta', 'tema', 'me', 'meie',
+    'te', 'teie', 'nad', 'nemad', 'meid', 'teid', 'neid', 'seda', 'selle', 'sellel', 'selles',
+    'need', 'nende', 'kes', 'mida', 'mille', 'kus', 'kuhu', 'kust', 'kuna', 'siis', 'nii', 'ka',
+    'juba', 'just', 'ainult', 'kõik', 'kõiki', 'iga', 'ilma', 'koos', 'poolt', 'pärast', 'enne',
+    'üle', 'alla', 'kuni', 'vastu', 'läbi', 'jaoks', 'kohta', 'ehk', 'ehkki', 'samuti', 'siin',
+    'seal', 'nüüd', 'väga', 'rohkem', 'saab', 'võib', 'tuleb', 'meil', 'teil', 'sul', 'mul',
+    # русский
+    'во', 'со', 'что', 'он', 'она', 'оно', 'они', 'я', 'ты', 'мы', 'вы', 'как', 'а', 'но', 'да',
+    'то', 'все', 'всё', 'так', 'его', 'ее', 'её', 'их', 'же', 'бы', 'ли', 'у', 'из', 'до', 'об',
+    'при', 'без', 'под', 'над', 'про', 'через', 'после', 'перед', 'между', 'или', 'ни', 'если',
+    'уже', 'еще', 'ещё', 'только', 'это', 'этот', 'эта', 'эти', 'тот', 'та', 'те', 'там', 'тут',
+    'здесь', 'где', 'когда', 'кто', 'чем', 'чтобы', 'быть', 'был', 'была', 'были', 'будет',
+    'есть', 'нет', 'вас', 'вам', 'нас', 'нам', 'мне', 'меня', 'себя', 'свой', 'наш', 'ваш',
+    'можно', 'очень', 'также', 'тоже', 'даже', 'который', 'которые', 'которая',
+    # английский
+    'of', 'with', 'by', 'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'it', 'its',
+    'this', 'that', 'these', 'those', 'we', 'you', 'your', 'our', 'they', 'their', 'he', 'she',
+    'i', 'me', 'my', 'us', 'not', 'no', 'so', 'if', 'then', 'than', 'can', 'will', 'do', 'does',
+    'have', 'has', 'had', 'all', 'any', 'more', 'also', 'about', 'into', 'up', 'out', 'who',
+    'what', 'which', 'when', 'where', 'how',
+})) - frozenset({
+    # Категории прав — слова фраз ("a kategooria", "b kategooria"), а не стоп-слова;
+    # английский артикль 'a' при этом начинает фразы так же, как 'b'
+    'a', 'b', 'c', 'd', 't',
+})
+
+ID_BITS = 21
+MAX_VOCABULARY = (1 << ID_BITS) - 1   # ID 0 не используется
+PAGE_CAPACITY = 4096                  # счетчиков фраз на страницу
+CORPUS_CAPACITY = 10000               # счетчиков фраз на весь отчет
+MIN_PAGE_COUNT = 2                    # фраза должна встретиться на странице хотя бы дважды
+DEFAULT_TOP_PHRASES = 20
+
+
+class Vocabulary:
+    """Словарь слово <-> целый ID, общий для всех страниц (потокобезопасный)"""
+
+    def __init__(self, max_size: int = MAX_VOCABULARY):
+        self.max_size = min(max_size, MAX_VOCABULARY)
+        self._ids: Dict[str, int] = {}
+        self._words: List[str] = ['']
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._words) - 1
+
+    def id(self, word: str) -> int:
+        """ID слова (новое слово добавляется); 0 — словарь заполнен"""
+        word_id = self._ids.get(word)
+        if word_id is not None:
+            return word_id
+        with self._lock:
+            word_id = self._ids.get(word)
+            if word_id is None:
+                if len(self._words) > self.max_size:
+                    return 0
+                word_id = len(self._words)
+                self._words.append(word)
+                self._ids[word] = word_id
+            return word_id
+
+    def phrase(self, key: int) -> str:
+        """Текст фразы по ее ключу"""
+        mask = MAX_VOCABULARY
+        words = []
+        while key:
+            words.append(self._words[key & mask])
+            key >>= ID_BITS
+        return " ".join(reversed(words))
+
+
+class SpaceSaving:
+    """
+    Приближенный top-k с фиксированным числом счетчиков (Metwally et al.).
+
+    Пока счетчиков меньше capacity, подсчет точный. Новый ключ при полной
+    таблице вытесняет ключ с минимальным счетчиком и наследует его значение
+    (ошибка сверху не больше этого минимума). Ключи с одинаковым счетчиком
+    хранятся в корзинах: увеличение счетчика — O(1), плюс O(log k) на
+    новую корзину. Минимальный счетчик для вытеснения берется из кучи
+    значений корзин (k — число разных значений): устаревшие значения
+    удаляются с вершины при вытеснении, а куча пересобирается, когда их
+    становится больше половины.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._heap: List[int] = []      # значения корзин (могут быть устаревшие)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def add(self, key: Hashable, count: int = 1):
+        current = self._counts.get(key)
+        if current is not None:
+            self._detach(key, current)
+            self._attach(key, current + count)
+            return
+
+        error = 0
+        if len(self._counts) >= self.capacity:
+            heap = self._heap
+            while heap[0] not in self._buckets:
+                heapq.heappop(heap)
+            error = heap[0]
+            victim = next(iter(self._buckets[error]))
+            self._detach(victim, error)
+            del self._counts[victim]
+            self._errors.pop(victim, None)
+            self._errors[key] = error
+        self._attach(key, error + count)
+
+    def update(self, counts: Iterable[Tuple[Hashable, int]]):
+        for key, count in counts:
+            self.add(key, count)
+
+    def _attach(self, key: Hashable, count: int):
+        self._counts[key] = count
+        bucket = self._buckets.get(count)
+        if bucket is None:
+            self._buckets[count] = {key: None}
+            heap = self._heap
+            if len(heap) > 2 * len(self._buckets) + 16:
+                heap[:] = self._buckets
+                heapq.heapify(heap)
+            else:
+                heapq.heappush(heap, count)
+        else:
+            bucket[key] = None
+
+    def _detach(self, key: Hashable, count: int):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+    def error(self, key: Hashable) -> int:
+        """Насколько счетчик ключа может быть завышен"""
+        return self._errors.get(key, 0)
+
+    def top(self, n: Optional[int] = None, min_count: int = 1) -> List[Tuple[Hashable, int]]:
+        """Самые частые ключи (при равенстве — в порядке начала подсчета)"""
+        items = sorted(self._counts.items(), key=lambda item: -item[1])
+        items = [item for item in items if item[1] >= min_count]
+        return items if n is None else items[:n]
+
+
+class PhraseCounter:
+    """
+    Фразы одного текста; текст может поступать частями (streaming.TextStats).
+
+    Части должны резаться по пробельным символам: тогда фраза на стыке
+    частей продолжается последними словами предыдущей части.
+    """
+
+    def __init__(self, vocabulary: Vocabulary, capacity: int = PAGE_CAPACITY):
+        self.vocabulary = vocabulary
+        self.sketch = SpaceSaving(capacity)
+        self._previous = (0, 0)   # ID двух предыдущих слов отрезка (0 — граница)
+
+    def feed(self, tokens: TokenStream):
+        keys = []
+        append = keys.append
+        word_id = self.vocabulary.id
+        stop_words = PHRASE_STOP_WORDS
+        prev1, prev2 = self._previous
+        for word in tokens.phrase_words():
+            wid = word_id(word) if word and word not in stop_words else 0
+            if not wid:
+                prev1 = prev2 = 0
+                continue
+            if prev1:
+                pair = (prev1 << ID_BITS) | wid
+                append(pair)
+                if prev2:
+                    append((prev2 << (2 * ID_BITS)) | pair)
+            prev1, prev2 = wid, prev1
+        self._previous = (prev1, prev2)
+        # Внутри части считаем точно, в ограниченные счетчики — уже суммы
+        self.sketch.update(Counter(keys).items())
+
+    def boundary(self):
+        """Конец текста: следующая часть не продолжает фразы"""
+        self._previous = (0, 0)
+
+    def top(self, n: int = DEFAULT_TOP_PHRASES, min_count: int = MIN_PAGE_COUNT) -> List[str]:
+        phrase = self.vocabulary.phrase
+        return [phrase(key) for key, _ in self.sketch.top(n, min_count)]
+
+
+def extract_keyphrases(tokens: TokenStream, vocabulary: Vocabulary,
+                       top_n: int = DEFAULT_TOP_PHRASES) -> List[str]:
+    """Самые частые фразы из 2-3 слов в тексте"""
+    counter = PhraseCounter(vocabulary)
+    counter.feed(tokens)
+    return counter.top(top_n)
+
+
+def common_keyphrases(phrase_lists: Iterable[List[str]], top_n: int = 15,
+                      capacity: int = CORPUS_CAPACITY) -> List[str]:
+    """Фразы, которые есть у нескольких страниц (память ограничена capacity)"""
+    sketch = SpaceSaving(capacity)
+    for phrases in phrase_lists:
+        for phrase in phrases:
+            sketch.add(phrase)
+    return [phrase for phrase, _ in sketch.top(top_n, min_count=2)]
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Разрыв по ключевым словам между Viktorija и конкурентами (TF-IDF).
+
+Все страницы из кеша ответов (ads/.http_cache) — то есть все, что было
+проанализировано или обойдено, — группируются по сайтам, токенизируются
+и попадают в разреженную матрицу; дальше считается TF-IDF и разрыв
+(см. tfidf.py). Вместо кеша можно передать HTML файлы или папки: папка —
+один сайт, для файла сайт — имя его папки. Почти одинаковые страницы
+одного сайта (MinHash, см. near_duplicates.py) в матрицу не попадают.
+
+    python -m ads.keyword_gap
+    python -m ads.keyword_gap --target viktorijaautokool.ee --top 50
+    python -m ads.keyword_gap sites/viktorija sites/drive sites/atlanta
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from typing import Iterator, List, Tuple
+
+from .async_fetch import host_key
+from .html_backends import DEFAULT_BACKEND, get_backend
+from .near_duplicates import NearDuplicateIndex, minhash
+from .http_cache import DEFAULT_CACHE_DIR, ResponseCache
+from .text_tokens import TokenStream
+from .tfidf import DEFAULT_MIN_SITES, DEFAULT_TOP_TERMS, DocumentTermMatrix, find_site, keyword_gap
+
+# Установка кодировки UTF-8 для Windows
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+
+def site_of(url: str) -> str:
+    host = host_key(url)
+    return host[4:] if host.startswith('www.') else host
+
+
+def iter_cached_pages(cache_dir: str) -> Iterator[Tuple[str, str, str]]:
+    """(сайт, url, html) всех страниц кеша"""
+    if not os.path.exists(os.path.join(cache_dir, "responses.sqlite")):
+        return
+    cache = ResponseCache(cache_dir)
+    try:
+        for url, html in cache.iter_pages():
+            yield site_of(url), url, html
+    finally:
+        cache.close()
+
+
+def iter_file_pages(paths: List[str]) -> Iterator[Tuple[str, str, str]]:
+    """(сайт, url, html) из HTML файлов и папок"""
+    for path in paths:
+        if os.path.isdir(path):
+            site = os.path.basename(os.path.normpath(path))
+            files = sorted(os.path.join(root, name) for root, _, names in os.walk(path)
+                           for name in names if name.endswith(('.html', '.htm')))
+        else:
+            site = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            files = [path]
+        for file_path in files:
+            with open(file_path, encoding='utf-8', errors='replace') as f:
+                yield site, f"file://{site}/{os.path.basename(file_path)}", f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TF-IDF разрыв по ключевым словам с конкурентами")
+    parser.add_argument("paths", nargs="*", help="HTML файлы или папки сайтов (по умолчанию — кеш ответов)")
+    parser.add_argument("--target", default="viktorija",
+                        help="Наш сайт или часть его имени (по умолчанию viktorija)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_TERMS, help="Сколько терминов выводить")
+    parser.add_argument("--min-sites", type=int, default=DEFAULT_MIN_SITES,
+                        help="Минимум конкурентов, у которых есть термин")
+    parser.add_argument("--parser", default=DEFAULT_BACKEND, help="HTML парсер (см. html_backends)")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Учитывать и почти одинаковые страницы одного сайта")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Папка кеша ответов")
+    parser.add_argument("--output", default="keyword_gap.json", help="Файл отчета")
+    args = parser.parse_args()
+
+    backend = get_backend(args.parser)
+    pages = iter_file_pages(args.paths) if args.paths else iter_cached_pages(args.cache_dir)
+
+    started = time.perf_counter()
+    matrix = DocumentTermMatrix()
+    duplicates = None if args.keep_duplicates else NearDuplicateIndex()
+    for site, url, html in pages:
+        tokens = TokenStream(backend.extract(html, url).text)
+        # DuplicatePage ложен в if: сравниваем с None
+        if duplicates is not None and duplicates.check(url, minhash(tokens.words), scope=site) is not None:
+            continue
+        matrix.add(site, url, tokens.terms)
+    parsed = time.perf_counter()
+    if not len(matrix):
+        print("[ОШИБКА] Нет страниц: запустите анализ (кеш ads/.http_cache) или передайте HTML файлы")
+        return 1
+
+    target = args.target if args.target in matrix.sites else find_site(matrix.sites, args.target)
+    if target is None:
+        print(f"[ОШИБКА] Сайт {args.target} не найден (есть: {', '.join(matrix.site_names)})")
+        return 1
+    try:
+        report = keyword_gap(matrix, target, top_n=args.top, min_sites=args.min_sites)
+    except ValueError as e:
+        print(f"[ОШИБКА] {e}")
+        return 1
+    finished = time.perf_counter()
+
+    print(f"[TF-IDF] страниц {report['pages']}, сайтов {len(matrix.sites)}, терминов {report['terms']}; "
+          f"разбор {parsed - started:.2f} с, матрица и разрыв {finished - parsed:.3f} с")
+    if duplicates is not None and duplicates.duplicates:
+        print(f"[ДУБЛИКАТЫ] пропущено почти одинаковых страниц: {len(duplicates.duplicates)}")
+    for title, key in (("Темы конкурентов, которых у нас мало", "gaps"), ("Наши сильные темы", "strengths")):
+        print(f"\n{title} ({target}):")
+        print(f"{'Термин':24} {'мы':>8} {'конк. ср.':>10} {'конк. макс':>10} {'сайтов':>7} {'разрыв':>8}")
+        for row in report[key]:
+            print(f"{row['term'][:24]:24} {row['target_weight']:8.4f} {row['competitor_mean']:10.4f} "
+                  f"{row['competitor_max']:10.4f} {row['competitor_sites']:7d} {row['gap']:8.4f}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nОтчет сохранен: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Граф внутренних ссылок сайта: входящие ссылки, PageRank, глубина, сироты.
+
+analyze_page сводит ссылки к двум числам (internal_links, external_links),
+а адреса выбрасывает. При обходе сайта краулер передает сюда ребра
+страница -> внутренняя ссылка. URL получают целые ID, ребра хранятся
+компактно (array 'i'), а для расчетов собираются в CSR: indptr (начало
+списка ссылок каждой страницы) и indices (ID целевых страниц).
+
+- входящие ссылки — np.bincount по indices;
+- PageRank — степенной метод на scipy.sparse (d = 0.85, масса страниц
+  без исходящих ссылок распределяется равномерно);
+- глубина клика от главной — BFS по уровням, соседи всего уровня
+  выбираются из CSR одной векторной операцией;
+- сироты — страницы из sitemap, на которые нет ни одной ссылки
+  (URL sitemap должны быть нормализованы так же, как ссылки). URL
+  сравниваются без схемы и www.: https://www.site.ee/x в sitemap — та же
+  страница, что http://site.ee/x в обходе. URL других хостов в sitemap
+  не считаются сиротами, их число — в sitemap_foreign.
+
+Ссылки учитываются только с обойденных страниц: при ограниченном
+бюджете обхода сиротой может оказаться страница, ссылка на которую есть
+лишь на необойденных страницах.
+
+100 тысяч ребер считаются за десятки миллисекунд (bench_link_graph.py).
+scipy импортируется только в link_report: краулеру для сбора ребер он
+не нужен.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+DEFAULT_DAMPING = 0.85
+DEFAULT_TOLERANCE = 1e-8
+DEFAULT_MAX_ITERATIONS = 100
+DEFAULT_TOP_PAGES = 20
+
+
+class LinkGraph:
+    """
+    Накопление ребер графа ссылок одного сайта.
+
+    Каждая страница добавляется один раз со всеми своими ссылками;
+    повторные ссылки на одну страницу и ссылки на себя не учитываются.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, int] = {}
+        self._sources = array('i')
+        self._targets = array('i')
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._targets)
+
+    def node(self, url: str) -> int:
+        nodes = self.nodes
+        return nodes.setdefault(url, len(nodes))
+
+    def add(self, url: str, links: Iterable[str]):
+        """Страница url и ее внутренние ссылки (нормализованные URL)"""
+        source = self.node(url)
+        nodes = self.nodes
+        targets = {nodes.setdefault(link, len(nodes)) for link in links}
+        targets.discard(source)
+        self._targets.extend(sorted(targets))
+        self._sources.extend([source] * len(targets))
+
+    @property
+    def urls(self) -> List[str]:
+        """URL по ID"""
+        return list(self.nodes)
+
+    def csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(indptr, indices): ссылки страницы i — indices[indptr[i]:indptr[i + 1]]"""
+        n = len(self.nodes)
+        sources = np.frombuffer(self._sources, dtype=np.int32) if self._sources else np.zeros(0, np.int32)
+        targets = np.frombuffer(self._targets, dtype=np.int32) if self._targets else np.zeros(0, np.int32)
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        return indptr, targets[order]
+
+
+def inlink_counts(indices: np.ndarray, n: int) -> np.ndarray:
+    """Число входящих ссылок каждой страницы"""
+    return np.bincount(indices, minlength=n)
+
+
+def pagerank(adjacency: 'scipy.sparse.csr_matrix', damping: float = DEFAULT_DAMPING,
+             tolerance: float = DEFAULT_TOLERANCE,
+             max_iterations: int = DEFAULT_MAX_ITERATIONS) -> Tuple[np.ndarray, int]:
+    """PageRank степенным методом: (ранги с суммой 1, число итераций)"""
+    n = adjacency.shape[0]
+    if n == 0:
+        return np.zeros(0), 0
+    out_degree = np.diff(adjacency.indptr)
+    dangling = out_degree == 0
+    inverse = np.zeros(n)
+    inverse[~dangling] = 1.0 / out_degree[~dangling]
+    # Переходы по ссылкам: rank_new = d * A^T (rank / out) + (d * висячая масса + 1 - d) / n
+    transition = adjacency.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for iteration in range(1, max_iterations + 1):
+        spread = transition @ (rank * inverse)
+        new_rank = damping * spread + (damping * rank[dangling].sum() + 1.0 - damping) / n
+        delta = np.abs(new_rank - rank).sum()
+        rank = new_rank
+        if delta < tolerance:
+            return rank, iteration
+    return rank, max_iterations
+
+
+def click_depth(indptr: np.ndarray, indices: np.ndarray, start: int) -> np.ndarray:
+    """Минимальное число кликов от страницы start (-1 — недостижима)"""
+    n = len(indptr) - 1
+    depth = np.full(n, -1, dtype=np.int32)
+    if not 0 <= start < n:
+        return depth
+    depth[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    level = 0
+    while len(frontier):
+        level += 1
+        starts = indptr[frontier]
+        lengths = indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            break
+        # Позиции всех ссылок уровня: starts[i] .. starts[i] + lengths[i] подряд
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        neighbors = indices[offsets]
+        frontier = np.unique(neighbors[depth[neighbors] < 0])
+        depth[frontier] = level
+    return depth
+
+
+def page_key(url: str) -> Tuple[str, str]:
+    """(хост без www., путь?запрос) — одна страница при разных схеме и www."""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    host = host[4:] if host.startswith('www.') else host
+    return host, (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+
+def link_report(graph: LinkGraph, home: str, sitemap_urls: Optional[Iterable[str]] = None,
+                top_n: int = DEFAULT_TOP_PAGES) -> Dict:
+    """
+    Сводка по графу: самые сильные страницы по PageRank, распределение
+    глубины, страницы глубже 3 кликов и сироты из sitemap.
+    """
+    from scipy import sparse
+
+    urls = graph.urls
+    n = len(urls)
+    indptr, indices = graph.csr()
+    adjacency = sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+    inlinks = inlink_counts(indices, n)
+    ranks, iterations = pagerank(adjacency)
+    depth = click_depth(indptr, indices, graph.nodes.get(home, -1))
+
+    order = np.argsort(-ranks, kind='stable')[:top_n]
+    levels, counts = np.unique(depth, return_counts=True)
+    report = {
+        "home": home,
+        "pages": n,
+        "edges": int(len(indices)),
+        "pagerank_iterations": iterations,
+        "top_pages": [{"url": urls[i], "pagerank": round(float(ranks[i]), 6),
+                       "inlinks": int(inlinks[i]), "depth": int(depth[i])} for i in order],
+        "depth_histogram": {("unreachable" if level < 0 else str(level)): int(count)
+                            for level, count in zip(levels, counts)},
+        "deep_pages": [urls[i] for i in np.flatnonzero(depth > 3)],
+    }
+    if sitemap_urls is not None:
+        # Страницы со входящими ссылками — по ключу без схемы и www.
+        linked = {page_key(url) for url, index in graph.nodes.items() if inlinks[index]}
+        home_key = page_key(home)
+        orphans, foreign = set(), 0
+        for url in sitemap_urls:
+            key = page_key(url)
+            if key[0] != home_key[0]:
+                foreign += 1
+            elif key != home_key and key not in linked:
+                orphans.add(url)
+        report["orphans"] = sorted(orphans)
+        report["sitemap_foreign"] = foreign
+    return report
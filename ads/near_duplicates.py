@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Поиск почти одинаковых страниц: MinHash + LSH индекс.
+
+При обходе сайтов автошкол одна и та же страница часто отдается под
+несколькими URL: /et/ и /, варианты с параметрами, копии для разных
+городов. Анализировать их все — лишняя работа, и они искажают средние
+в отчете (avg_word_count), а в TF-IDF одна страница получает вес
+нескольких.
+
+Текст страницы — множество шинглов из трех подряд идущих слов.
+Отпечаток — MinHash из 64 независимых хешей: для каждого хеша берется
+минимум по всем шинглам. Доля совпадающих позиций двух отпечатков
+оценивает коэффициент Жаккара множеств шинглов. Минимум можно считать
+по частям текста, поэтому отпечаток строится и при потоковом анализе.
+
+Индекс (LSH) делит отпечаток на 8 полос по 8 хешей; страницы с
+совпадающей полосой — кандидаты, их сходство проверяется по отпечатку
+целиком. При сходстве 0.9 пара становится кандидатом с вероятностью
+99%, при 0.5 — 3%. Ключ полосы — 32 байта, случайных совпадений почти
+нет, поэтому на страницу приходится несколько обращений к словарю и
+проверка немногих кандидатов независимо от размера индекса.
+
+У страниц без текста или с парой фраз (оболочки SPA на JavaScript,
+короткие лендинги) шинглов почти нет, и отпечатки вырождаются в
+одинаковые: все такие страницы оказались бы копиями первой. Поэтому
+отпечаток строится только начиная с MIN_SHINGLES шинглов, а страница без
+отпечатка дубликатом не считается.
+
+SimHash (64 бита) был бы компактнее, но на длинных страницах
+расстояние между копиями с парой замененных слов сильно колеблется, и
+для надежного порога полосы приходится делать узкими — число кандидатов
+растет вместе с индексом.
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 3
+NUM_HASHES = 64
+BANDS = 8                     # NUM_HASHES / BANDS хешей в полосе
+DEFAULT_THRESHOLD = 0.8       # оценка Жаккара, начиная с которой страница считается копией
+MIN_SHINGLES = 20             # меньше шинглов — отпечаток не строится (сходство ненадежно)
+BLOCK_SIZE = 4096             # шинглов за раз (память: BLOCK_SIZE x NUM_HASHES x 8 байт)
+MAX_WORD_HASHES = 1 << 20     # запомненных хешей слов (словарь страниц сайта повторяется)
+
+# Множители для смешивания хешей слов шингла (нечетные 64-битные константы)
+_MIX = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F), np.uint64(0x165667B19E3779F9))
+# Параметры хешей a * x + b (a нечетные); фиксированы, чтобы отпечатки в кеше совпадали между запусками
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2 ** 62, size=NUM_HASHES, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _rng.integers(0, 2 ** 63, size=NUM_HASHES, dtype=np.uint64)
+_EMPTY = np.uint64(2 ** 32 - 1)
+del _rng
+
+
+_word_hashes: Dict[str, int] = {}
+
+
+def word_hash(word: str) -> int:
+    """Стабильный между запусками 64-битный хеш слова (hash() зависит от PYTHONHASHSEED)"""
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _word_hash_list(words: List[str]) -> List[int]:
+    """Хеши слов через общий словарь (blake2b — самая дорогая часть отпечатка)"""
+    memo = _word_hashes
+    if len(memo) > MAX_WORD_HASHES:
+        memo.clear()
+    result = []
+    append = result.append
+    for word in words:
+        value = memo.get(word)
+        if value is None:
+            value = memo[word] = word_hash(word)
+        append(value)
+    return result
+
+
+def _shingle_hashes(hashes: np.ndarray, size: int) -> np.ndarray:
+    """Хеши шинглов: смешивание хешей соседних слов (переполнение uint64 — по модулю 2^64)"""
+    count = len(hashes) - size + 1
+    mixed = np.zeros(count, dtype=np.uint64)
+    for position in range(size):
+        mixed ^= hashes[position:position + count] * _MIX[position]
+    # Финальное перемешивание splitmix64
+    mixed ^= mixed >> np.uint64(31)
+    mixed *= np.uint64(0xBF58476D1CE4E5B9)
+    mixed ^= mixed >> np.uint64(27)
+    return mixed
+
+
+def _min_hashes(shingles: np.ndarray) -> np.ndarray:
+    """Минимумы NUM_HASHES хешей по шинглам (блоками, чтобы не расходовать память)"""
+    minimums = np.full(NUM_HASHES, _EMPTY, dtype=np.uint64)
+    for start in range(0, len(shingles), BLOCK_SIZE):
+        block = shingles[start:start + BLOCK_SIZE, None]
+        # Старшие 32 бита a * x + b — семейство хешей multiply-shift
+        values = (block * _A + _B) >> np.uint64(32)
+        np.minimum(minimums, values.min(axis=0), out=minimums)
+    return minimums
+
+
+class MinHash:
+    """
+    MinHash текста, получаемого по частям (списками слов).
+
+    Последние SHINGLE_SIZE - 1 слов переносятся в следующую часть, поэтому
+    результат не зависит от разбиения текста.
+    """
+
+    def __init__(self, shingle_size: int = SHINGLE_SIZE, min_shingles: int = MIN_SHINGLES):
+        self.shingle_size = shingle_size
+        self.min_shingles = max(1, min_shingles)
+        self.minimums = np.full(NUM_HASHES, _EMPTY, dtype=np.uint64)
+        self.shingles = 0
+        self.words = 0
+        self._carry: List[int] = []
+
+    def feed(self, words: List[str]):
+        if not words:
+            return
+        hashes = self._carry + _word_hash_list(words)
+        self.words += len(words)
+        self._carry = hashes[-(self.shingle_size - 1):] if self.shingle_size > 1 else []
+        if len(hashes) >= self.shingle_size:
+            shingles = _shingle_hashes(np.array(hashes, dtype=np.uint64), self.shingle_size)
+            self.shingles += len(shingles)
+            np.minimum(self.minimums, _min_hashes(shingles), out=self.minimums)
+
+    @property
+    def value(self) -> Optional[bytes]:
+        """Отпечаток — NUM_HASHES чисел uint32 (None, если шинглов меньше min_shingles)"""
+        if self.shingles < self.min_shingles:
+            return None
+        return self.minimums.astype('<u4').tobytes()
+
+
+def minhash(words: List[str]) -> Optional[bytes]:
+    """MinHash списка нормализованных слов (TokenStream.words)"""
+    fingerprint = MinHash()
+    fingerprint.feed(words)
+    return fingerprint.value
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Оценка коэффициента Жаккара по двум отпечаткам"""
+    return float(np.count_nonzero(np.frombuffer(a, dtype='<u4') == np.frombuffer(b, dtype='<u4'))) / NUM_HASHES
+
+
+@dataclass
+class DuplicatePage:
+    """Страница почти совпадает с уже проанализированной (ложна в if, как FetchFailure)"""
+    url: str
+    duplicate_of: str
+    similarity: float
+
+    def __bool__(self):
+        return False
+
+
+class NearDuplicateIndex:
+    """
+    LSH индекс отпечатков MinHash.
+
+    Страницы сравниваются только внутри одной области (scope, обычно сайт):
+    одинаковый текст на разных сайтах — разные конкуренты. Индекс общий
+    для потоков краулера: проверка и добавление выполняются атомарно.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold должен быть в (0, 1]")
+        self.threshold = threshold
+        self._band_bytes = NUM_HASHES // BANDS * 4
+        self._buckets: Dict[Tuple[str, int, bytes], List[Tuple[bytes, str]]] = {}
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.duplicates: List[DuplicatePage] = []
+        self.comparisons = 0
+
+    def _keys(self, scope: str, fingerprint: bytes):
+        size = self._band_bytes
+        return [(scope, band, fingerprint[band * size:(band + 1) * size]) for band in range(BANDS)]
+
+    def check(self, url: str, fingerprint: Optional[bytes], scope: str = "") -> Optional[DuplicatePage]:
+        """
+        DuplicatePage, если в области уже есть страница со сходством от threshold;
+        иначе страница добавляется в индекс и возвращается None. Страница без
+        отпечатка (слишком короткий текст) не бывает дубликатом и не индексируется.
+        """
+        if fingerprint is None:
+            return None
+        keys = self._keys(scope, fingerprint)
+        with self._lock:
+            self.pages += 1
+            best: Optional[Tuple[float, str]] = None
+            checked = set()
+            for key in keys:
+                for other, other_url in self._buckets.get(key, ()):
+                    if other_url in checked:
+                        continue
+                    checked.add(other_url)
+                    self.comparisons += 1
+                    score = similarity(fingerprint, other)
+                    if score >= self.threshold and (best is None or score > best[0]):
+                        best = (score, other_url)
+            if best is None:
+                for key in keys:
+                    self._buckets.setdefault(key, []).append((fingerprint, url))
+                return None
+            if best[1] == url:
+                # Та же страница повторно (например, после перепроверки кеша)
+                return None
+            duplicate = DuplicatePage(url=url, duplicate_of=best[1], similarity=round(best[0], 3))
+            self.duplicates.append(duplicate)
+            return duplicate
+
+    def stats(self) -> Dict[str, int]:
+        return {"pages": self.pages, "duplicates": len(self.duplicates), "comparisons": self.comparisons}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Повторы запросов и circuit breaker для SEOAnalyzer.fetch.
+
+Ошибки классифицируются (таймаут соединения, таймаут чтения, 5xx, 429 ...),
+повторяются только временные — с экспоненциальной задержкой и случайным
+джиттером. Для каждого хоста работает circuit breaker: после нескольких
+ошибок подряд запросы к хосту сразу завершаются ошибкой circuit_open, пока
+не пройдет reset_timeout, — мертвый хост не стоит полного таймаута на
+каждом URL. Причина неудачи возвращается в FetchFailure вместо None.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 10.0
+MAX_ATTEMPTS = 3
+BASE_DELAY = 0.5
+MAX_DELAY = 10.0
+FAILURE_THRESHOLD = 5     # ошибок подряд до размыкания
+RESET_TIMEOUT = 60.0      # секунд до пробного запроса
+
+# Причины, при которых повтор имеет смысл
+RETRYABLE_REASONS = {'connect_timeout', 'read_timeout', 'connection_error', 'http_5xx', 'http_429'}
+# Причины, которые говорят о проблеме с хостом (для circuit breaker)
+HOST_FAILURE_REASONS = {'connect_timeout', 'read_timeout', 'connection_error', 'ssl_error', 'http_5xx'}
+
+
+@dataclass
+class FetchFailure:
+    """Неудачная загрузка страницы (ложна в if, как прежний None)"""
+    url: str
+    reason: str
+    attempts: int = 0
+    status_code: Optional[int] = None
+    message: str = ""
+
+    def __bool__(self):
+        return False
+
+
+class FetchError(Exception):
+    """Исключение с описанием неудачи загрузки"""
+
+    def __init__(self, failure: FetchFailure):
+        super().__init__(f"{failure.reason}: {failure.message}")
+        self.failure = failure
+
+
+def classify_status(status_code: int) -> Optional[str]:
+    """Причина ошибки по HTTP статусу (None — не ошибка)"""
+    if status_code == 429:
+        return 'http_429'
+    if status_code == 408 or status_code >= 500:
+        return 'http_5xx'
+    if status_code >= 400:
+        return 'http_4xx'
+    return None
+
+
+def classify_exception(error: Exception) -> str:
+    """
+    Причина ошибки по исключению requests/httpx.
+
+    Сравниваем имена классов, чтобы не импортировать httpx без необходимости.
+    """
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if 'ConnectTimeout' in names:
+        return 'connect_timeout'
+    if names & {'ReadTimeout', 'Timeout', 'TimeoutException', 'TimeoutError'}:
+        return 'read_timeout'
+    if 'SSLError' in names:
+        return 'ssl_error'
+    if 'TooManyRedirects' in names:
+        return 'too_many_redirects'
+    if names & {'ConnectionError', 'ConnectError', 'NetworkError', 'RemoteProtocolError',
+                'ChunkedEncodingError', 'ProtocolError'}:
+        return 'connection_error'
+    if names & {'InvalidURL', 'MissingSchema', 'InvalidSchema', 'UnsupportedProtocol'}:
+        return 'invalid_url'
+    return 'other'
+
+
+@dataclass
+class RetryPolicy:
+    """Экспоненциальная задержка с полным джиттером"""
+    max_attempts: int = MAX_ATTEMPTS
+    base_delay: float = BASE_DELAY
+    max_delay: float = MAX_DELAY
+
+    def should_retry(self, reason: str, attempt: int) -> bool:
+        return reason in RETRYABLE_REASONS and attempt < self.max_attempts
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Пауза перед попыткой attempt + 1 (Retry-After сервера важнее)"""
+        if retry_after:
+            try:
+                return min(self.max_delay, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """Circuit breaker по хостам: closed -> open -> half-open -> closed"""
+
+    def __init__(self, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial_in_progress: Dict[str, bool] = {}
+
+    def allow(self, host: str) -> bool:
+        """Можно ли сейчас отправить запрос к хосту"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.reset_timeout:
+                return False
+            # half-open: пропускаем один пробный запрос
+            if self._trial_in_progress.get(host):
+                return False
+            self._trial_in_progress[host] = True
+            return True
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_in_progress.pop(host, None)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if self._trial_in_progress.pop(host, False) or failures >= self.failure_threshold:
+                if host not in self._opened_at:
+                    print(f"[CIRCUIT] {host}: {failures} ошибок подряд, запросы приостановлены "
+                          f"на {self.reset_timeout:.0f} с")
+                self._opened_at[host] = time.monotonic()
+
+    def open_hosts(self):
+        """Хосты с разомкнутой цепью"""
+        with self._lock:
+            return sorted(self._opened_at)
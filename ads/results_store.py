@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Хранилище результатов анализа: SQLite (WAL) с историей запусков.
+
+Раньше результат сайта был только в <slug>_report.json: каждый запуск
+перезаписывал файл, а сравнительный отчет перебирал каталог и разбирал
+все JSON заново. Теперь результаты пишутся в базу
+(ads/.results/results.sqlite):
+
+- sites   — сайты (ключ — slug из реестра sites.json или хост);
+- pages   — страницы сайтов, URL уникален;
+- runs    — запуски анализа (время, команда, версия анализатора);
+- metrics — SEOData страницы в конкретном запуске; списки (заголовки,
+  ключевые слова) — одной строкой через разделитель \x1f: кодирование
+  и разбор в разы быстрее json.dumps/json.loads на каждую строку.
+  К строке добавляются хеши полей HASHED_COLUMNS (по 8 байт) и хеш
+  страницы от них: изменения между запусками (run_diff.py) находятся
+  сравнением хеша страницы, без чтения и разбора самих полей.
+
+Индексы: сайт страницы, URL, дата запуска и (страница, запуск). Последний
+запуск каждой страницы находится по индексу, не читая строк, а страницы
+одного сайта — по индексу сайта, а не разбором всех файлов. Строки
+копятся в буфере и пишутся пачками по batch_size в одной транзакции
+(executemany). 100 тысяч страниц пишутся за 3-5 с, последние результаты
+всех читаются за 3-4 с, одного сайта (2000 страниц) — за 40 мс; glob и
+json.load тех же 100 тысяч файлов — 5.4 с (bench_results_store.py).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .site_registry import SiteRegistry, default_registry, host_of
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".results")
+DEFAULT_BATCH_SIZE = 1000
+
+# Поля SEOData в таблице metrics (кроме url) и какие из них — списки
+METRIC_COLUMNS = ("title", "meta_description", "h1_tags", "h2_tags", "keywords", "keyphrases",
+                  "word_count", "internal_links", "external_links", "images_count", "images_with_alt")
+LIST_COLUMNS = frozenset({"h1_tags", "h2_tags", "keywords", "keyphrases"})
+LIST_SEPARATOR = "\x1f"     # разделитель элементов списка (в тексте страниц не встречается)
+# Поля, изменения которых отслеживаются между запусками (порядок хешей в field_hashes)
+HASHED_COLUMNS = ("title", "meta_description", "h1_tags", "h2_tags", "word_count", "keywords")
+FIELD_HASH_SIZE = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    site_id INTEGER NOT NULL REFERENCES sites(id),
+    url TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS pages_site ON pages(site_id);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    command TEXT,
+    analyzer_version INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs(started_at);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    page_id INTEGER NOT NULL REFERENCES pages(id),
+    title TEXT,
+    meta_description TEXT,
+    h1_tags TEXT,
+    h2_tags TEXT,
+    keywords TEXT,
+    keyphrases TEXT,
+    word_count INTEGER,
+    internal_links INTEGER,
+    external_links INTEGER,
+    images_count INTEGER,
+    images_with_alt INTEGER,
+    page_hash BLOB,
+    field_hashes BLOB
+);
+CREATE UNIQUE INDEX IF NOT EXISTS metrics_page_run ON metrics(page_id, run_id);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics(run_id);
+"""
+
+_METRICS_INSERT = (f"INSERT OR REPLACE INTO metrics (run_id, page_id, {', '.join(METRIC_COLUMNS)}, "
+                   f"page_hash, field_hashes) VALUES ({', '.join('?' * (len(METRIC_COLUMNS) + 4))})")
+_METRICS_SELECT = ", ".join(f"m.{column}" for column in METRIC_COLUMNS)
+_LIST_FLAGS = tuple(column in LIST_COLUMNS for column in METRIC_COLUMNS)
+_HASHED_INDEXES = tuple(METRIC_COLUMNS.index(column) for column in HASHED_COLUMNS)
+
+
+def _field_hashes(values) -> Tuple[bytes, bytes]:
+    """(хеш страницы, хеши HASHED_COLUMNS подряд) по значениям колонок METRIC_COLUMNS"""
+    hashes = b"".join(hashlib.blake2b(b"\0" if values[i] is None else str(values[i]).encode('utf-8'),
+                                      digest_size=FIELD_HASH_SIZE).digest()
+                      for i in _HASHED_INDEXES)
+    return hashlib.blake2b(hashes, digest_size=FIELD_HASH_SIZE).digest(), hashes
+
+
+def changed_fields(old_hashes: Optional[bytes], new_hashes: bytes) -> List[str]:
+    """Поля HASHED_COLUMNS, хеши которых различаются (все — если старых хешей нет)"""
+    if not old_hashes:
+        return list(HASHED_COLUMNS)
+    return [column for i, column in enumerate(HASHED_COLUMNS)
+            if old_hashes[i * FIELD_HASH_SIZE:(i + 1) * FIELD_HASH_SIZE]
+            != new_hashes[i * FIELD_HASH_SIZE:(i + 1) * FIELD_HASH_SIZE]]
+
+
+def _metric_row(run_id: int, page_id: int, data: Dict) -> Tuple:
+    """asdict(SEOData) -> значения строки metrics (списки склеиваются через LIST_SEPARATOR)"""
+    values = []
+    for column, is_list in zip(METRIC_COLUMNS, _LIST_FLAGS):
+        value = data.get(column)
+        values.append(LIST_SEPARATOR.join(value) if is_list and value is not None else value)
+    return (run_id, page_id, *values, *_field_hashes(values))
+
+
+def _seo_data(url: str, row) -> Dict:
+    """Строка metrics -> словарь в формате asdict(SEOData)"""
+    data = {"url": url}
+    for column, is_list, value in zip(METRIC_COLUMNS, _LIST_FLAGS, row):
+        if is_list and value is not None:
+            value = value.split(LIST_SEPARATOR) if value else []
+        data[column] = value
+    return data
+
+
+def _field_values(columns: List[str], row) -> Dict:
+    """Значения выбранных колонок metrics (списки разбираются)"""
+    values = {}
+    for column, value in zip(columns, row):
+        if column in LIST_COLUMNS and value is not None:
+            value = value.split(LIST_SEPARATOR) if value else []
+        values[column] = value
+    return values
+
+
+class ResultsStore:
+    """История результатов анализа в SQLite; общий для потоков (запись под блокировкой)"""
+
+    def __init__(self, results_dir: str = DEFAULT_RESULTS_DIR, batch_size: int = DEFAULT_BATCH_SIZE,
+                 registry: Optional[SiteRegistry] = None):
+        os.makedirs(results_dir, exist_ok=True)
+        self.path = os.path.join(results_dir, "results.sqlite")
+        self.batch_size = max(1, batch_size)
+        self.registry = registry if registry is not None else default_registry()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._site_ids: Dict[str, int] = dict(self._conn.execute("SELECT key, id FROM sites"))
+        self._host_sites: Dict[str, int] = {}        # хост -> ID сайта
+        self._page_ids: Optional[Dict[str, int]] = None   # URL -> ID, загружается при первой записи
+        self._pending: List[Tuple[int, Dict]] = []
+        self.pages_written = 0
+
+    # Запись
+
+    def start_run(self, command: str = "", analyzer_version: Optional[int] = None,
+                  started_at: Optional[float] = None) -> int:
+        """Новый запуск; его ID передается в add_page"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (started_at, command, analyzer_version) VALUES (?, ?, ?)",
+                (started_at if started_at is not None else time.time(), command, analyzer_version))
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def add_page(self, run_id: int, data: Dict):
+        """Результат страницы (asdict(SEOData)); запись — пачками по batch_size"""
+        with self._lock:
+            self._pending.append((run_id, data))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def add_pages(self, run_id: int, pages: Iterable[Dict]):
+        for data in pages:
+            self.add_page(run_id, data)
+
+    def finish_run(self, run_id: int):
+        """Запись остатка буфера и время окончания запуска"""
+        with self._lock:
+            self._flush()
+            self._conn.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+            self._conn.commit()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _site_id(self, url: str) -> int:
+        """ID сайта страницы: запись реестра или хост (создается при первой встрече)"""
+        host = host_of(url)
+        site_id = self._host_sites.get(host)
+        if site_id is not None:
+            return site_id
+        site = self.registry.resolve(host)
+        key = site.slug if site is not None else host
+        site_id = self._site_ids.get(key)
+        if site_id is None:
+            name, home = (site.name, site.url) if site is not None else (key, url)
+            self._conn.execute("INSERT OR IGNORE INTO sites (key, name, url) VALUES (?, ?, ?)", (key, name, home))
+            site_id = self._site_ids[key] = self._conn.execute(
+                "SELECT id FROM sites WHERE key = ?", (key,)).fetchone()[0]
+        self._host_sites[host] = site_id
+        return site_id
+
+    def _page_id(self, url: str) -> int:
+        page_ids = self._page_ids
+        if page_ids is None:
+            page_ids = self._page_ids = dict(self._conn.execute("SELECT url, id FROM pages"))
+        page_id = page_ids.get(url)
+        if page_id is None:
+            cursor = self._conn.execute("INSERT OR IGNORE INTO pages (site_id, url) VALUES (?, ?)",
+                                        (self._site_id(url), url))
+            if cursor.rowcount:
+                page_id = cursor.lastrowid
+            else:
+                # Страницу уже добавил другой процесс
+                page_id = self._conn.execute("SELECT id FROM pages WHERE url = ?", (url,)).fetchone()[0]
+            page_ids[url] = page_id
+        return page_id
+
+    def _flush(self):
+        """Буфер одной транзакцией (вызывается под блокировкой)"""
+        if not self._pending:
+            return
+        with self._conn:
+            rows = [_metric_row(run_id, self._page_id(data["url"]), data) for run_id, data in self._pending]
+            self._conn.executemany(_METRICS_INSERT, rows)
+        self.pages_written += len(self._pending)
+        self._pending.clear()
+
+    # Чтение
+
+    def latest_pages(self, site: Optional[str] = None) -> List[Dict]:
+        """
+        Последний результат каждой страницы (только сайта site — slug или хост):
+        [{"site", "name", "url", "run_id", "analysis_date", "seo_data"}]
+        """
+        self.flush()
+        columns = f"SELECT s.key, s.name, p.url, m.run_id, {_METRICS_SELECT} "
+        if site is None:
+            # Последний запуск каждой страницы — по индексу (page_id, run_id), без чтения строк
+            query = (columns + "FROM (SELECT page_id, MAX(run_id) AS run_id FROM metrics GROUP BY page_id) AS last "
+                     "JOIN metrics AS m ON m.page_id = last.page_id AND m.run_id = last.run_id "
+                     "JOIN pages AS p ON p.id = m.page_id JOIN sites AS s ON s.id = p.site_id")
+            params: Tuple = ()
+        else:
+            # Страницы сайта — по индексу pages_site, последний запуск каждой — по индексу метрик
+            query = (columns + "FROM sites AS s JOIN pages AS p ON p.site_id = s.id "
+                     "JOIN metrics AS m ON m.page_id = p.id "
+                     "AND m.run_id = (SELECT MAX(run_id) FROM metrics WHERE page_id = p.id) "
+                     "WHERE s.key = ?")
+            params = (site,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+            dates = self._run_dates()
+        pages = []
+        for row in rows:
+            key, name, url, run_id = row[:4]
+            pages.append({"site": key, "name": name, "url": url, "run_id": run_id,
+                          "analysis_date": dates[run_id], "seo_data": _seo_data(url, row[4:])})
+        pages.sort(key=lambda page: page["url"])
+        return pages
+
+    def _run_dates(self) -> Dict[int, str]:
+        """ID запуска -> дата начала в ISO формате"""
+        return {run_id: datetime.fromtimestamp(started_at).isoformat()
+                for run_id, started_at in self._conn.execute("SELECT id, started_at FROM runs")}
+
+    def site_reports(self) -> List[Dict]:
+        """
+        Последний результат главной страницы каждого сайта в формате
+        <slug>_report.json: {"analysis_date", "site_url", "seo_data"}. Если
+        главная не анализировалась — последний результат другой страницы.
+        """
+        self.flush()
+        with self._lock:
+            sites = self._conn.execute("SELECT id, url FROM sites ORDER BY key").fetchall()
+            reports = []
+            for site_id, home in sites:
+                row = self._conn.execute(
+                    f"SELECT p.url, r.started_at, {_METRICS_SELECT} "
+                    "FROM pages AS p JOIN metrics AS m ON m.page_id = p.id JOIN runs AS r ON r.id = m.run_id "
+                    "WHERE p.site_id = ? ORDER BY p.url = ? DESC, m.run_id DESC LIMIT 1",
+                    (site_id, home)).fetchone()
+                if row is not None:
+                    url, started_at = row[:2]
+                    reports.append({"analysis_date": datetime.fromtimestamp(started_at).isoformat(),
+                                    "site_url": url, "seo_data": _seo_data(url, row[2:])})
+        return reports
+
+    def history(self, url: str) -> List[Dict]:
+        """Все результаты страницы по запускам (от старых к новым)"""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT r.id, r.started_at, {_METRICS_SELECT} FROM pages AS p "
+                "JOIN metrics AS m ON m.page_id = p.id JOIN runs AS r ON r.id = m.run_id "
+                "WHERE p.url = ? ORDER BY m.run_id", (url,)).fetchall()
+        return [{"run_id": row[0], "analysis_date": datetime.fromtimestamp(row[1]).isoformat(),
+                 "seo_data": _seo_data(url, row[2:])} for row in rows]
+
+    def changed_pages(self, run_id: int) -> Tuple[int, List[Dict]]:
+        """
+        Страницы запуска run_id, изменившиеся с их предыдущего результата:
+        (страниц в запуске, [{"site", "name", "url", "prev_run_id", "fields",
+        "old", "new"}]). Неизменившиеся страницы отсекаются в запросе
+        сравнением хеша страницы; old/new содержат только поля из fields
+        (для новой страницы old пустой, prev_run_id — None).
+        """
+        self.flush()
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM metrics WHERE run_id = ?", (run_id,)).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT s.key, s.name, p.url, m.rowid, m.field_hashes, prev.rowid, prev.run_id, prev.field_hashes "
+                "FROM metrics AS m JOIN pages AS p ON p.id = m.page_id JOIN sites AS s ON s.id = p.site_id "
+                "LEFT JOIN metrics AS prev ON prev.page_id = m.page_id AND prev.run_id = "
+                "(SELECT MAX(run_id) FROM metrics WHERE page_id = m.page_id AND run_id < m.run_id) "
+                "WHERE m.run_id = ? AND prev.page_hash IS NOT m.page_hash ORDER BY p.url", (run_id,)).fetchall()
+            changes = []
+            for key, name, url, rowid, hashes, prev_rowid, prev_run_id, prev_hashes in rows:
+                fields = changed_fields(prev_hashes, hashes) if prev_rowid is not None else list(HASHED_COLUMNS)
+                select = f"SELECT {', '.join(fields)} FROM metrics WHERE rowid = ?"
+                new = self._conn.execute(select, (rowid,)).fetchone()
+                old = self._conn.execute(select, (prev_rowid,)).fetchone() if prev_rowid is not None else None
+                changes.append({"site": key, "name": name, "url": url, "prev_run_id": prev_run_id, "fields": fields,
+                                "old": _field_values(fields, old) if old is not None else {},
+                                "new": _field_values(fields, new)})
+        return total, changes
+
+    def latest_run(self) -> Optional[int]:
+        """ID последнего запуска с результатами"""
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(run_id) FROM metrics").fetchone()
+        return row[0]
+
+    def runs(self, limit: int = 20) -> List[Dict]:
+        """Последние запуски с числом страниц"""
+        return self._runs("ORDER BY r.started_at DESC LIMIT ?", (limit,))
+
+    def run(self, run_id: int) -> Optional[Dict]:
+        """Запуск run_id в формате runs() (None, если его нет)"""
+        runs = self._runs("WHERE r.id = ?", (run_id,))
+        return runs[0] if runs else None
+
+    def _runs(self, clause: str, params: Tuple) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.id, r.started_at, r.finished_at, r.command, r.analyzer_version, "
+                "(SELECT COUNT(*) FROM metrics WHERE run_id = r.id) "
+                f"FROM runs AS r {clause}", params).fetchall()
+        return [{"run_id": run_id, "started_at": datetime.fromtimestamp(started).isoformat(),
+                 "finished_at": datetime.fromtimestamp(finished).isoformat() if finished else None,
+                 "command": command, "analyzer_version": version, "pages": pages}
+                for run_id, started, finished, command, version, pages in rows]
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM metrics LIMIT 1").fetchone() is None
+
+    # Старые отчеты
+
+    def import_reports(self, paths: Iterable[str]) -> int:
+        """
+        Импорт <slug>_report.json (запуск на каждый файл с его analysis_date);
+        уже импортированный файл (та же команда и дата) пропускается.
+        """
+        imported = 0
+        for path in sorted(paths):
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            started_at = datetime.fromisoformat(report["analysis_date"]).timestamp()
+            command = f"import {os.path.basename(path)}"
+            with self._lock:
+                exists = self._conn.execute("SELECT 1 FROM runs WHERE command = ? AND started_at = ?",
+                                            (command, started_at)).fetchone()
+            if exists:
+                continue
+            run_id = self.start_run(command, started_at=started_at)
+            self.add_page(run_id, report["seo_data"])
+            self.finish_run(run_id)
+            imported += 1
+        return imported
+
+    def close(self):
+        with self._lock:
+            self._flush()
+            self._conn.close()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Что изменилось у конкурентов: разница запуска с предыдущими результатами.
+
+Для каждой страницы запуска берется ее предыдущий результат в хранилище
+(results_store.py) — не обязательно из предыдущего запуска: сайты
+анализируются в разных запусках. Страницы с тем же хешем страницы
+отсекаются в запросе к базе; для остальных по хешам полей определяется,
+какие поля изменились, и читаются только они. Изменения:
+
+- title и meta_description — старое и новое значение;
+- H1/H2 — добавленные и удаленные заголовки;
+- word_count — старое, новое и разница;
+- keywords — новые и пропавшие ключевые слова.
+
+Результат — лента изменений: changes.jsonl (строка на страницу) и
+сводка changes.md по сайтам. Страницы, пропавшие из обхода, не
+отслеживаются: запуск может охватывать только часть сайтов и страниц.
+
+    python -m ads diff                    # последний запуск
+    python -m ads diff --run 12 --output-dir reports/
+"""
+
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+from .results_store import ResultsStore
+
+FEED_NAME = "changes.jsonl"
+SUMMARY_NAME = "changes.md"
+
+TEXT_FIELDS = ("title", "meta_description")
+HEADING_FIELDS = ("h1_tags", "h2_tags")
+FIELD_TITLES = {"title": "Title", "meta_description": "Meta description", "h1_tags": "H1",
+                "h2_tags": "H2", "word_count": "Слов", "keywords": "Ключевые слова"}
+
+
+@dataclass
+class PageChange:
+    """Изменения одной страницы (строка ленты changes.jsonl)"""
+    run_id: int
+    prev_run_id: Optional[int]        # None — страница в хранилище впервые
+    site: str
+    name: str
+    url: str
+    changes: Dict[str, Dict]
+
+    @property
+    def is_new(self) -> bool:
+        return self.prev_run_id is None
+
+
+@dataclass
+class RunDiff:
+    """Изменения запуска: сколько страниц проверено и что изменилось"""
+    run_id: int
+    analysis_date: str
+    pages: int
+    changed: List[PageChange]
+
+    @property
+    def new_pages(self) -> int:
+        return sum(1 for change in self.changed if change.is_new)
+
+
+def _added(old: List[str], new: List[str]) -> List[str]:
+    """Элементы new, которых нет в old (в порядке new)"""
+    seen = set(old)
+    return [item for item in new if item not in seen]
+
+
+def field_changes(fields: List[str], old: Dict, new: Dict) -> Dict[str, Dict]:
+    """Описание изменений полей fields; поля, изменившиеся только порядком, пропускаются"""
+    changes = {}
+    for field in fields:
+        before, after = old.get(field), new.get(field)
+        if field in TEXT_FIELDS:
+            changes[field] = {"old": before, "new": after}
+        elif field == "word_count":
+            changes[field] = {"old": before, "new": after, "delta": (after or 0) - (before or 0)}
+        else:
+            before, after = before or [], after or []
+            added, removed = _added(before, after), _added(after, before)
+            if added or removed:
+                changes[field] = {"added": added, "removed": removed}
+    return changes
+
+
+def diff_run(store: ResultsStore, run_id: Optional[int] = None) -> Optional[RunDiff]:
+    """Изменения запуска run_id (по умолчанию последнего) с предыдущими результатами страниц"""
+    if run_id is None:
+        run_id = store.latest_run()
+        if run_id is None:
+            return None
+    run = store.run(run_id)
+    if run is None:
+        return None
+    pages, rows = store.changed_pages(run_id)
+    changed = []
+    for row in rows:
+        if row["prev_run_id"] is None:
+            changes = {}
+        else:
+            changes = field_changes(row["fields"], row["old"], row["new"])
+            if not changes:
+                continue
+        changed.append(PageChange(run_id=run_id, prev_run_id=row["prev_run_id"], site=row["site"],
+                                  name=row["name"], url=row["url"], changes=changes))
+    return RunDiff(run_id=run_id, analysis_date=run["started_at"], pages=pages, changed=changed)
+
+
+def save_feed(diff: RunDiff, filename: str):
+    """Лента изменений: JSON объект PageChange на строку"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for change in diff.changed:
+            f.write(json.dumps(asdict(change), ensure_ascii=False) + "\n")
+
+
+def _quote(value) -> str:
+    return f"«{value}»" if value else "—"
+
+
+def change_lines(change: PageChange) -> List[str]:
+    """Строки Markdown с изменениями страницы"""
+    lines = []
+    for field, detail in change.changes.items():
+        title = FIELD_TITLES[field]
+        if field in TEXT_FIELDS:
+            lines.append(f"{title}: {_quote(detail['old'])} → {_quote(detail['new'])}")
+        elif field == "word_count":
+            lines.append(f"{title}: {detail['old']} → {detail['new']} ({detail['delta']:+d})")
+        elif field in HEADING_FIELDS:
+            lines.extend(f"{title} добавлен: {_quote(heading)}" for heading in detail["added"])
+            lines.extend(f"{title} удален: {_quote(heading)}" for heading in detail["removed"])
+        elif detail["added"] or detail["removed"]:
+            parts = []
+            if detail["added"]:
+                parts.append("новые " + ", ".join(detail["added"]))
+            if detail["removed"]:
+                parts.append("пропали " + ", ".join(detail["removed"]))
+            lines.append(f"{title}: " + "; ".join(parts))
+    return lines
+
+
+def save_summary(diff: RunDiff, filename: str):
+    """Сводка изменений в Markdown, по сайтам"""
+    changed = len(diff.changed) - diff.new_pages
+    lines = [f"# Изменения у конкурентов — запуск {diff.run_id}", "",
+             f"**Дата анализа:** {diff.analysis_date[:19]}  ",
+             f"**Страниц в запуске:** {diff.pages}, изменилось: {changed}, новых: {diff.new_pages}", ""]
+    if not diff.changed:
+        lines.append("Изменений нет.")
+    by_site: Dict[str, List[PageChange]] = {}
+    for change in diff.changed:
+        by_site.setdefault(change.name, []).append(change)
+    for name, changes in sorted(by_site.items()):
+        lines.extend([f"## {name}", ""])
+        new_urls = [change.url for change in changes if change.is_new]
+        if new_urls:
+            lines.append(f"- Новые страницы ({len(new_urls)}): " + ", ".join(new_urls[:10])
+                         + (" …" if len(new_urls) > 10 else ""))
+        for change in changes:
+            if change.is_new:
+                continue
+            lines.append(f"- {change.url}")
+            lines.extend(f"  - {line}" for line in change_lines(change))
+        lines.append("")
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines).rstrip() + "\n")
+
+
+def write_changes(diff: RunDiff, output_dir: str) -> Tuple[str, str]:
+    """changes.jsonl и changes.md в output_dir; пути файлов"""
+    feed_path = os.path.join(output_dir, FEED_NAME)
+    summary_path = os.path.join(output_dir, SUMMARY_NAME)
+    save_feed(diff, feed_path)
+    save_summary(diff, summary_path)
+    return feed_path, summary_path
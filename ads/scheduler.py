@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Вежливый планировщик запросов по хостам.
+
+У каждого хоста свой token bucket (по умолчанию DEFAULT_RATE запросов в
+секунду, Crawl-delay из robots.txt задает 1 запрос за delay секунд) и лимит
+одновременных запросов. Очереди хостов обслуживаются по кругу (round-robin),
+поэтому сайт с тысячей URL не задерживает остальные. Ответы 429/503
+замедляют хост в два раза (с учетом Retry-After), успешные ответы
+постепенно возвращают скорость. Метрики: глубина очереди и время ожидания.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Tuple
+
+DEFAULT_RATE = 4.0           # запросов в секунду на хост
+MAX_SLOWDOWN = 32.0          # максимальное замедление после 429/503
+SLOWDOWN_STATUSES = (429, 503)
+
+
+@dataclass
+class HostState:
+    """Состояние одного хоста: очередь, token bucket, метрики"""
+    rate: float
+    burst: float
+    tokens: float
+    updated_at: float
+    queue: Deque[Tuple[float, Any]] = field(default_factory=deque)
+    in_flight: int = 0
+    slowdown: float = 1.0
+    blocked_until: float = 0.0
+    crawl_delay: Optional[float] = None
+    paused: bool = False
+    # Метрики
+    dispatched: int = 0
+    throttled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    max_queue: int = 0
+
+    def effective_rate(self) -> float:
+        return self.rate / self.slowdown
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.effective_rate())
+        self.updated_at = now
+
+    def ready_in(self, now: float) -> float:
+        """Через сколько секунд хост сможет получить токен"""
+        self.refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 1.0:
+            wait = max(wait, (1.0 - self.tokens) / self.effective_rate())
+        return wait
+
+
+class HostScheduler:
+    """
+    Планировщик с round-robin по хостам.
+
+    Используется движком async_fetch (push / pop_ready / release) и напрямую
+    из потоков через acquire_blocking / release. observe() вызывается после
+    каждого ответа сервера и управляет адаптивным замедлением.
+    """
+
+    def __init__(self, per_host: int = 2, rate: float = DEFAULT_RATE, burst: Optional[float] = None):
+        self.per_host = max(1, per_host)
+        self.rate = rate
+        self.burst = burst if burst is not None else float(self.per_host)
+        self._hosts: Dict[str, HostState] = {}
+        self._rotation: Deque[str] = deque()  # хосты с непустой очередью
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+
+    def _host(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(rate=self.rate, burst=self.burst, tokens=self.burst,
+                              updated_at=time.monotonic())
+            self._hosts[host] = state
+        return state
+
+    def set_crawl_delay(self, host: str, delay: Optional[float]):
+        """Crawl-delay из robots.txt: не чаще одного запроса за delay секунд"""
+        if not delay or delay <= 0:
+            return
+        with self._lock:
+            state = self._host(host)
+            state.crawl_delay = delay
+            state.rate = min(state.rate, 1.0 / delay)
+            state.burst = 1.0
+            state.tokens = min(state.tokens, 1.0)
+
+    def pause(self, host: str):
+        """Временно не выдавать задачи хоста (например, пока грузится robots.txt)"""
+        with self._lock:
+            self._host(host).paused = True
+
+    def resume(self, host: str):
+        with self._lock:
+            self._host(host).paused = False
+            self._slot_freed.notify_all()
+
+    # --- очередь для async_fetch ---
+
+    def push(self, host: str, item: Any):
+        """Добавить задачу в очередь хоста"""
+        with self._lock:
+            state = self._host(host)
+            if not state.queue:
+                self._rotation.append(host)
+            state.queue.append((time.monotonic(), item))
+            state.max_queue = max(state.max_queue, len(state.queue))
+
+    def pending(self) -> int:
+        """Сколько задач ждет в очередях"""
+        with self._lock:
+            return sum(len(self._hosts[host].queue) for host in self._rotation)
+
+    def pop_ready(self) -> Tuple[Optional[Tuple[str, Any]], Optional[float]]:
+        """
+        Следующая задача по кругу среди хостов, которым можно отправить запрос.
+
+        Возвращает ((host, item), None) или (None, сколько секунд подождать);
+        (None, None) — готовых нет, пока не освободится слот или хост не снимут с паузы.
+        """
+        with self._lock:
+            now = time.monotonic()
+            min_wait = None
+            for _ in range(len(self._rotation)):
+                host = self._rotation[0]
+                self._rotation.rotate(-1)
+                state = self._hosts[host]
+                if state.paused or state.in_flight >= self.per_host:
+                    continue
+                wait = state.ready_in(now)
+                if wait > 0:
+                    min_wait = wait if min_wait is None else min(min_wait, wait)
+                    continue
+
+                queued_at, item = state.queue.popleft()
+                if not state.queue:
+                    self._rotation.remove(host)
+                self._take_token(state, now, now - queued_at)
+                return (host, item), None
+            return None, min_wait
+
+    # --- блокирующий режим для потоков ---
+
+    def acquire_blocking(self, host: str, slot: bool = True):
+        """
+        Дождаться слота и токена хоста (для кода без asyncio)
+
+        slot=False — только токен: повтор запроса, слот которого уже занят.
+        """
+        requested_at = time.monotonic()
+        with self._lock:
+            state = self._host(host)
+            while True:
+                now = time.monotonic()
+                if not slot or state.in_flight < self.per_host:
+                    wait = state.ready_in(now)
+                    if wait <= 0:
+                        self._take_token(state, now, now - requested_at, slot)
+                        return
+                else:
+                    wait = None
+                self._slot_freed.wait(timeout=wait)
+
+    def _take_token(self, state: HostState, now: float, waited: float, slot: bool = True):
+        state.tokens -= 1.0
+        if slot:
+            state.in_flight += 1
+        state.dispatched += 1
+        state.total_wait += waited
+        state.max_wait = max(state.max_wait, waited)
+
+    def release(self, host: str):
+        """Запрос к хосту завершен"""
+        with self._lock:
+            state = self._host(host)
+            state.in_flight = max(0, state.in_flight - 1)
+            self._slot_freed.notify_all()
+
+    def observe(self, host: str, status_code: int, retry_after: Optional[str] = None):
+        """Адаптивное замедление: 429/503 замедляют хост, успехи ускоряют обратно"""
+        with self._lock:
+            state = self._host(host)
+            now = time.monotonic()
+            if status_code in SLOWDOWN_STATUSES:
+                state.throttled += 1
+                state.refill(now)
+                state.slowdown = min(MAX_SLOWDOWN, state.slowdown * 2)
+                if retry_after:
+                    try:
+                        state.blocked_until = max(state.blocked_until, now + float(retry_after))
+                    except ValueError:
+                        pass  # Retry-After в виде даты не поддерживаем
+            elif status_code < 400 and state.slowdown > 1.0:
+                state.refill(now)
+                state.slowdown = max(1.0, state.slowdown * 0.9)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Метрики по хостам: очередь, ожидание, замедление"""
+        with self._lock:
+            result = {}
+            for host, state in sorted(self._hosts.items()):
+                result[host] = {
+                    "queue_depth": len(state.queue),
+                    "max_queue_depth": state.max_queue,
+                    "in_flight": state.in_flight,
+                    "dispatched": state.dispatched,
+                    "avg_wait": state.total_wait / state.dispatched if state.dispatched else 0.0,
+                    "max_wait": state.max_wait,
+                    "throttled": state.throttled,
+                    "slowdown": state.slowdown,
+                    "rate": state.effective_rate(),
+                }
+            return result
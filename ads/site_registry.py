@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Реестр отслеживаемых сайтов: sites.json и поиск сайта по URL.
+
+Раньше имя сайта для сравнительного отчета искалось перебором словаря с
+проверкой подстроки в URL: время росло с числом сайтов, а Unicode-форма
+домена (sõiduõppe.ee) не совпадала с punycode (xn--siduppe-10ad.ee).
+
+Теперь сайты описаны в sites.json (slug, короткое имя, полное название,
+URL, дополнительные хосты). Хосты нормализуются (domains.normalize_host:
+регистр, порт, www., punycode) и хранятся в дереве по меткам справа
+налево: ee -> autokooldrive -> ... Поиск проходит по меткам хоста и
+берет самый длинный совпавший суффикс, поэтому m.autokooldrive.ee
+находит autokooldrive.ee, а время зависит только от числа меток, а не
+от числа сайтов.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from .domains import display_host, normalize_host
+
+DEFAULT_REGISTRY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sites.json')
+
+
+@dataclass
+class SiteRecord:
+    """Отслеживаемый сайт"""
+    slug: str                    # префикс файлов отчета: <slug>_report.json
+    name: str                    # короткое имя в сравнительном отчете
+    title: str                   # полное название для заголовков
+    url: str                     # главная страница
+    aliases: List[str] = field(default_factory=list)    # другие хосты сайта
+    ours: bool = False           # наш сайт (остальные — конкуренты)
+
+    @property
+    def host(self) -> str:
+        """Нормализованный хост главной страницы"""
+        return normalize_host(urlsplit(self.url).hostname or '')
+
+    @property
+    def hosts(self) -> List[str]:
+        return [self.host] + [normalize_host(alias) for alias in self.aliases]
+
+
+def host_of(url_or_host: str) -> str:
+    """Нормализованный хост URL или самого хоста ('' если хоста нет)"""
+    value = url_or_host.strip()
+    if '//' in value:
+        try:
+            value = urlsplit(value).hostname or ''
+        except ValueError:
+            return ''
+    else:
+        value = value.split('/', 1)[0]
+    return normalize_host(value) if value else ''
+
+
+class DomainTrie:
+    """
+    Дерево доменов по меткам справа налево.
+
+    Узел — словарь метка -> дочерний узел; значение хранится в узле под
+    ключом None. Поиск возвращает значение самого длинного суффикса хоста.
+    """
+
+    def __init__(self):
+        self._root: Dict = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, host: str, value):
+        node = self._root
+        for label in reversed(host.split('.')):
+            node = node.setdefault(label, {})
+        if None not in node:
+            self._size += 1
+        node[None] = value
+
+    def lookup(self, host: str):
+        """Значение самого длинного совпавшего суффикса (None, если нет)"""
+        node = self._root
+        found = None
+        for label in reversed(host.split('.')):
+            node = node.get(label)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+
+class SiteRegistry:
+    """Сайты из sites.json с поиском по URL или хосту"""
+
+    def __init__(self, sites: List[SiteRecord]):
+        self.sites = sites
+        self.by_slug: Dict[str, SiteRecord] = {}
+        self._trie = DomainTrie()
+        for site in sites:
+            if site.slug in self.by_slug:
+                raise ValueError(f"Повторный slug в реестре сайтов: {site.slug}")
+            self.by_slug[site.slug] = site
+            for host in site.hosts:
+                if host:
+                    self._trie.insert(host, site)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_REGISTRY) -> 'SiteRegistry':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls([SiteRecord(**site) for site in data["sites"]])
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def __iter__(self) -> Iterator[SiteRecord]:
+        return iter(self.sites)
+
+    def resolve(self, url_or_host: str) -> Optional[SiteRecord]:
+        """Сайт, к которому относится URL или хост (поддомены — к своему сайту)"""
+        host = host_of(url_or_host)
+        return self._trie.lookup(host) if host else None
+
+    def site_name(self, url: str) -> str:
+        """Короткое имя сайта; для неизвестных — хост без www. в Unicode"""
+        site = self.resolve(url)
+        if site is not None:
+            return site.name
+        return display_host(host_of(url)) or url
+
+    @property
+    def ours(self) -> Optional[SiteRecord]:
+        return next((site for site in self.sites if site.ours), None)
+
+    @property
+    def competitors(self) -> List[SiteRecord]:
+        return [site for site in self.sites if not site.ours]
+
+
+@lru_cache(maxsize=None)
+def default_registry() -> SiteRegistry:
+    """Реестр из sites.json рядом с модулем (загружается один раз)"""
+    return SiteRegistry.load()
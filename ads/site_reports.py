@@ -1,28 +1,33 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Анализ SEO сайта viktorijaautokool.ee
+Отчеты по одному сайту: вывод в консоль, <slug>_report.json и <slug>_report.md.
+
+Раньше эти функции были скопированы в каждый analyze_<сайт>.py и
+отличались только именем файла и заголовком. Теперь сайты берутся из
+реестра (sites.json), а отчеты пишет общая команда python -m ads analyze.
 """
 
-import importlib.util
-import sys
 import json
+import os
 from datetime import datetime
-import io
 
-# Установка кодировки UTF-8 для Windows
-if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+from .seo_data import SEOData
+from .site_registry import SiteRecord
+
+
+def report_heading(site: SiteRecord) -> str:
+    """Заголовок Markdown отчета: наш сайт или конкурент"""
+    if site.ours:
+        return "SEO Анализ сайта"
+    return f"SEO Анализ сайта конкурента - {site.title}"
+
 
-# Импорт модуля с дефисом в имени
-spec = importlib.util.spec_from_file_location("ads_1", "ads-1.py")
-ads_module = importlib.util.module_from_spec(spec)
-sys.modules["ads_1"] = ads_module
-spec.loader.exec_module(ads_module)
+def report_paths(site: SiteRecord, output_dir: str = "."):
+    """(JSON, Markdown) отчета сайта"""
+    base = os.path.join(output_dir, f"{site.slug}_report")
+    return base + ".json", base + ".md"
 
-SEOAnalyzer = ads_module.SEOAnalyzer
-SEOData = ads_module.SEOData
 
 def print_seo_data(data: SEOData):
     """Красивый вывод SEO данных"""
@@ -59,7 +64,7 @@ def print_seo_data(data: SEOData):
     
     print("\n" + "="*70)
 
-def save_report(data: SEOData, filename: str = "viktorija_report.json"):
+def save_report(data: SEOData, filename: str):
     """Сохранение отчета в JSON"""
     report = {
         "analysis_date": datetime.now().isoformat(),
@@ -84,11 +89,11 @@ def save_report(data: SEOData, filename: str = "viktorija_report.json"):
     
     print(f"\n[ОТЧЕТ] Отчет сохранен в файл: {filename}")
 
-def save_report_md(data: SEOData, filename: str = "viktorija_report.md"):
+def save_report_md(data: SEOData, filename: str, heading: str = "SEO Анализ сайта"):
     """Сохранение отчета в Markdown"""
     analysis_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    md_content = f"""# SEO Анализ сайта
+    md_content = f"""# {heading}
 
 **URL:** {data.url}  
 **Дата анализа:** {analysis_date}
@@ -213,33 +218,3 @@ def save_report_md(data: SEOData, filename: str = "viktorija_report.md"):
         f.write(md_content)
     
     print(f"[ОТЧЕТ] Отчет сохранен в файл: {filename}")
-
-def main():
-    """Основная функция анализа"""
-    url = "https://viktorijaautokool.ee/"
-    
-    print("[СТАРТ] Начинаем анализ сайта viktorijaautokool.ee...")
-    print(f"[URL] {url}\n")
-    
-    # Инициализация анализатора
-    analyzer = SEOAnalyzer()
-    
-    # Анализ главной страницы
-    print("[ЗАГРУЗКА] Загружаем страницу...")
-    data = analyzer.analyze_page(url)
-    
-    if data:
-        # Вывод результатов
-        print_seo_data(data)
-        
-        # Сохранение отчета в JSON и Markdown
-        save_report(data, "viktorija_report.json")
-        save_report_md(data, "viktorija_report.md")
-        
-        print("\n[УСПЕХ] Анализ завершен успешно!")
-    else:
-        print("\n[ОШИБКА] Не удалось проанализировать сайт")
-
-if __name__ == "__main__":
-    main()
-
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Стемминг ключевых слов для эстонского, русского и английского.
+
+Эстонский и русский сильно флективны: "autokool", "autokooli" и
+"autokoolis" считались разными словами и делили между собой частоту.
+Стеммер приводит слово к основе, частоты ключевых слов суммируются по
+основе, а в отчет попадает самая частая форма слова.
+
+Словарь страниц небольшой и постоянно повторяется, поэтому результат
+stem() запоминается в LRU кеше (functools.lru_cache) по паре
+(язык, слово); доля попаданий выводится в статистике.
+
+Реализации выбираются по имени, как HTML парсеры:
+- 'light' (по умолчанию) — эстонский по простым правилам окончаний
+  (Snowball для эстонского не сводит "autokool" и "autokooli" к одной
+  основе), русский и английский — Snowball, если установлен пакет
+  snowballstemmer, иначе без изменений;
+- 'snowball' — Snowball для всех трех языков;
+- 'none' — без стемминга.
+"""
+
+import re
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_CACHE_SIZE = 65536
+CYRILLIC_RE = re.compile('[а-яё]')
+
+# Слова-маркеры для выбора языка латинских слов страницы
+ESTONIAN_MARKERS = frozenset({'ja', 'on', 'ning', 'või', 'kui', 'see', 'oma', 'ka', 'et', 'mis', 'ei',
+                              'meie', 'teie', 'kõik', 'koos', 'ainult', 'juba', 'siis'})
+ENGLISH_MARKERS = frozenset({'the', 'and', 'of', 'to', 'for', 'with', 'is', 'are', 'your', 'our',
+                             'you', 'we', 'in', 'on', 'at', 'from', 'this', 'that'})
+
+# Эстонские падежные окончания и показатели множественного числа (проверяются от длинных к коротким)
+ESTONIAN_SUFFIXES = tuple(sorted((
+    'sse', 'st', 'lt', 'le', 'ks', 'ni', 'na', 'ta', 'ga', 's', 'd', 't', 'id', 'de', 'te',
+    'desse', 'dest', 'dele', 'delt', 'deks', 'deni', 'dena', 'deta', 'dega', 'des',
+    'tesse', 'test', 'tele', 'telt', 'teks', 'teni', 'tena', 'teta', 'tega', 'tes',
+), key=len, reverse=True))
+ESTONIAN_VOWELS = 'aeiu'
+MIN_STEM = 4
+
+
+def estonian_light_stem(word: str) -> str:
+    """
+    Основа эстонского слова: одно падежное окончание и конечная гласная.
+
+    autokool, autokooli, autokoolis, autokoolid -> autokool;
+    kategooria, kategooriat -> kategoori. Чередование ступеней
+    (juhiluba / juhiloa) не учитывается.
+    """
+    for suffix in ESTONIAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            word = word[:-len(suffix)]
+            break
+    if word[-1:] in ESTONIAN_VOWELS and len(word) > MIN_STEM:
+        word = word[:-1]
+    return word
+
+
+class LatinLanguageDetector:
+    """Язык латинских слов страницы по словам-маркерам (эстонский или английский)"""
+
+    def __init__(self):
+        self.estonian = 0
+        self.english = 0
+
+    def feed(self, words: List[str]):
+        self.estonian += sum(map(ESTONIAN_MARKERS.__contains__, words))
+        self.english += sum(map(ENGLISH_MARKERS.__contains__, words))
+
+    @property
+    def language(self) -> str:
+        return 'english' if self.english > self.estonian else 'estonian'
+
+
+class Stemmer:
+    """Базовый класс: слово в нижнем регистре -> основа"""
+    name = ""
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self._cached = lru_cache(maxsize=cache_size)(self._stem)
+
+    def stem(self, word: str, latin: str = 'estonian') -> str:
+        """Основа слова; latin — язык латинских слов ('estonian' или 'english')"""
+        return self._cached('russian' if CYRILLIC_RE.search(word) else latin, word)
+
+    def for_language(self, latin: str) -> Callable[[str], str]:
+        """stem() с фиксированным языком латинских слов страницы"""
+        cached = self._cached
+        search = CYRILLIC_RE.search
+        return lambda word: cached('russian' if search(word) else latin, word)
+
+    def _stem(self, language: str, word: str) -> str:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, float]:
+        """Попадания в кеш основ"""
+        info = self._cached.cache_info()
+        calls = info.hits + info.misses
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize,
+                "hit_ratio": info.hits / calls if calls else 0.0}
+
+
+class NoStemmer(Stemmer):
+    """Без стемминга"""
+    name = "none"
+
+    def stem(self, word: str, latin: str = 'estonian') -> str:
+        return word
+
+    def for_language(self, latin: str) -> Callable[[str], str]:
+        return lambda word: word
+
+    def _stem(self, language: str, word: str) -> str:
+        return word
+
+
+class LightStemmer(Stemmer):
+    """Эстонский — правила окончаний, русский и английский — Snowball (если установлен)"""
+    name = "light"
+    snowball_languages = ('russian', 'english')
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(cache_size)
+        self._snowball = {}
+        try:
+            import snowballstemmer
+        except ImportError:
+            pass
+        else:
+            self._snowball = {language: snowballstemmer.stemmer(language)
+                              for language in self.snowball_languages}
+        # Объекты Snowball хранят состояние разбора — не вызываем их параллельно
+        self._lock = threading.Lock()
+
+    def _stem(self, language: str, word: str) -> str:
+        stemmer = self._snowball.get(language)
+        if stemmer is not None:
+            with self._lock:
+                return stemmer.stemWord(word)
+        if language == 'estonian':
+            return estonian_light_stem(word)
+        return word
+
+
+class SnowballStemmer(LightStemmer):
+    """Snowball для всех трех языков"""
+    name = "snowball"
+    snowball_languages = ('estonian', 'russian', 'english')
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            import snowballstemmer  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+
+STEMMERS = {
+    LightStemmer.name: LightStemmer,
+    SnowballStemmer.name: SnowballStemmer,
+    NoStemmer.name: NoStemmer,
+}
+
+
+def get_stemmer(name: str = 'auto', cache_size: int = DEFAULT_CACHE_SIZE) -> Stemmer:
+    """Стеммер по имени; 'auto' — 'light'"""
+    if name == 'auto':
+        name = LightStemmer.name
+    stemmer_class = STEMMERS.get(name)
+    if stemmer_class is None:
+        raise ValueError(f"Неизвестный стеммер: {name} (доступны: {', '.join(STEMMERS)})")
+    if not stemmer_class.available():
+        print(f"[СТЕММИНГ] {name} не установлен, используем {LightStemmer.name}")
+        stemmer_class = LightStemmer
+    return stemmer_class(cache_size)
+
+
+def latin_language(words: List[str]) -> str:
+    """Язык латинских слов текста"""
+    detector = LatinLanguageDetector()
+    detector.feed(words)
+    return detector.language
+
+
+def stem_function(stemmer: Optional[Stemmer], latin: str) -> Optional[Callable[[str], str]]:
+    """Функция слово -> основа для текста с латиницей на языке latin (None — без стемминга)"""
+    if stemmer is None or isinstance(stemmer, NoStemmer):
+        return None
+    return stemmer.for_language(latin)
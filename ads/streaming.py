@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Потоковый анализ страницы без построения дерева.
+
+Все поля SEOData вычисляются из событий начала тега, конца тега и текста,
+поэтому для больших страниц дерево не нужно. StreamingExtractor — это
+html.parser.HTMLParser, который получает тело ответа кусками по мере
+загрузки и сразу передает события в PageBuilder; текст страницы не
+накапливается, а по частям токенизируется в TextStats (число слов,
+частоты ключевых слов и фраз). Память зависит от размера словаря страницы и самого
+длинного текстового узла без тегов, а не от размера страницы, разбор
+идет одновременно с загрузкой.
+
+Вложенность тегов восстанавливается так же, как в BeautifulSoup с
+html.parser (закрывающий тег закрывает ближайший открытый с тем же
+именем, пустые элементы закрываются сразу), поэтому результат совпадает
+с анализом через дерево. Проверка и замер памяти: check_streaming.py.
+"""
+
+import codecs
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+from .extraction import ASCII_SPACES, ExtractedPage, NON_TEXT_TAGS, PageBuilder
+from .keyphrases import DEFAULT_TOP_PHRASES, PhraseCounter, Vocabulary
+from .near_duplicates import MinHash
+from .stemming import LatinLanguageDetector, Stemmer, stem_function
+from .text_tokens import DEFAULT_TOP_N, TokenStream, top_keywords
+
+# Элементы без содержимого: BeautifulSoup закрывает их сразу после открытия
+VOID_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
+DEFAULT_ENCODING = 'utf-8'
+SNIFF_BYTES = 1024
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+
+NON_SPACE_RE = re.compile(r'\S*')
+
+
+class TextStats:
+    """
+    Счетчики текста страницы, получаемого по частям.
+
+    Каждая часть токенизируется один раз (TokenStream). Слово может
+    оказаться разрезанным между частями, поэтому незаконченный хвост
+    (после последнего пробельного символа) переносится в следующую часть.
+    По пробельному символу разрезать безопасно: ни слова, ни границы \\b
+    ключевых терминов через него не проходят.
+
+    Точка разреза ищется только в новой части, хвост заново не
+    просматривается: иначе текст из тысяч соседних элементов без пробелов
+    (<span>ab</span><span>cd</span>...) обрабатывается за квадратичное
+    время. Хвост длиннее MAX_TAIL (base64, минифицированные данные)
+    считается отдельной частью, не дожидаясь пробела.
+    """
+
+    MAX_TAIL = 64 * 1024
+
+    def __init__(self, vocabulary: Vocabulary, stemmer: Optional[Stemmer] = None):
+        self.word_count = 0
+        self.keyword_counts: Counter = Counter()
+        self.phrases = PhraseCounter(vocabulary)
+        self.stemmer = stemmer
+        self.language = LatinLanguageDetector()
+        self.fingerprint = MinHash()
+        self._tail: List[str] = []
+        self._tail_size = 0
+        self._offset = 0
+
+    def feed(self, data: str):
+        if not data:
+            return
+        # Длина незаконченного слова в конце части: \S* в начале перевернутой строки
+        cut = len(data) - NON_SPACE_RE.match(data[::-1]).end()
+        if not cut:
+            self._tail.append(data)
+            self._tail_size += len(data)
+            if self._tail_size > self.MAX_TAIL:
+                self.finish()
+            return
+        self._tail.append(data[:cut])
+        self.finish()
+        if cut < len(data):
+            self._tail.append(data[cut:])
+            self._tail_size = len(data) - cut
+
+    def finish(self):
+        if self._tail:
+            text = "".join(self._tail)
+            self._tail = []
+            self._tail_size = 0
+            self._count(TokenStream(text, self._offset))
+            self._offset += len(text)
+
+    def _count(self, tokens: TokenStream):
+        self.word_count += tokens.word_count
+        self.keyword_counts.update(tokens.terms)
+        self.phrases.feed(tokens)
+        self.language.feed(tokens.words)
+        self.fingerprint.feed(tokens.words)
+
+    def keywords(self, top_n: int = DEFAULT_TOP_N) -> List[str]:
+        """Самые частые ключевые слова (порядок как у top_keywords для всего текста)"""
+        return top_keywords(self.keyword_counts, top_n, stem_function(self.stemmer, self.language.language))
+
+    def keyphrases(self, top_n: int = DEFAULT_TOP_PHRASES) -> List[str]:
+        """Самые частые фразы (счетчики ограничены, см. keyphrases.SpaceSaving)"""
+        return self.phrases.top(top_n)
+
+
+class StreamingExtractor(HTMLParser):
+    """
+    HTMLParser, передающий события в PageBuilder.
+
+        extractor = StreamingExtractor(url, text_sink=stats.feed)
+        for piece in decoded_chunks:
+            extractor.feed(piece)
+        page = extractor.finish()
+    """
+
+    def __init__(self, url: str, text_sink: Optional[Callable[[str], None]] = None):
+        # Ссылки на символы разбираем сами, как BeautifulSoup
+        super().__init__(convert_charrefs=False)
+        self.builder = PageBuilder(url, text_sink)
+        self._open: List[str] = []      # стек открытых тегов
+        self._skip = 0                  # сколько открыто script/style/...
+        self._pending: List[str] = []   # начало текстового узла, пока в нем только пробелы
+        self._pending_blank = True      # в текущем текстовом узле еще не было непробельных символов
+
+    def finish(self) -> ExtractedPage:
+        """Конец документа: закрываем незакрытые теги"""
+        self.close()
+        self._flush()
+        for _ in range(len(self._open)):
+            self.builder.end()
+        self._open.clear()
+        return self.builder.finish()
+
+    # --- текст ---
+
+    def handle_data(self, data: str):
+        if self._skip or not data:
+            return
+        if not self._pending_blank:
+            self.builder.text_part(data)
+        elif data.strip(ASCII_SPACES):
+            # Узел не пробельный: отдаем накопленное начало и дальше пишем сразу
+            self._pending_blank = False
+            self._pending.append(data)
+            self.builder.text_part("".join(self._pending))
+            self._pending.clear()
+        else:
+            self._pending.append(data)
+
+    def _flush(self):
+        """Конец текстового узла (HTMLParser может разрезать узел на части)"""
+        if self._pending:
+            self.builder.text("".join(self._pending))
+            self._pending.clear()
+        self._pending_blank = True
+
+    def handle_charref(self, name: str):
+        if name[0] in 'xX':
+            code = int(name[1:], 16)
+        else:
+            code = int(name)
+        self.handle_data(UnicodeDammit.numeric_character_reference(code)[0])
+
+    def handle_entityref(self, name: str):
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f"&{name}")
+
+    # --- теги ---
+
+    def handle_starttag(self, tag: str, attrs):
+        self._flush()
+        self.builder.start(tag, {key: ('' if value is None else value) for key, value in attrs})
+        if tag in VOID_TAGS:
+            self.builder.end()
+            return
+        self._open.append(tag)
+        if tag in NON_TEXT_TAGS:
+            self._skip += 1
+
+    def handle_startendtag(self, tag: str, attrs):
+        self._flush()
+        self.builder.start(tag, {key: ('' if value is None else value) for key, value in attrs})
+        self.builder.end()
+
+    def handle_endtag(self, tag: str):
+        self._flush()
+        if tag not in self._open:
+            return  # лишний закрывающий тег (в т.ч. </br> после <br>)
+        while True:
+            name = self._open.pop()
+            self.builder.end()
+            if name in NON_TEXT_TAGS:
+                self._skip -= 1
+            if name == tag:
+                break
+
+    # --- комментарии, doctype, CDATA ---
+
+    def handle_comment(self, data: str):
+        self._flush()
+
+    def handle_decl(self, decl: str):
+        self._flush()
+
+    def handle_pi(self, data: str):
+        self._flush()
+
+    def unknown_decl(self, data: str):
+        self._flush()
+        if data.upper().startswith('CDATA[') and not self._skip:
+            self.builder.text(data[len('CDATA['):])
+
+
+def sniff_encoding(head: bytes) -> str:
+    """Кодировка по BOM или <meta charset> в начале документа (иначе utf-8)"""
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    match = META_CHARSET_RE.search(head[:SNIFF_BYTES])
+    if match:
+        name = match.group(1).decode('ascii', 'ignore')
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            pass
+    return DEFAULT_ENCODING
+
+
+def iter_decoded(chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[str]:
+    """Декодирование потока байтов по мере поступления"""
+    decoder = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if decoder is None:
+            try:
+                codecs.lookup(encoding or '')
+            except LookupError:
+                encoding = sniff_encoding(chunk)
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    if decoder is not None:
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+
+def extract_stream(pieces: Iterable[str], url: str,
+                   text_sink: Optional[Callable[[str], None]] = None) -> Optional[ExtractedPage]:
+    """Поля страницы из потока текста; None — если документ пустой"""
+    extractor = StreamingExtractor(url, text_sink)
+    received = False
+    for piece in pieces:
+        received = True
+        extractor.feed(piece)
+    if not received:
+        return None
+    return extractor.finish()
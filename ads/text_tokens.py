@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Общая токенизация текста страницы.
+
+Раньше текст разбирался дважды: text.split() для word_count, затем
+extract_keywords снова приводил весь текст к нижнему регистру, искал
+слова некомпилированным выражением и каждый раз заново строил множество
+стоп-слов. Теперь TokenStream приводит текст к нижнему регистру один раз
+и отдает все, что нужно метрикам: слова (для word_count), токены со
+смещениями, ключевые термины без стоп-слов. Списки вычисляются по
+первому обращению и переиспользуются; новые текстовые метрики должны
+брать данные из TokenStream, а не разбирать текст сами.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Стоп-слова (русский, английский, эстонский)
+STOP_WORDS = frozenset({
+    'и', 'в', 'на', 'с', 'по', 'для', 'не', 'от', 'за', 'к', 'о',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'ja', 'see', 'et', 'mis', 'kui', 'ka', 'või', 'veel', 'oli',
+})
+
+# Слово — все между пробельными символами (как str.split())
+WORD_RE = re.compile(r'\S+')
+# Ключевой термин: латиница с эстонскими символами (õ, ä, ö, ü) или кириллица, от 3 букв
+TERM_RE = re.compile(r'\b[a-zа-яёõäöü]{3,}\b')
+# Части слова для фраз: слово с буквы ('b', 'a1', 'b-kategooria') или граница —
+# число, знак препинания ('nõmme:' -> 'nõmme' и граница)
+PHRASE_PART_RE = re.compile(r"([^\W\d_][^\W_]*(?:['’-][^\W_]+)*)|[^\W_]+|[^\w\s]|_")
+PHRASE_BOUNDARY = ''
+
+DEFAULT_TOP_N = 20
+
+
+class Token(NamedTuple):
+    """Токен: смещения в исходном тексте и нормализованная форма"""
+    start: int
+    end: int
+    norm: str
+
+
+class TokenStream:
+    """
+    Результат токенизации одного текста.
+
+    offset добавляется ко всем смещениям (текст страницы может поступать
+    частями, см. streaming.TextStats).
+    """
+
+    __slots__ = ('text', 'norm', 'offset', '_words', '_terms')
+
+    def __init__(self, text: str, offset: int = 0):
+        self.text = text
+        self.norm = text.lower()
+        self.offset = offset
+        self._words: Optional[List[str]] = None
+        self._terms: Optional[List[str]] = None
+
+    @property
+    def words(self) -> List[str]:
+        """Нормализованные слова по пробельным символам"""
+        if self._words is None:
+            self._words = self.norm.split()
+        return self._words
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def terms(self) -> List[str]:
+        """Ключевые термины без стоп-слов, в порядке появления"""
+        if self._terms is None:
+            self._terms = [term for term in TERM_RE.findall(self.norm) if term not in STOP_WORDS]
+        return self._terms
+
+    def tokens(self) -> Iterator[Token]:
+        """Слова со смещениями"""
+        offset = self.offset
+        if len(self.norm) == len(self.text):
+            for match in WORD_RE.finditer(self.norm):
+                yield Token(match.start() + offset, match.end() + offset, match.group())
+        else:
+            # lower() изменил длину (например, 'İ'): смещения берем по исходному тексту
+            for match in WORD_RE.finditer(self.text):
+                yield Token(match.start() + offset, match.end() + offset, match.group().lower())
+
+    def phrase_words(self) -> Iterator[str]:
+        """
+        Слова токенов для фраз (keyphrases.py) и границы фраз PHRASE_BOUNDARY:
+        числа и знаки препинания внутри токена, перевод строки между токенами.
+        """
+        # Без переводов строк — те же слова, что self.words (список уже посчитан для word_count)
+        lines = [line.split() for line in self.norm.split('\n')] if '\n' in self.norm else [self.words]
+        for index, words in enumerate(lines):
+            if index:
+                yield PHRASE_BOUNDARY
+            for word in words:
+                if word.isalpha():
+                    yield word
+                else:
+                    yield from PHRASE_PART_RE.findall(word)
+
+    def term_tokens(self) -> Iterator[Token]:
+        """Ключевые термины со смещениями (стоп-слова пропускаются)"""
+        offset = self.offset
+        if len(self.norm) == len(self.text):
+            for match in TERM_RE.finditer(self.norm):
+                term = match.group()
+                if term not in STOP_WORDS:
+                    yield Token(match.start() + offset, match.end() + offset, term)
+        else:
+            for token in self.tokens():
+                for match in TERM_RE.finditer(token.norm):
+                    term = match.group()
+                    if term not in STOP_WORDS:
+                        yield Token(token.start, token.end, term)
+
+
+def top_keywords(terms: Iterable[str], top_n: int = DEFAULT_TOP_N,
+                 stem: Optional[Callable[[str], str]] = None) -> List[str]:
+    """
+    Самые частые термины (при равенстве — в порядке первого появления).
+
+    С stem частоты суммируются по основе слова, а возвращается самая
+    частая форма каждой основы (см. stemming.py).
+    """
+    counts = terms if isinstance(terms, Counter) else Counter(terms)
+    if stem is None:
+        return [term for term, _ in counts.most_common(top_n)]
+
+    totals: Dict[str, int] = {}
+    forms: Dict[str, Tuple[str, int]] = {}
+    for term, count in counts.items():
+        key = stem(term)
+        totals[key] = totals.get(key, 0) + count
+        form = forms.get(key)
+        if form is None or count > form[1]:
+            forms[key] = (term, count)
+    ranked = sorted(totals.items(), key=lambda item: -item[1])[:top_n]
+    return [forms[key][0] for key, _ in ranked]
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TF-IDF по всем страницам конкурентов и разрыв по ключевым словам (keyword gap).
+
+_find_common_keywords считает только, у скольких сайтов слово попало в
+top-20. Здесь каждая проанализированная страница — строка разреженной
+матрицы документ x термин (scipy.sparse CSR), все вычисления — операции
+над матрицей целиком, без циклов Python по Counter:
+
+- TF-IDF: сублинейный tf (1 + log tf), сглаженный idf, L2 нормировка строк;
+- вес термина на сайте — средний TF-IDF по страницам сайта (умножение на
+  разреженную матрицу сайт x документ);
+- разрыв (gap) — средний вес у конкурентов минус вес у нашего сайта;
+  положительный разрыв — темы, которые конкуренты раскрывают, а мы нет.
+
+Работает на десятках тысяч страниц: память — O(ненулевых элементов).
+Запуск по кешу ответов: keyword_gap.py.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+DEFAULT_MIN_SITES = 2    # термин должен встречаться хотя бы у стольких конкурентов
+DEFAULT_TOP_TERMS = 30
+
+
+class DocumentTermMatrix:
+    """
+    Накопление страниц в разреженную матрицу документ x термин.
+
+    Термины получают целые ID в порядке появления; для каждой страницы
+    хранятся только отсортированные ID ее терминов и их частоты.
+    """
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.sites: Dict[str, int] = {}
+        self.urls: List[str] = []
+        self._doc_sites: List[int] = []
+        self._indptr: List[int] = [0]
+        self._indices: List[np.ndarray] = []
+        self._counts: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def add(self, site: str, url: str, terms: Iterable[str]):
+        """Страница сайта site и ее термины (с повторами)"""
+        vocabulary = self.vocabulary
+        ids = np.fromiter((vocabulary.setdefault(term, len(vocabulary)) for term in terms), dtype=np.int32)
+        indices, counts = np.unique(ids, return_counts=True)
+        self._indices.append(indices)
+        self._counts.append(counts.astype(np.int32))
+        self._indptr.append(self._indptr[-1] + len(indices))
+        self._doc_sites.append(self.sites.setdefault(site, len(self.sites)))
+        self.urls.append(url)
+
+    @property
+    def terms(self) -> List[str]:
+        """Термины по ID"""
+        return list(self.vocabulary)
+
+    @property
+    def site_names(self) -> List[str]:
+        return list(self.sites)
+
+    @property
+    def doc_sites(self) -> np.ndarray:
+        return np.asarray(self._doc_sites, dtype=np.int32)
+
+    def counts(self) -> sparse.csr_matrix:
+        """Матрица частот (документы x термины)"""
+        indices = np.concatenate(self._indices) if self._indices else np.zeros(0, dtype=np.int32)
+        data = np.concatenate(self._counts) if self._counts else np.zeros(0, dtype=np.int32)
+        indptr = np.asarray(self._indptr, dtype=np.int64)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(self.urls), len(self.vocabulary)))
+
+
+def tfidf(counts: sparse.csr_matrix) -> sparse.csr_matrix:
+    """TF-IDF: (1 + log tf) * (log((1 + N) / (1 + df)) + 1), строки нормированы по L2"""
+    n_docs = counts.shape[0]
+    weights = counts.astype(np.float64)
+    weights.data = 1.0 + np.log(weights.data)
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    weights = weights @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ weights
+
+
+def site_weights(weights: sparse.csr_matrix, doc_sites: np.ndarray, n_sites: int) -> sparse.csr_matrix:
+    """Средний вес термина по страницам каждого сайта (сайты x термины)"""
+    n_docs = weights.shape[0]
+    membership = sparse.csr_matrix((np.ones(n_docs), (doc_sites, np.arange(n_docs))),
+                                   shape=(n_sites, n_docs))
+    pages = np.bincount(doc_sites, minlength=n_sites).astype(np.float64)
+    pages[pages == 0] = 1.0
+    return (sparse.diags(1.0 / pages) @ (membership @ weights)).tocsr()
+
+
+def keyword_gap(matrix: DocumentTermMatrix, target: str, top_n: int = DEFAULT_TOP_TERMS,
+                min_sites: int = DEFAULT_MIN_SITES) -> Dict[str, List[Dict]]:
+    """
+    Разрыв по терминам между сайтом target и конкурентами.
+
+    Возвращает {"gaps": [...], "strengths": [...]}: термины, где средний вес
+    у конкурентов больше всего превышает наш, и наоборот. Учитываются только
+    термины, которые есть хотя бы у min_sites конкурентов (названия брендов
+    отдельных сайтов отсекаются).
+    """
+    if target not in matrix.sites:
+        raise ValueError(f"Сайт {target} не найден среди страниц (есть: {', '.join(matrix.site_names)})")
+    per_site = site_weights(tfidf(matrix.counts()), matrix.doc_sites, len(matrix.sites))
+    target_id = matrix.sites[target]
+    competitor_ids = np.array([i for i in range(per_site.shape[0]) if i != target_id], dtype=np.int64)
+    if not len(competitor_ids):
+        raise ValueError("Нет страниц конкурентов")
+
+    competitors = per_site[competitor_ids]
+    ours = per_site[target_id].toarray().ravel()
+    mean = np.asarray(competitors.mean(axis=0)).ravel()
+    mean_sq = np.asarray(competitors.multiply(competitors).mean(axis=0)).ravel()
+    std = np.sqrt(np.maximum(mean_sq - mean ** 2, 0.0))
+    coverage = np.diff(competitors.tocsc().indptr)   # у скольких конкурентов термин есть
+    gap = mean - ours
+
+    eligible = coverage >= min_sites
+    terms = matrix.terms
+    n_competitors = len(competitor_ids)
+
+    def rows(order: np.ndarray) -> List[Dict]:
+        column = competitors[:, order].toarray() if len(order) else np.zeros((n_competitors, 0))
+        result = []
+        for position, term_id in enumerate(order):
+            result.append({
+                "term": terms[term_id],
+                "target_weight": round(float(ours[term_id]), 6),
+                "competitor_mean": round(float(mean[term_id]), 6),
+                "competitor_max": round(float(column[:, position].max()), 6),
+                "competitor_std": round(float(std[term_id]), 6),
+                "competitor_sites": int(coverage[term_id]),
+                "competitors_above_target": int((column[:, position] > ours[term_id]).sum()),
+                "gap": round(float(gap[term_id]), 6),
+            })
+        return result
+
+    return {
+        "target": target,
+        "pages": len(matrix),
+        "terms": len(terms),
+        "competitors": n_competitors,
+        "gaps": rows(_top(np.where(eligible, gap, -np.inf), top_n)),
+        "strengths": rows(_top(np.where(eligible, -gap, -np.inf), top_n)),
+    }
+
+
+def _top(values: np.ndarray, n: int) -> np.ndarray:
+    """Индексы n наибольших конечных значений по убыванию (без полной сортировки)"""
+    finite = np.flatnonzero(np.isfinite(values) & (values > 0))
+    if len(finite) > n:
+        finite = finite[np.argpartition(-values[finite], n - 1)[:n]]
+    return finite[np.argsort(-values[finite], kind='stable')]
+
+
+def find_site(sites: Iterable[str], hint: str) -> Optional[str]:
+    """Сайт, в имени которого есть hint (например, 'viktorija')"""
+    for site in sites:
+        if hint in site:
+            return site
+    return None
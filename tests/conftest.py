@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Общие фикстуры тестов пакета ads.
+
+Запуск из корня репозитория:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import Dict, List
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class FakeSession:
+    """session.stream(url) из словаря url -> тело; тело отдается кусками по chunk_size байт"""
+
+    def __init__(self, bodies: Dict[str, bytes], chunk_size: int = 4096):
+        self.bodies = bodies
+        self.chunk_size = chunk_size
+        self.requested: List[str] = []
+        self.bytes_read = 0
+
+    @contextmanager
+    def stream(self, url: str, timeout=None):
+        self.requested.append(url)
+        if url not in self.bodies:
+            raise ConnectionError(f"HTTP 404: {url}")
+        yield self._chunks(self.bodies[url])
+
+    def _chunks(self, body: bytes):
+        for start in range(0, len(body), self.chunk_size):
+            chunk = body[start:start + self.chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+
+@pytest.fixture
+def fake_session():
+    """Фабрика FakeSession(bodies, chunk_size)"""
+    return FakeSession
+
+
+@pytest.fixture
+def results_store(tmp_path):
+    """Пустое ResultsStore во временной папке; сайты без реестра (ключ — хост)"""
+    from ads.results_store import ResultsStore
+    from ads.site_registry import SiteRegistry
+
+    store = ResultsStore(str(tmp_path / "results"), registry=SiteRegistry([]))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def page_record():
+    """Фабрика asdict(SEOData) страницы: page_record(url, **поля)"""
+    def make(url: str, **fields) -> Dict:
+        data = {
+            "url": url, "title": "Autokool", "meta_description": "B kategooria kursused",
+            "h1_tags": ["Autokool"], "h2_tags": ["Hinnad", "Kontakt"], "keywords": ["autokool", "kategooria"],
+            "keyphrases": ["b kategooria"], "word_count": 500, "internal_links": 10, "external_links": 2,
+            "images_count": 3, "images_with_alt": 1,
+        }
+        data.update(fields)
+        return data
+    return make
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Память результатов анализа (ads/analysis_memo.py)"""
+
+import sqlite3
+
+import pytest
+
+from ads.analysis_memo import AnalysisMemo, content_hash
+
+ANALYSIS = {"title": "Autokool", "keywords": ["autokool"] * 20}
+
+
+@pytest.fixture
+def memo(tmp_path):
+    memo = AnalysisMemo(str(tmp_path), analyzer_version=1, parser="html.parser")
+    yield memo
+    memo.close()
+
+
+def accessed_at(memo: AnalysisMemo) -> dict:
+    with sqlite3.connect(memo.path) as conn:
+        return dict(conn.execute("SELECT body_hash, accessed_at FROM analyses"))
+
+
+def test_get_does_not_write(memo):
+    memo.put("a", ANALYSIS)
+    changes = memo._conn.total_changes
+    assert memo.get("a") == ANALYSIS
+    assert memo.get("b") is None
+    assert memo._conn.total_changes == changes
+    assert (memo.hits, memo.misses) == (1, 1)
+
+
+def test_access_times_written_at_close(tmp_path):
+    memo = AnalysisMemo(str(tmp_path))
+    memo.put("a", ANALYSIS)
+    stored = accessed_at(memo)["a"]
+    memo.get("a")
+    assert accessed_at(memo)["a"] == stored
+    memo.close()
+    assert accessed_at(memo)["a"] > stored
+
+
+def test_eviction_uses_pending_access_times(memo):
+    """Прочитанная запись не вытесняется, хотя в базе ее время обращения старое"""
+    for key in "abc":
+        memo.put(key, ANALYSIS)
+    memo.get("a")
+    memo.max_bytes = memo._bytes
+    memo.put("d", ANALYSIS)
+    assert [memo.get(key) is not None for key in "abcd"] == [True, False, True, True]
+    assert memo.evicted == 1
+
+
+def test_content_hash_depends_on_url():
+    assert content_hash("https://a.ee/", "<p>x</p>") != content_hash("https://b.ee/", "<p>x</p>")
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""robots.txt и sitemap (ads/discovery.py)"""
+
+import gzip
+from typing import Dict, List
+
+import pytest
+
+from ads.discovery import RobotsRules, discover_urls, iter_sitemap_urls
+
+SITE = "https://site.ee"
+
+ROBOTS = """
+User-agent: *
+Disallow: /private
+Allow: /private/public
+Disallow: /*.pdf$
+Disallow: /search?
+Allow: /page
+Disallow: /page
+Disallow: /tmp*/cache
+Crawl-delay: 2
+
+User-agent: OtherBot
+Disallow: /
+
+Sitemap: https://site.ee/sitemap_index.xml.gz
+"""
+
+ROOT_ONLY = """
+User-agent: *
+Disallow: /
+Allow: /$
+"""
+
+
+@pytest.mark.parametrize("agent, path, allowed", [
+    ("*", "/", True),
+    ("*", "/private", False),
+    ("*", "/private/data", False),
+    ("*", "/private/public", True),            # Allow длиннее Disallow
+    ("*", "/private/public/x", True),
+    ("*", "/privateer", False),                # правило — префикс пути
+    ("*", "/doc.pdf", False),
+    ("*", "/dir/doc.pdf", False),
+    ("*", "/doc.pdf?download=1", True),        # $ — конец URL вместе с запросом
+    ("*", "/doc.pdfx", True),
+    ("*", "/search", True),
+    ("*", "/search?q=auto", False),
+    ("*", "/page", True),                      # равная длина: Allow важнее
+    ("*", "/tmp/cache", False),
+    ("*", "/tmp123/a/cache", False),
+    ("*", "/tmp/cach", True),
+    ("OtherBot/2.1", "/", False),              # своя группа вместо '*'
+    ("OtherBot/2.1", "/private/public", False),
+])
+def test_robots_rule_precedence(agent, path, allowed):
+    assert RobotsRules.parse(ROBOTS, agent).can_fetch(SITE + path) is allowed
+
+
+@pytest.mark.parametrize("path, allowed", [("/", True), ("/index.html", False), ("/?utm=1", False)])
+def test_robots_end_anchor(path, allowed):
+    assert RobotsRules.parse(ROOT_ONLY).can_fetch(SITE + path) is allowed
+
+
+def test_robots_crawl_delay_and_sitemaps():
+    rules = RobotsRules.parse(ROBOTS)
+    assert rules.crawl_delay == 2.0
+    assert rules.sitemaps == [f"{SITE}/sitemap_index.xml.gz"]
+
+
+def urlset(urls: List[str]) -> bytes:
+    items = "".join(f"<url><loc>{url}</loc></url>" for url in urls)
+    return ("<?xml version='1.0' encoding='UTF-8'?>"
+            f"<urlset xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>{items}</urlset>").encode()
+
+
+def sitemap_index(urls: List[str]) -> bytes:
+    items = "".join(f"<sitemap><loc>{url}</loc></sitemap>" for url in urls)
+    return ("<?xml version='1.0' encoding='UTF-8'?>"
+            f"<sitemapindex xmlns='http://www.sitemaps.org/schemas/sitemap/0.9'>{items}</sitemapindex>").encode()
+
+
+def pages(prefix: str, count: int) -> List[str]:
+    return [f"{SITE}/{prefix}/{i}" for i in range(count)]
+
+
+@pytest.fixture
+def sitemap_site() -> Dict[str, bytes]:
+    """Сайт: gzip index -> (gzip sitemap, обычный sitemap, вложенный index, повтор, сам index)"""
+    truncated = gzip.compress(urlset(pages("old", 300)))
+    return {
+        f"{SITE}/sitemap_index.xml.gz": gzip.compress(sitemap_index([
+            f"{SITE}/sitemap_cars.xml.gz",
+            f"{SITE}/sitemap_pages.xml",
+            f"{SITE}/nested_index.xml",
+            f"{SITE}/sitemap_pages.xml",           # повтор
+            f"{SITE}/sitemap_index.xml.gz",        # цикл
+        ])),
+        # 5000 URL: распакованный текст больше FEED_SIZE, gzip распаковывается порциями
+        f"{SITE}/sitemap_cars.xml.gz": gzip.compress(urlset(pages("cars", 5000))),
+        f"{SITE}/sitemap_pages.xml": urlset(pages("pages", 3) + [f"{SITE}/private/x", f"{SITE}/pages/0"]),
+        f"{SITE}/nested_index.xml": sitemap_index([f"{SITE}/sitemap_old.xml.gz", f"{SITE}/missing.xml"]),
+        f"{SITE}/sitemap_old.xml.gz": truncated[:len(truncated) // 2],
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_sitemap_index_recursion(fake_session, sitemap_site, chunk_size):
+    """Результат не зависит от того, как тело разрезано на куски (gzip и XML режутся где угодно)"""
+    errors = []
+    session = fake_session(sitemap_site, chunk_size)
+    urls = list(iter_sitemap_urls(session, f"{SITE}/sitemap_index.xml.gz",
+                                  on_error=lambda url, error, read: errors.append((url, read))))
+    old = [url for url in urls if "/old/" in url]
+    assert [url for url in urls if "/old/" not in url] == (
+        pages("cars", 5000) + pages("pages", 3) + [f"{SITE}/private/x", f"{SITE}/pages/0"])
+    # Повторные и циклические ссылки читаются один раз
+    assert sorted(set(session.requested)) == sorted(session.requested)
+    # Оборванный gzip: ошибка с числом прочитанных URL, они отданы; отсутствующий sitemap — ошибка
+    assert errors == [(f"{SITE}/sitemap_old.xml.gz", len(old)), (f"{SITE}/missing.xml", 0)]
+    assert 0 < len(old) < 300
+    assert old == pages("old", len(old))
+
+
+def test_discover_urls_filters_robots_and_repeats(fake_session, sitemap_site):
+    robots = RobotsRules.parse(ROBOTS)
+    discovered = list(discover_urls(fake_session(sitemap_site), SITE, robots=robots, on_error=lambda *args: None))
+    assert [url for url in discovered if "/old/" not in url] == pages("cars", 5000) + pages("pages", 3)
+
+
+def test_discover_urls_stops_reading_at_max_urls(fake_session, sitemap_site):
+    """URL отдаются по мере разбора: при max_urls большой sitemap не дочитывается"""
+    session = fake_session(sitemap_site, 1024)
+    assert list(discover_urls(session, SITE, robots=RobotsRules.parse(ROBOTS), max_urls=10)) == pages("cars", 10)
+    assert session.requested == [f"{SITE}/sitemap_index.xml.gz", f"{SITE}/sitemap_cars.xml.gz"]
+    assert session.bytes_read < len(sitemap_site[f"{SITE}/sitemap_cars.xml.gz"]) // 2
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""HTML парсеры (ads/html_backends.py) на наборе tests/fixtures/html"""
+
+import os
+
+import pytest
+
+from ads.analyzer import SEOAnalyzer
+from ads.check_backends import differing_fields, fixture_files, known_differences
+from ads.html_backends import DEFAULT_BACKEND, available_backends, get_backend
+from ads.http_cache import load_pages
+
+PAGES = load_pages(fixture_files())
+FAST_BACKENDS = [name for name in available_backends() if name != 'html.parser']
+
+
+@pytest.fixture(scope="module")
+def analyzers():
+    analyzers = {name: SEOAnalyzer(use_cache=False, parser=name) for name in available_backends()}
+    yield analyzers
+    for analyzer in analyzers.values():
+        analyzer.close()
+
+
+def test_fixture_corpus_has_malformed_pages():
+    names = {os.path.basename(url) for url, _ in PAGES}
+    assert {"unclosed_h1.html", "table_foster.html", "duplicate_attributes.html"} <= names
+    assert set(known_differences()) <= {url for url, _ in PAGES}
+
+
+def test_default_backend_is_html_parser():
+    assert DEFAULT_BACKEND == 'html.parser'
+    assert get_backend().name == 'html.parser'
+    assert SEOAnalyzer(use_cache=False).parser.name == 'html.parser'
+
+
+@pytest.mark.parametrize("name", FAST_BACKENDS)
+@pytest.mark.parametrize("url, html", PAGES, ids=[os.path.basename(url) for url, _ in PAGES])
+def test_backend_matches_html_parser(analyzers, name, url, html):
+    """Поля совпадают с html.parser, кроме записанных в known_differences.json"""
+    fields, _, _ = differing_fields(analyzers['html.parser'], analyzers[name], url, html)
+    assert fields == known_differences().get(url, {}).get(name, [])
+
+
+def test_unclosed_heading(analyzers):
+    """Незакрытый <h1>: html.parser вкладывает в него остаток документа"""
+    url, html = next(page for page in PAGES if page[0].endswith("unclosed_h1.html"))
+    h1_tags = analyzers['html.parser']._analyze_html(url, html)[0].h1_tags
+    assert h1_tags[0].startswith("onetwo tail") and h1_tags[1] == "two"
+    if 'selectolax' in analyzers:
+        assert analyzers['selectolax']._analyze_html(url, html)[0].h1_tags == ["one", "two"]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Кеш HTTP ответов (ads/http_cache.py)"""
+
+import sqlite3
+
+import pytest
+
+from ads.http_cache import ResponseCache
+
+BODY = "<html><body>" + "autokool " * 50 + "</body></html>"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    yield cache
+    cache.close()
+
+
+def accessed_at(cache: ResponseCache) -> dict:
+    with sqlite3.connect(cache.path) as conn:
+        return dict(conn.execute("SELECT url, accessed_at FROM responses"))
+
+
+def test_get_does_not_write(cache):
+    cache.put("https://a.ee/", BODY, etag='"1"')
+    changes = cache._conn.total_changes
+    entry = cache.get("https://a.ee/")
+    assert (entry.text, entry.conditional_headers()) == (BODY, {"If-None-Match": '"1"'})
+    assert cache.get("https://b.ee/") is None
+    assert cache._conn.total_changes == changes
+
+
+def test_access_times_written_at_close(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("https://a.ee/", BODY)
+    stored = accessed_at(cache)["https://a.ee/"]
+    cache.get("https://a.ee/")
+    assert accessed_at(cache)["https://a.ee/"] == stored
+    cache.close()
+    assert accessed_at(cache)["https://a.ee/"] > stored
+
+
+def test_eviction_uses_pending_access_times(cache):
+    """Прочитанная запись не вытесняется, хотя в базе ее время обращения старое"""
+    urls = [f"https://a.ee/{name}" for name in "abcd"]
+    for url in urls[:3]:
+        cache.put(url, BODY)
+    cache.get(urls[0])
+    cache.max_bytes = cache._bytes
+    cache.put(urls[3], BODY)
+    assert [cache.get(url) is not None for url in urls] == [True, False, True, True]
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Пул соединений (ads/http_session.py)"""
+
+import pytest
+
+from ads.http_session import PooledSession, content_charset
+
+HOST = "autokool.ee"
+
+
+@pytest.fixture
+def session():
+    session = PooledSession(host_pool_sizes={HOST: 4})
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("url", [
+    f"http://{HOST}/", f"https://{HOST}/hinnad", f"http://www.{HOST}/", f"https://WWW.{HOST.upper()}/kontakt",
+])
+def test_host_adapter(session, url):
+    assert session._session.get_adapter(url).poolmanager.connection_pool_kw["maxsize"] == 4
+
+
+@pytest.mark.parametrize("url", [
+    f"https://{HOST}.evil.com/", f"https://www.{HOST}.evil.com/", f"https://{HOST}evil.com/", "https://other.ee/",
+])
+def test_other_hosts_use_default_adapter(session, url):
+    assert session._session.get_adapter(url) is session._session.get_adapter("https://example.com/")
+
+
+@pytest.mark.parametrize("content_type, charset", [
+    ("text/html; charset=windows-1251", "windows-1251"),
+    ('text/html; Charset="UTF-8"', "UTF-8"),
+    ("text/html", None),
+    ("", None),
+])
+def test_content_charset(content_type, charset):
+    assert content_charset({"Content-Type": content_type}) == charset
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""SpaceSaving и фразы текста (ads/keyphrases.py)"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from ads.keyphrases import PhraseCounter, SpaceSaving, Vocabulary, extract_keyphrases
+from ads.text_tokens import PHRASE_BOUNDARY, TokenStream
+
+TEXT = """
+B kategooria autokool Nõmme: B kategooria kursus algab 12. mail.
+Autokool Nõmme pakub B kategooria kursust ja A kategooria kursust.
+Registreeru B kategooria kursusele! Autokool Nõmme, autokool Nõmme.
+"""
+
+# Фразы TEXT, посчитанные вручную: стоп-слова, знаки препинания и числа — границы фраз
+TEXT_PHRASES = {
+    "b kategooria": 4, "autokool nõmme": 4, "kategooria autokool": 1, "b kategooria autokool": 1,
+    "kategooria autokool nõmme": 1, "kategooria kursus": 1, "b kategooria kursus": 1,
+    "kursus algab": 1, "kategooria kursus algab": 1, "nõmme pakub": 1, "pakub b": 1,
+    "autokool nõmme pakub": 1, "nõmme pakub b": 1, "pakub b kategooria": 1,
+    "kategooria kursust": 2, "b kategooria kursust": 1, "a kategooria": 1,
+    "a kategooria kursust": 1, "registreeru b": 1, "registreeru b kategooria": 1,
+    "kategooria kursusele": 1, "b kategooria kursusele": 1,
+}
+
+
+@pytest.fixture(scope="module")
+def stream():
+    """5000 пар (ключ, вес): ключ k выпадает с вероятностью ~ 1 / k, вес 1..3"""
+    rng = random.Random(1)
+    keys = [f"фраза {k}" for k in range(1, 301)]
+    weights = [1 / k for k in range(1, 301)]
+    return [(key, rng.randint(1, 3)) for key in rng.choices(keys, weights, k=5000)]
+
+
+@pytest.fixture(scope="module")
+def exact(stream):
+    counts = Counter()
+    for key, count in stream:
+        counts[key] += count
+    return counts
+
+
+def phrase_counts(counter: PhraseCounter) -> dict:
+    phrase = counter.vocabulary.phrase
+    return {phrase(key): count for key, count in counter.sketch.top(min_count=1)}
+
+
+def test_space_saving_is_exact_within_capacity(stream, exact):
+    sketch = SpaceSaving(len(exact))
+    for key, count in stream:
+        sketch.add(key, count)
+    assert dict(sketch.top()) == dict(exact)
+    assert [count for _, count in sketch.top()] == sorted(exact.values(), reverse=True)
+    assert all(sketch.error(key) == 0 for key in exact)
+    assert sketch.top(10, min_count=exact.most_common(3)[-1][1]) == exact.most_common(3)
+
+
+@pytest.mark.parametrize("capacity", [1, 10, 50, 200])
+def test_space_saving_error_bounds(stream, exact, capacity):
+    sketch = SpaceSaving(capacity)
+    sketch.update(stream)
+    top = dict(sketch.top())
+    total = sum(exact.values())
+    assert len(sketch) == capacity
+    assert sum(top.values()) == total
+    for key, count in top.items():
+        assert count - sketch.error(key) <= exact[key] <= count
+        assert sketch.error(key) <= total / capacity
+    # Ключи чаще N / capacity не вытесняются
+    assert {key for key, count in exact.items() if count > total / capacity} <= set(top)
+
+
+def test_phrases_of_text():
+    counter = PhraseCounter(Vocabulary())
+    counter.feed(TokenStream(TEXT))
+    assert phrase_counts(counter) == TEXT_PHRASES
+    assert extract_keyphrases(TokenStream(TEXT), Vocabulary()) == [
+        "b kategooria", "autokool nõmme", "kategooria kursust"]
+
+
+@pytest.mark.parametrize("size", [1, 2, 5])
+def test_phrases_continue_across_parts(size):
+    """Текст частями по пробелам: фразы на стыках продолжаются"""
+    words = TEXT.split(" ")
+    counter = PhraseCounter(Vocabulary())
+    for start in range(0, len(words), size):
+        counter.feed(TokenStream(" ".join(words[start:start + size]) + " "))
+    assert phrase_counts(counter) == TEXT_PHRASES
+
+
+def test_boundary_ends_phrases():
+    counter = PhraseCounter(Vocabulary())
+    counter.feed(TokenStream("autokool"))
+    counter.boundary()
+    counter.feed(TokenStream(" nõmme"))
+    assert phrase_counts(counter) == {}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("B-kategooria Kursus", ["b-kategooria", "kursus"]),
+    ("hind: 500€, soodus", ["hind"] + [PHRASE_BOUNDARY] * 4 + ["soodus"]),
+    ("autokool\nNõmme", ["autokool", PHRASE_BOUNDARY, "nõmme"]),
+    ("autokool \n\n nõmme\n", ["autokool", PHRASE_BOUNDARY, PHRASE_BOUNDARY, "nõmme", PHRASE_BOUNDARY]),
+])
+def test_phrase_words(text, expected):
+    """Слова фраз — токены TokenStream; числа, знаки и переводы строк разрывают фразы"""
+    assert list(TokenStream(text).phrase_words()) == expected
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Граф внутренних ссылок (ads/link_graph.py) против прямого расчета на словарях Python"""
+
+from collections import Counter, deque
+from typing import Dict, List
+
+import pytest
+
+from ads.link_graph import DEFAULT_DAMPING, LinkGraph, link_report, page_key
+
+HOME = "https://site.ee/"
+
+# Страница -> ссылки; /a ссылается на себя и дважды на /b, /e и /f без исходящих
+# ссылок, /g недостижима с главной, /d глубже 3 кликов
+LINKS = {
+    "/": ["/a", "/b", "/a"],
+    "/a": ["/a", "/b", "/b", "/c"],
+    "/b": ["/", "/c"],
+    "/c": ["/x"],
+    "/x": ["/y"],
+    "/y": ["/d"],
+    "/d": ["/e", "/f"],
+    "/e": [],
+    "/g": ["/b"],
+}
+
+SITEMAP = [
+    "http://site.ee/",                 # главная
+    "https://www.site.ee/c",           # есть ссылка: другая схема и www.
+    "http://www.site.ee/g",            # нет ссылок
+    "https://site.ee/f",               # есть ссылка, сама не обойдена
+    "https://site.ee/h?page=2",        # нет в обходе
+    "https://site.ee/h",               # запрос — часть страницы: тоже нет ссылок
+    "https://blog.site.ee/post",       # другой хост
+    "https://other.ee/",               # другой хост
+]
+
+
+def url(path: str) -> str:
+    return HOME.rstrip("/") + path
+
+
+@pytest.fixture(scope="module")
+def graph() -> LinkGraph:
+    graph = LinkGraph()
+    for page, links in LINKS.items():
+        graph.add(url(page), [url(link) for link in links])
+    return graph
+
+
+@pytest.fixture(scope="module")
+def edges() -> Dict[str, List[str]]:
+    """Ссылки без повторов и ссылок на себя"""
+    result = {}
+    for page, links in LINKS.items():
+        result[url(page)] = [url(link) for link in dict.fromkeys(links) if link != page]
+    return result
+
+
+@pytest.fixture(scope="module")
+def report(graph):
+    return link_report(graph, HOME, sitemap_urls=SITEMAP, top_n=len(graph))
+
+
+@pytest.fixture(scope="module")
+def rows(report):
+    return {row["url"]: row for row in report["top_pages"]}
+
+
+def naive_depth(urls: List[str], edges: Dict[str, List[str]]) -> Dict[str, int]:
+    depth = dict.fromkeys(urls, -1)
+    depth[HOME] = 0
+    queue = deque([HOME])
+    while queue:
+        page = queue.popleft()
+        for link in edges.get(page, []):
+            if depth[link] < 0:
+                depth[link] = depth[page] + 1
+                queue.append(link)
+    return depth
+
+
+def naive_pagerank(urls: List[str], edges: Dict[str, List[str]], iterations: int = 200) -> Dict[str, float]:
+    n = len(urls)
+    rank = dict.fromkeys(urls, 1.0 / n)
+    for _ in range(iterations):
+        dangling = sum(rank[page] for page in urls if not edges.get(page))
+        new_rank = dict.fromkeys(urls, (DEFAULT_DAMPING * dangling + 1.0 - DEFAULT_DAMPING) / n)
+        for page in urls:
+            for link in edges.get(page, []):
+                new_rank[link] += DEFAULT_DAMPING * rank[page] / len(edges[page])
+        rank = new_rank
+    return rank
+
+
+def test_nodes_and_edges(graph, edges):
+    assert graph.urls == list(dict.fromkeys(url(path) for page, links in LINKS.items() for path in [page, *links]))
+    assert graph.edge_count == sum(len(links) for links in edges.values())
+
+
+def test_inlinks(graph, edges, rows):
+    assert {page: row["inlinks"] for page, row in rows.items()} == {
+        page: sum(page in links for links in edges.values()) for page in graph.urls}
+
+
+def test_click_depth(graph, edges, report, rows):
+    depth = naive_depth(graph.urls, edges)
+    assert {page: row["depth"] for page, row in rows.items()} == depth
+    assert report["depth_histogram"] == {("unreachable" if level < 0 else str(level)): count
+                                         for level, count in sorted(Counter(depth.values()).items())}
+    assert sorted(report["deep_pages"]) == sorted(page for page, level in depth.items() if level > 3)
+
+
+def test_pagerank(graph, edges, report, rows):
+    ranks = naive_pagerank(graph.urls, edges)
+    for page, row in rows.items():
+        assert row["pagerank"] == pytest.approx(ranks[page], abs=1e-6), page
+    assert sum(row["pagerank"] for row in rows.values()) == pytest.approx(1.0, abs=1e-5)
+    order = [row["pagerank"] for row in report["top_pages"]]
+    assert order == sorted(order, reverse=True)
+
+
+def test_orphans_ignore_scheme_and_www(report):
+    assert page_key("http://WWW.Site.ee") == page_key("https://site.ee/")
+    assert report["orphans"] == ["http://www.site.ee/g", "https://site.ee/h", "https://site.ee/h?page=2"]
+    assert report["sitemap_foreign"] == 2
+
+
+def test_report_without_sitemap(graph):
+    assert "orphans" not in link_report(graph, HOME)
+
+
+def test_empty_graph():
+    report = link_report(LinkGraph(), HOME, sitemap_urls=[url("/a")])
+    assert (report["pages"], report["top_pages"], report["orphans"]) == (0, [], [url("/a")])
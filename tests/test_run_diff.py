@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Лента изменений между запусками (ads/run_diff.py)"""
+
+import json
+
+import pytest
+
+from ads.run_diff import diff_run, field_changes, write_changes
+
+SITE = "https://autokool.ee"
+OTHER_SITE = "https://other.ee"
+
+
+@pytest.mark.parametrize("field, old, new, expected", [
+    ("title", {"title": "Vana"}, {"title": "Uus"}, {"title": {"old": "Vana", "new": "Uus"}}),
+    ("word_count", {"word_count": 500}, {"word_count": 420},
+     {"word_count": {"old": 500, "new": 420, "delta": -80}}),
+    ("word_count", {}, {"word_count": 300}, {"word_count": {"old": None, "new": 300, "delta": 300}}),
+    ("h1_tags", {"h1_tags": ["A", "B"]}, {"h1_tags": ["B", "C"]}, {"h1_tags": {"added": ["C"], "removed": ["A"]}}),
+    ("h2_tags", {"h2_tags": ["A", "B"]}, {"h2_tags": ["B", "A"]}, {}),          # только порядок
+    ("keywords", {"keywords": None}, {"keywords": ["auto"]}, {"keywords": {"added": ["auto"], "removed": []}}),
+])
+def test_field_changes(field, old, new, expected):
+    assert field_changes([field], old, new) == expected
+
+
+@pytest.fixture
+def runs(results_store, page_record):
+    """Три запуска; ID запусков"""
+    def page(path, site=SITE, **fields):
+        return page_record(site + path, **{"title": f"Autokool {path}", **fields})
+
+    pages = [
+        [page("/"), page("/hinnad"), page("/kontakt"), page("/kursused"), page("/", OTHER_SITE)],
+        [
+            page("/"),                                                      # без изменений
+            page("/hinnad", title="Hinnad 2024", word_count=620, h1_tags=["Hinnad"],
+                 keywords=["autokool", "hind"]),
+            page("/kontakt", internal_links=25, keyphrases=["kontakt"]),   # поля без отслеживания
+            page("/kursused", h2_tags=["Kontakt", "Hinnad"]),              # только порядок H2
+            page("/uus"),                                                  # новая страница
+        ],
+        # Страница другого сайта пропускала запуск 2: сравнивается с запуском 1
+        [page("/", OTHER_SITE, meta_description="Uus kirjeldus")],
+    ]
+    run_ids = []
+    for number, run_pages in enumerate(pages):
+        run_id = results_store.start_run(f"test {number + 1}", started_at=1_700_000_000 + number)
+        results_store.add_pages(run_id, run_pages)
+        results_store.finish_run(run_id)
+        run_ids.append(run_id)
+    return run_ids
+
+
+def changes(diff):
+    return [(change.url, change.prev_run_id, change.changes) for change in diff.changed]
+
+
+EXPECTED_RUN_2 = [
+    (SITE + "/hinnad", 1, {
+        "title": {"old": "Autokool /hinnad", "new": "Hinnad 2024"},
+        "h1_tags": {"added": ["Hinnad"], "removed": ["Autokool"]},
+        "word_count": {"old": 500, "new": 620, "delta": 120},
+        "keywords": {"added": ["hind"], "removed": ["kategooria"]},
+    }),
+    (SITE + "/uus", None, {}),
+]
+
+
+def test_diff_run_empty_store(results_store):
+    assert diff_run(results_store) is None
+
+
+def test_first_run_pages_are_new(results_store, runs):
+    diff = diff_run(results_store, runs[0])
+    assert diff.pages == diff.new_pages == 5
+    assert [change.changes for change in diff.changed] == [{}] * 5
+
+
+def test_only_changed_pages_are_reported(results_store, runs):
+    """Неизменившаяся страница, поля без отслеживания и порядок H2 в ленту не попадают"""
+    diff = diff_run(results_store, runs[1])
+    assert diff.pages == 5
+    assert changes(diff) == EXPECTED_RUN_2
+    assert [change.is_new for change in diff.changed] == [False, True]
+    assert {change.site for change in diff.changed} == {"autokool.ee"}
+
+
+def test_previous_result_from_last_run_with_page(results_store, runs):
+    diff = diff_run(results_store)
+    assert diff.run_id == runs[2]
+    assert changes(diff) == [
+        (OTHER_SITE + "/", runs[0], {"meta_description": {"old": "B kategooria kursused", "new": "Uus kirjeldus"}})]
+    assert diff_run(results_store, runs[-1] + 1) is None
+
+
+def test_write_changes(results_store, runs, tmp_path):
+    feed_path, summary_path = write_changes(diff_run(results_store, runs[1]), str(tmp_path))
+    with open(feed_path, 'r', encoding='utf-8') as f:
+        feed = [json.loads(line) for line in f]
+    assert [(item["url"], item["prev_run_id"], item["changes"]) for item in feed] == EXPECTED_RUN_2
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        markdown = f.read()
+    assert "изменилось: 1, новых: 1" in markdown
+    assert "H1 добавлен: «Hinnad»" in markdown
+    assert "Слов: 500 → 620 (+120)" in markdown
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Планировщик хостов (ads/scheduler.py) и повторы запросов SEOAnalyzer"""
+
+import time
+
+import pytest
+
+from ads.analyzer import SEOAnalyzer
+from ads.resilience import RetryPolicy
+from ads.scheduler import HostScheduler
+
+HOST = "autokool.ee"
+
+
+class Response:
+    def __init__(self, status_code: int, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = "<html><title>Autokool</title></html>"
+
+
+class RetrySession:
+    """session.get: ответы по очереди; время каждого запроса"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_at = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.sent_at.append(time.monotonic())
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = SEOAnalyzer(use_cache=False, per_host=1, host_rate=1000.0,
+                           retry_policy=RetryPolicy(max_attempts=3, base_delay=0.0))
+    session = analyzer.session
+    yield analyzer
+    analyzer.session = session
+    analyzer.close()
+
+
+def test_token_without_slot_keeps_in_flight():
+    scheduler = HostScheduler(per_host=1, rate=1000.0)
+    scheduler.acquire_blocking(HOST)
+    scheduler.acquire_blocking(HOST, slot=False)      # слот занят, но токен выдается
+    metrics = scheduler.metrics()[HOST]
+    assert (metrics["in_flight"], metrics["dispatched"]) == (1, 2)
+    scheduler.release(HOST)
+    assert scheduler.metrics()[HOST]["in_flight"] == 0
+
+
+def test_retries_take_scheduler_token(analyzer):
+    """Каждый повтор ждет токен хоста: 503 замедляет хост, повтор идет не раньше"""
+    analyzer.session = RetrySession([Response(503), Response(503), Response(200)])
+    analyzer.scheduler.acquire_blocking(HOST)         # слот и токен первой попытки — у вызывающего кода
+    try:
+        response = analyzer._request(f"https://{HOST}/", {})
+    finally:
+        analyzer.scheduler.release(HOST)
+    assert response.status_code == 200
+    metrics = analyzer.scheduler.metrics()[HOST]
+    assert (metrics["dispatched"], metrics["throttled"], metrics["in_flight"]) == (3, 2, 0)
+
+
+def test_retry_waits_for_blocked_host(analyzer):
+    analyzer.session = RetrySession([Response(503, {"Retry-After": "0.2"}), Response(200)])
+    analyzer.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0, max_delay=0.0)
+    analyzer.scheduler.acquire_blocking(HOST)
+    try:
+        analyzer._request(f"https://{HOST}/", {})
+    finally:
+        analyzer.scheduler.release(HOST)
+    first, second = analyzer.session.sent_at
+    assert second - first >= 0.2
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""SEOData (ads/seo_data.py): атрибуты и создание как у прежнего dataclass"""
+
+import glob
+import json
+import os
+from dataclasses import asdict, fields, replace
+
+import pytest
+
+from ads.seo_data import SEOData
+
+# Отчеты, сохраненные до keyphrases (save_report: поля seo_data без фраз)
+ADS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ads")
+OLD_REPORTS = sorted(glob.glob(os.path.join(ADS_DIR, "*_report.json")))
+BASELINE_FIELDS = ("url", "title", "meta_description", "h1_tags", "h2_tags", "keywords", "word_count",
+                   "internal_links", "external_links", "images_count", "images_with_alt")
+
+
+def test_field_order_keeps_baseline_prefix():
+    assert tuple(field.name for field in fields(SEOData)) == BASELINE_FIELDS + ("keyphrases",)
+
+
+@pytest.mark.parametrize("path", OLD_REPORTS, ids=os.path.basename)
+def test_loads_report_without_keyphrases(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)["seo_data"]
+    assert "keyphrases" not in report
+    data = SEOData(**report)
+    assert data.keyphrases == []
+    assert asdict(data) == dict(report, keyphrases=[])
+
+
+def test_pre_series_report_dict():
+    report = {"url": "https://autokool.ee/", "title": "Autokool", "meta_description": "",
+              "h1_tags": ["Autokool"], "h2_tags": [], "keywords": ["autokool"], "word_count": 120,
+              "internal_links": 4, "external_links": 1, "images_count": 2, "images_with_alt": 1}
+    assert SEOData(**report) == SEOData(*report.values())
+    assert SEOData(**report).keyphrases == []
+
+
+def test_positional_construction():
+    data = SEOData("https://autokool.ee/", "Autokool", "Kursused", ["H1"], ["H2"], ["autokool"],
+                   500, 10, 2, 3, 1)
+    assert (data.word_count, data.internal_links, data.images_with_alt, data.keyphrases) == (500, 10, 1, [])
+    assert SEOData(*BASELINE_FIELDS, ["b kategooria"]).keyphrases == ["b kategooria"]
+
+
+def test_round_trip_and_replace(page_record):
+    record = page_record("https://autokool.ee/hinnad")
+    data = SEOData(**record)
+    assert asdict(data) == record
+    assert replace(data, word_count=1).word_count == 1
+    assert SEOData(**asdict(data)) == data
+
+
+def test_none_lists_and_interning(page_record):
+    data = SEOData(**page_record("https://autokool.ee/", h1_tags=None, keyphrases=None))
+    assert data.h1_tags == [] and data.keyphrases == []
+    other = SEOData(**page_record("https://autokool.ee/x", title="".join(["Auto", "kool"])))
+    assert other.title is SEOData(**page_record("https://autokool.ee/y")).title
+    assert not hasattr(data, '__dict__')
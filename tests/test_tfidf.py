@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""TF-IDF и разрыв по ключевым словам (ads/tfidf.py) против расчета на словарях Python"""
+
+import math
+from collections import Counter
+from typing import Dict, List
+
+import pytest
+
+from ads.tfidf import DocumentTermMatrix, keyword_gap, tfidf
+
+TARGET = "viktorija.ee"
+
+# (сайт, url, термины страницы с повторами)
+CORPUS = [
+    (TARGET, "/", "autokool kategooria kursus kursus hind viktorija viktorija viktorija".split()),
+    (TARGET, "/hinnad", "hind hind hind kategooria soodustus".split()),
+    ("drive.ee", "/", "autokool autokool kategooria teooria teooria soiduõpe drive".split()),
+    ("drive.ee", "/kursused", "kursus teooria eksam eksam libedasõit".split()),
+    ("drive.ee", "/kontakt", "kontakt aadress autokool".split()),
+    ("atlanta.ee", "/", "autokool teooria eksam soiduõpe soiduõpe atlanta".split()),
+    ("atlanta.ee", "/hinnad", "hind kategooria eksam libedasõit libedasõit libedasõit".split()),
+    ("nord.ee", "/", "autokool kategooria teooria nord nord".split()),
+]
+
+ROW_FIELDS = ("target_weight", "competitor_mean", "competitor_max", "competitor_std",
+              "competitor_sites", "competitors_above_target", "gap")
+
+
+def naive_weights(documents: List[List[str]]) -> List[Dict[str, float]]:
+    """(1 + log tf) * (log((1 + N) / (1 + df)) + 1), L2 нормировка страницы"""
+    counts = [Counter(terms) for terms in documents]
+    df = Counter(term for count in counts for term in count)
+    result = []
+    for count in counts:
+        weights = {term: (1 + math.log(tf)) * (math.log((1 + len(documents)) / (1 + df[term])) + 1)
+                   for term, tf in count.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        result.append({term: weight / norm for term, weight in weights.items()})
+    return result
+
+
+def naive_gap(min_sites: int) -> Dict[str, Dict]:
+    """Строки keyword_gap всех терминов, прошедших min_sites"""
+    weights = naive_weights([terms for _, _, terms in CORPUS])
+    sites = list(dict.fromkeys(site for site, _, _ in CORPUS))
+    per_site = {}
+    for site in sites:
+        pages = [weight for (page_site, _, _), weight in zip(CORPUS, weights) if page_site == site]
+        terms = {term for page in pages for term in page}
+        per_site[site] = {term: sum(page.get(term, 0.0) for page in pages) / len(pages) for term in terms}
+    competitors = [site for site in sites if site != TARGET]
+    rows = {}
+    for term in {term for site in competitors for term in per_site[site]}:
+        values = [per_site[site].get(term, 0.0) for site in competitors]
+        ours = per_site[TARGET].get(term, 0.0)
+        mean = sum(values) / len(values)
+        coverage = sum(1 for value in values if value)
+        if coverage >= min_sites:
+            rows[term] = {
+                "target_weight": ours, "competitor_mean": mean, "competitor_max": max(values),
+                "competitor_std": math.sqrt(sum((value - mean) ** 2 for value in values) / len(values)),
+                "competitor_sites": coverage,
+                "competitors_above_target": sum(1 for value in values if value > ours),
+                "gap": mean - ours,
+            }
+    return rows
+
+
+def build_matrix(corpus) -> DocumentTermMatrix:
+    matrix = DocumentTermMatrix()
+    for site, url, terms in corpus:
+        matrix.add(site, site + url, terms)
+    return matrix
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return build_matrix(CORPUS)
+
+
+def test_page_weights(matrix):
+    weights = tfidf(matrix.counts()).toarray()
+    expected = naive_weights([terms for _, _, terms in CORPUS])
+    for doc, page in enumerate(expected):
+        for term_id, term in enumerate(matrix.terms):
+            assert weights[doc, term_id] == pytest.approx(page.get(term, 0.0), abs=1e-12)
+
+
+@pytest.mark.parametrize("min_sites", [1, 2, 3])
+@pytest.mark.parametrize("key, sign", [("gaps", 1), ("strengths", -1)])
+def test_keyword_gap_rows(matrix, min_sites, key, sign):
+    expected = naive_gap(min_sites)
+    rows = keyword_gap(matrix, TARGET, top_n=len(matrix.terms), min_sites=min_sites)[key]
+    assert sorted(row["term"] for row in rows) == sorted(
+        term for term, row in expected.items() if sign * row["gap"] > 1e-12)
+    gaps = [row["gap"] for row in rows]
+    assert gaps == sorted(gaps, key=lambda gap: -sign * gap)
+    for row in rows:
+        for field in ROW_FIELDS:
+            assert row[field] == pytest.approx(expected[row["term"]][field], abs=1e-6), (row["term"], field)
+
+
+@pytest.mark.parametrize("min_sites", [1, 2, 3])
+def test_keyword_gap_top_n(matrix, min_sites):
+    """top_n меньше числа подходящих терминов: те же первые строки"""
+    full = keyword_gap(matrix, TARGET, top_n=len(matrix.terms), min_sites=min_sites)
+    short = keyword_gap(matrix, TARGET, top_n=2, min_sites=min_sites)
+    assert [row["gap"] for row in short["gaps"]] == [row["gap"] for row in full["gaps"][:2]]
+
+
+def test_keyword_gap_skips_competitor_brands(matrix):
+    report = keyword_gap(matrix, TARGET, min_sites=2)
+    assert not {row["term"] for row in report["gaps"]} & {"drive", "atlanta", "nord"}
+    assert (report["pages"], report["terms"], report["competitors"]) == (len(CORPUS), len(matrix.terms), 3)
+
+
+@pytest.mark.parametrize("target, corpus", [("unknown.ee", CORPUS), (TARGET, CORPUS[:2])])
+def test_keyword_gap_errors(target, corpus):
+    with pytest.raises(ValueError):
+        keyword_gap(build_matrix(corpus), target)